@@ -45,14 +45,38 @@ def _ensure_module_aliases():
     resolve to the same module objects in sys.modules."""
     # Import the module_utils via the direct path first
     prefixes = [
+        # tracing holds the active tracer, so it must be aliased before api_util imports it
+        ('plugins.module_utils.tracing', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.tracing'),
         ('plugins.module_utils.api_util', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util'),
         ('plugins.module_utils.error_handler', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.error_handler'),
         ('plugins.module_utils.oauth', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.oauth'),
         ('plugins.module_utils.sdp_config', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config'),
         ('plugins.module_utils.udf_utils', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.udf_utils'),
+        ('plugins.module_utils.attachment_util', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.attachment_util'),
+        ('plugins.module_utils.columnar', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.columnar'),
+        ('plugins.module_utils.export_util', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.export_util'),
+        ('plugins.module_utils.journal', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.journal'),
+        ('plugins.module_utils.mirror', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.mirror'),
+        ('plugins.module_utils.cache', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.cache'),
+        ('plugins.module_utils.lookup_util', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.lookup_util'),
+        ('plugins.module_utils.user_directory', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.user_directory'),
+        ('plugins.module_utils.singleflight', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.singleflight'),
+        ('plugins.module_utils.broker', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.broker'),
+        ('plugins.module_utils.limiter', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.limiter'),
+        ('plugins.module_utils.circuit', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.circuit'),
+        ('plugins.module_utils.hedge', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.hedge'),
+        ('plugins.module_utils.deadline', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.deadline'),
+        ('plugins.module_utils.compression', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.compression'),
+        ('plugins.module_utils.json_stream', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.json_stream'),
+        ('plugins.module_utils.serializer', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.serializer'),
+        ('plugins.module_utils.profiling', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.profiling'),
         ('plugins.modules.write_record', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.write_record'),
         ('plugins.modules.read_record', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.read_record'),
         ('plugins.modules.oauth_token', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.oauth_token'),
+        ('plugins.modules.attachment', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.attachment'),
+        ('plugins.modules.record_mirror', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.record_mirror'),
+        ('plugins.modules.sdp_metadata', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.sdp_metadata'),
+        ('plugins.filter.columnar', 'ansible_collections.manageengine.sdp_cloud.plugins.filter.columnar'),
     ]
     for short, long in prefixes:
         try:
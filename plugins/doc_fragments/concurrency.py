@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Documentation fragment for SDP Cloud modules that make API calls in parallel
+    DOCUMENTATION = r'''
+options:
+  concurrency:
+    description:
+      - Maximum number of API calls made in parallel, for example when fetching expanded sub-resources,
+        exporting time slices, creating a batch of records, listing metadata or transferring attachments.
+    type: int
+    default: 4
+  max_concurrency:
+    description:
+      - Upper bound for the number of requests in flight.
+      - Parallel requests start at I(concurrency) and adapt to the portal, halving on HTTP 429 or 503 and
+        growing by about one per round of healthy responses up to I(max_concurrency).
+      - Defaults to I(concurrency), so the limit only adapts downwards.
+    type: int
+'''
@@ -38,4 +38,17 @@ options:
       - The ID of the specific record to operate on.
       - Required for update, get-by-id, and delete operations.
     type: str
+  request_timeout:
+    description:
+      - Timeout in seconds of each HTTP request, for connecting and for every read.
+    type: int
+    default: 10
+  deadline:
+    description:
+      - Maximum time in seconds for all API calls of the task, including token generation, metadata lookups,
+        the idempotency check, the write and retries.
+      - Each request's timeout is shortened to the time left, retries that cannot finish in time are skipped,
+        and the task fails once the deadline has passed.
+      - By default there is no deadline.
+    type: int
 '''
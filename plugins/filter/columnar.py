@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.errors import AnsibleFilterError
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.columnar import from_columnar, is_columnar
+
+
+def columnar_to_rows(data):
+    """Re-hydrate a columnar read_record result into a list of row dicts."""
+    if isinstance(data, list):
+        # Already rows (e.g. output_format=rows); pass through unchanged
+        return data
+    if not is_columnar(data):
+        raise AnsibleFilterError("columnar_to_rows expects a result returned by read_record with output_format=columnar.")
+    return from_columnar(data)
+
+
+class FilterModule(object):
+
+    def filters(self):
+        return {
+            'columnar_to_rows': columnar_to_rows,
+        }
@@ -5,20 +5,44 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import hashlib
 import json
 import os
+import socket
+import threading
 import time
 from ansible.module_utils.basic import env_fallback
 from ansible.module_utils.urls import fetch_url
-from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.oauth import get_access_token
-from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import DC_CHOICES, MODULE_CONFIG
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.broker import (
+    get_broker, env_number, ENV_BROKER_GET_TTL, ENV_BROKER_RATE
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import DC_CHOICES, MODULE_CONFIG, CHILD_MODULE_CONFIG
 
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.error_handler import handle_error
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.singleflight import SingleFlight
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.hedge import HedgePolicy, hedged_call
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.deadline import Deadline
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.compression import (
+    DecodingReader, TransferStats, content_encoding, decode_body, ACCEPT_ENCODING
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.circuit import (
+    CircuitBreaker, CIRCUIT_THRESHOLD, CIRCUIT_COOLDOWN, ENV_CIRCUIT_THRESHOLD, ENV_CIRCUIT_COOLDOWN
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.serializer import json_dumps, json_loads
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.tracing import trace_span, SPAN_KIND_CLIENT
 try:
     import urllib.parse as urllib_parse
 except ImportError:
     import urllib
     urllib_parse = urllib
+try:
+    import http.client as http_client
+except ImportError:
+    import httplib as http_client
+
+
+# Errors raised while reading a response body after its headers arrived (timeouts, resets, truncated bodies)
+READ_ERRORS = (IOError, OSError, socket.timeout, http_client.HTTPException)
 
 
 # Auth Constants
@@ -33,6 +57,14 @@ AUTH_REQUIRED_TOGETHER = [
 ]
 
 
+# Result shapes supported by the return_mode option, from largest to smallest
+RETURN_MODES = ['full', 'minimal', 'id', 'none']
+
+
+# Default timeout in seconds of a single HTTP request (the fetch_url default)
+REQUEST_TIMEOUT = 10
+
+
 # Environment variable names for credential fallback
 ENV_AUTH_TOKEN = 'SDP_CLOUD_AUTH_TOKEN'
 ENV_CLIENT_ID = 'SDP_CLOUD_CLIENT_ID'
@@ -52,6 +84,16 @@ def common_argument_spec():
         dc=dict(type='str', required=True, choices=DC_CHOICES),
         parent_module_name=dict(type='str', required=True, choices=list(MODULE_CONFIG.keys())),
         parent_id=dict(type='str'),
+        request_timeout=dict(type='int', default=REQUEST_TIMEOUT),
+        deadline=dict(type='int'),
+    )
+
+
+def concurrency_argument_spec():
+    """Return the argument specification of modules making API calls in parallel."""
+    return dict(
+        concurrency=dict(type='int', default=4),
+        max_concurrency=dict(type='int'),
     )
 
 
@@ -95,10 +137,18 @@ def check_module_config(module):
     return True
 
 
-def construct_endpoint(module, operation=None):
-    """Construct the API endpoint based on hierarchy."""
+def construct_endpoint(module, operation=None, parent_id=None, child_id=None):
+    """Construct the API endpoint based on hierarchy.
+
+    Produces parent[/parent_id][/child_module[/child_id]][/operation]. The
+    child level is only added when module.params has a child_module.
+
+    parent_id and child_id override the values in module.params, which lets
+    callers address several records from one task.
+    """
     parent_module = module.params['parent_module_name']
-    parent_id = module.params.get('parent_id')
+    parent_id = parent_id or module.params.get('parent_id')
+    child_module = module.params.get('child_module')
 
     # Get endpoints from config
     parent_config = MODULE_CONFIG.get(parent_module)
@@ -107,6 +157,12 @@ def construct_endpoint(module, operation=None):
     if parent_id:
         endpoint += "/{0}".format(parent_id)
 
+    if child_module:
+        child_id = child_id or module.params.get('child_id')
+        endpoint += "/{0}".format(CHILD_MODULE_CONFIG[child_module]['endpoint'])
+        if child_id:
+            endpoint += "/{0}".format(child_id)
+
     # Append convenience operation at the deepest level
     if operation:
         endpoint += "/{0}".format(operation)
@@ -114,6 +170,29 @@ def construct_endpoint(module, operation=None):
     return endpoint
 
 
+# Concurrent identical GETs and token refreshes in this process share one HTTP call
+REQUEST_FLIGHTS = SingleFlight()
+TOKEN_FLIGHTS = SingleFlight()
+
+# Seconds an access token is shared through the broker (Zoho tokens are valid for an hour)
+BROKER_TOKEN_TTL = 3000
+
+
+def _shared_key(prefix, *parts):
+    """Build a broker key that does not reveal credentials or payloads."""
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    return '{0}/{1}'.format(prefix, digest)
+
+
+class _WorkerFailure(Exception):
+    """Raised in place of module.fail_json in a map_concurrent worker; carries its arguments."""
+
+    def __init__(self, args, kwargs):
+        super(_WorkerFailure, self).__init__(kwargs.get('msg', args[0] if args else ''))
+        self.fail_args = args
+        self.fail_kwargs = kwargs
+
+
 class SDPClient:
     def __init__(self, module):
         self.module = module
@@ -130,6 +209,43 @@ class SDPClient:
 
         self.base_url = "https://{0}/app/{1}/api/v3".format(self.domain, self.portal)
 
+        # Guards token resolution when worker threads share this client
+        self._auth_lock = threading.Lock()
+
+        # Marks map_concurrent worker threads, whose fail_json calls are deferred to the calling thread
+        self._worker = threading.local()
+        self._fail_guard = None
+
+        # Set once an access token is generated from OAuth credentials; only such tokens are renewed on HTTP 401
+        self._token_generated = False
+        self._token_broker_key = None
+
+        # Optional broker shared by all forks ($SDP_CLOUD_BROKER); None when disabled or unreachable
+        self.broker = get_broker()
+        self.shared_get_ttl = env_number(ENV_BROKER_GET_TTL)
+        self.rate_limit = env_number(ENV_BROKER_RATE)
+
+        # Time limits: each HTTP request, and the whole task from the creation of the client
+        self.request_timeout = self.params.get('request_timeout') or REQUEST_TIMEOUT
+        self.deadline = Deadline(self.params.get('deadline'))
+
+        # Adaptive limit on requests in flight, set while map_concurrent runs
+        self.limiter = None
+        self.max_concurrency = self.params.get('max_concurrency')
+
+        # Fails fast while the portal is down, shared with every fork through a state file
+        self.circuit = CircuitBreaker(
+            '{0}/{1}'.format(self.domain, self.portal),
+            threshold=int(env_number(ENV_CIRCUIT_THRESHOLD, CIRCUIT_THRESHOLD)),
+            cooldown=env_number(ENV_CIRCUIT_COOLDOWN, CIRCUIT_COOLDOWN),
+        )
+
+        # Bytes received for API responses, on the wire and decoded
+        self.transfer = TransferStats()
+
+        # Opt-in hedging of slow GETs ($SDP_CLOUD_HEDGE_PERCENTILE); None when disabled
+        self.hedge = HedgePolicy.from_env('{0}/{1}/latency'.format(self.domain, self.portal))
+
     # HTTP status codes that are safe to retry (transient errors)
     RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
 
@@ -139,6 +255,10 @@ class SDPClient:
         Resolves credentials from module params first, then falls back to
         environment variables via get_auth_params().
         """
+        with self._auth_lock:
+            self._resolve_auth()
+
+    def _resolve_auth(self):
         if not self.auth_token:
             auth = get_auth_params(self.module)
             self.auth_token = auth['auth_token']
@@ -148,79 +268,400 @@ class SDPClient:
 
         if not self.auth_token:
             if self.client_id and self.client_secret and self.refresh_token:
-                token_data = get_access_token(
-                    self.module, self.client_id, self.client_secret,
-                    self.refresh_token, self.dc
-                )
+                # Imported on first use: most tasks authenticate with a token or a shared one
+                from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.oauth import get_access_token
+
+                def _load():
+                    return get_access_token(
+                        self.module, self.client_id, self.client_secret,
+                        self.refresh_token, self.dc,
+                        timeout=self._timeout('generating an access token')
+                    )
+
+                if self.broker is not None:
+                    key = self._token_broker_key = _shared_key('token', self.dc, self.client_id, self.refresh_token)
+                    load = _load
+
+                    def _load():
+                        return self.broker.fetch(key, load, BROKER_TOKEN_TTL)
+
+                token_data = TOKEN_FLIGHTS.do((self.dc, self.client_id, self.refresh_token), _load)
                 self.auth_token = token_data['access_token']
+                self._token_generated = True
             else:
                 self.module.fail_json(
                     msg="Missing authentication credentials."
                 )
 
-    def request(self, endpoint, method='GET', data=None, max_retries=3, retry_delay=2):
+    def _renew_auth(self, request_headers):
+        """Replace a generated access token the API rejected with HTTP 401 (revoked or rotated).
+
+        The rejected token is removed from the broker, so other forks stop
+        reusing it, and a new one is generated; request_headers is updated in
+        place. A token another thread already renewed is reused. Tokens given
+        as auth_token are never renewed.
+
+        Returns:
+            True when the request can be sent again with a new token.
+        """
+        with self._auth_lock:
+            if not self._token_generated:
+                return False
+            rejected = request_headers.get('Authorization')
+            if rejected == 'Zoho-oauthtoken {0}'.format(self.auth_token):
+                if self.broker is not None:
+                    shared = self.broker.get(self._token_broker_key)
+                    if shared and 'Zoho-oauthtoken {0}'.format(shared.get('access_token')) == rejected:
+                        self.broker.delete(self._token_broker_key)
+                self.auth_token = None
+                self._resolve_auth()
+            request_headers['Authorization'] = 'Zoho-oauthtoken {0}'.format(self.auth_token)
+            return True
+
+    def _timeout(self, action):
+        """Return the timeout for the next HTTP request, failing the task if its deadline has passed."""
+        if self.deadline.expired():
+            self.module.fail_json(
+                msg="Task deadline of {0}s exceeded before {1}.".format(self.deadline.seconds, action),
+                deadline=self.deadline.seconds
+            )
+        return self.deadline.timeout(self.request_timeout)
+
+    def map_concurrent(self, func, items, concurrency=1):
+        """Apply func to every item using up to `concurrency` worker threads.
+
+        Auth is resolved once up front so all workers reuse the same token.
+        Results are returned in input order. The first exception raised by a
+        worker cancels the pending items and is re-raised in the calling
+        thread. module.fail_json called by a worker does not exit from that
+        thread: it is called once from the calling thread instead, so workers
+        failing together still produce a single module result.
+
+        Requests made by the workers go through an AIMDLimiter starting at
+        `concurrency`: the number in flight is cut on 429/503 or rate limit
+        headers and grows back while responses are healthy, up to the
+        module's max_concurrency option if set, else `concurrency`.
+        """
+        items = list(items)
+        if not items:
+            return []
+
+        self._ensure_auth()
+
+        maximum = max(concurrency, self.max_concurrency or 0)
+        if maximum <= 1 or len(items) == 1:
+            return [func(item) for item in items]
+
+        from concurrent.futures import ThreadPoolExecutor
+        from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.limiter import AIMDLimiter
+
+        # Nested calls share the outer limiter
+        owner = self.limiter is None
+        if owner:
+            self.limiter = AIMDLimiter(max(concurrency, 1), maximum=maximum)
+
+        # Only the outermost call replaces fail_json; nested calls run inside its workers
+        fail_json = self.module.fail_json
+        guard = fail_json is not self._fail_guard
+        if guard:
+            def _fail_json(*args, **kwargs):
+                if getattr(self._worker, 'active', False):
+                    raise _WorkerFailure(args, kwargs)
+                return fail_json(*args, **kwargs)
+            self._fail_guard = self.module.fail_json = _fail_json
+
+        def _run(item):
+            self._worker.active = True
+            try:
+                return func(item)
+            finally:
+                self._worker.active = False
+
+        failure = None
+        executor = ThreadPoolExecutor(max_workers=min(maximum, len(items)))
+        futures = [executor.submit(_run, item) for item in items]
+        try:
+            return [future.result() for future in futures]
+        except _WorkerFailure as e:
+            failure = e
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            if failure is not None:
+                for future in futures:
+                    future.cancel()
+            executor.shutdown(wait=True)
+            if owner:
+                self.limiter = None
+            if guard:
+                self.module.fail_json = fail_json
+                self._fail_guard = None
+        # Outside the workers: exits the module, or raises to an enclosing worker when nested
+        self.module.fail_json(*failure.fail_args, **failure.fail_kwargs)
+
+    def open_stream(self, endpoint, headers=None):
+        """Open a GET request and return the raw (response, info) tuple without reading the body.
+
+        Used for streaming downloads: the caller reads the response in chunks
+        and handles HTTP errors itself. endpoint may be a path relative to
+        base_url or an absolute path on the portal domain (e.g. a content_url
+        returned by the API).
+        """
+        self._ensure_auth()
+
+        if endpoint.startswith('/'):
+            url = "https://{0}{1}".format(self.domain, endpoint)
+        else:
+            url = "{0}/{1}".format(self.base_url, endpoint)
+
+        request_headers = {'Authorization': 'Zoho-oauthtoken {0}'.format(self.auth_token)}
+        if headers:
+            request_headers.update(headers)
+
+        return self._fetch(url, None, 'GET', request_headers)
+
+    def request(self, endpoint, method='GET', data=None, max_retries=3, retry_delay=2, body=None, headers=None,
+                shared_ttl=None):
         """Make API request with exponential backoff for transient errors.
 
+        Concurrent identical GETs (same URL, input data and headers) made by any
+        client in this process share one HTTP request and its parsed result.
+        With the broker enabled, GET results are also shared between forks for
+        shared_ttl seconds.
+
         Args:
             endpoint: API endpoint path (appended to base_url).
             method: HTTP method (GET, POST, PUT, DELETE).
             data: Request payload dict (will be JSON-encoded).
             max_retries: Maximum number of retry attempts for transient errors.
             retry_delay: Base delay in seconds between retries (doubles each attempt).
+            body: Pre-encoded request body sent as-is instead of data. May be bytes
+                or a re-iterable object yielding bytes (e.g. a streamed multipart body).
+            headers: Extra request headers, merged over the defaults.
+            shared_ttl: Seconds a GET result may be served from the broker. Defaults to
+                $SDP_CLOUD_BROKER_GET_TTL (0, never); 0 always calls the API.
 
         Returns:
             Parsed JSON response dict from the API.
         """
+        url, payload, request_headers = self._prepare(endpoint, data, body, headers)
+
+        def _send():
+            return self._send(url, method, payload, request_headers, max_retries, retry_delay)
+
+        if method != 'GET' or body is not None:
+            return _send()
+
+        key = ('GET', url, payload, tuple(sorted(request_headers.items())))
+        ttl = self.shared_get_ttl if shared_ttl is None else shared_ttl
+        if self.broker is not None and ttl:
+            shared_key = _shared_key('get', *key)
+            return REQUEST_FLIGHTS.do(key, lambda: self.broker.fetch(shared_key, _send, ttl))
+        return REQUEST_FLIGHTS.do(key, _send)
+
+    def request_stream(self, endpoint, list_key, data=None, max_retries=3, retry_delay=2):
+        """Make a list GET request and parse its response incrementally.
+
+        Unlike request(), the body is never held in memory as a whole: rows of
+        the list_key array are decoded one at a time while the response is read.
+        Streamed requests are not coalesced, hedged or shared through the broker.
+
+        Returns:
+            A tuple (rows, meta): rows iterates over the list records, and meta
+            receives the other top-level keys of the response (e.g. list_info).
+            meta is complete once rows is exhausted.
+        """
+        url, payload, request_headers = self._prepare(endpoint, data)
+        meta = {}
+        return self._send(url, 'GET', payload, request_headers, max_retries, retry_delay, stream=(list_key, meta)), meta
+
+    def _prepare(self, endpoint, data=None, body=None, headers=None):
+        """Return the URL, encoded payload and headers of an API request."""
         self._ensure_auth()
 
         url = "{0}/{1}".format(self.base_url, endpoint)
 
-        headers = {
+        request_headers = {
             'Authorization': 'Zoho-oauthtoken {0}'.format(self.auth_token),
             'Accept': 'application/vnd.manageengine.sdp.v3+json'
         }
         payload = None
-        if data:
-            payload = urllib_parse.urlencode({'input_data': json.dumps(data)})
-            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if body is not None:
+            payload = body
+        elif data:
+            payload = urllib_parse.urlencode({'input_data': json_dumps(data)})
+            request_headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if headers:
+            request_headers.update(headers)
+        return url, payload, request_headers
+
+    def _send(self, url, method, payload, request_headers, max_retries, retry_delay, stream=None):
+        """Send a request, retrying transient errors, and return the parsed response.
+
+        With stream=(list_key, meta), an iterator over the list rows is
+        returned instead (see request_stream).
+        """
+        # One span per request, with a child span per attempt (see _fetch)
+        name = '{0} {1}'.format(method, url.replace(self.base_url + '/', '', 1))
+        with trace_span(name, **{'http.request.method': method, 'sdp.max_retries': max_retries}) as span:
+            last_info = None
+            for attempt in range(max_retries + 1):
+                if self.broker is not None and self.rate_limit:
+                    self.broker.permit('rate/{0}/{1}'.format(self.domain, self.portal), self.rate_limit)
+                response, info = self._fetch(
+                    url, payload, method, request_headers, hedge=method == 'GET' and stream is None, compress=True)
+
+                status_code = info.get('status', -1)
+                last_info = info
+                span.set(**{'sdp.attempts': attempt + 1, 'http.response.status_code': status_code})
+
+                # If request succeeded (response is not None), break out of retry loop
+                if response:
+                    break
+
+                # Check if the error is retryable
+                delay = retry_delay * (2 ** attempt)
+                retryable = status_code in self.RETRYABLE_STATUS_CODES and attempt < max_retries
+
+                # Skip retries that could not get an answer before the deadline
+                if retryable and not self.deadline.allows(delay + 1):
+                    retryable = False
+                    self.module.warn(
+                        "Request to {0} returned HTTP {1}; not retrying as the task deadline of {2}s "
+                        "would pass first".format(url, status_code, self.deadline.seconds)
+                    )
 
-        last_info = None
-        for attempt in range(max_retries + 1):
-            response, info = fetch_url(
-                self.module,
-                url,
-                data=payload,
-                method=method,
-                headers=headers
-            )
+                if retryable:
+                    self.module.warn(
+                        "Request to {0} returned HTTP {1}, retrying in {2}s (attempt {3}/{4})".format(
+                            url, status_code, delay, attempt + 1, max_retries
+                        )
+                    )
+                    time.sleep(delay)
+                    continue
 
-            status_code = info.get('status', -1)
-            last_info = info
+                # Non-retryable error or retries exhausted
+                handle_error(self.module, info, "API Request Failed")
 
-            # If request succeeded (response is not None), break out of retry loop
-            if response:
-                break
+            if stream is not None:
+                return self._stream_response(response, last_info, *stream)
+            return self._parse_response(response, last_info)
 
-            # Check if the error is retryable
-            if status_code in self.RETRYABLE_STATUS_CODES and attempt < max_retries:
-                delay = retry_delay * (2 ** attempt)
-                self.module.warn(
-                    "Request to {0} returned HTTP {1}, retrying in {2}s (attempt {3}/{4})".format(
-                        url, status_code, delay, attempt + 1, max_retries
-                    )
-                )
-                time.sleep(delay)
-                continue
+    def _fetch(self, url, payload, method, request_headers, hedge=False, compress=False, renewed=False):
+        """Call fetch_url through the circuit breaker, holding a slot of the adaptive limiter when one is active.
+
+        With hedge and hedging enabled, the call is made through hedged_call;
+        the winning response is returned and the losing one closed. With compress,
+        gzip or deflate encoding is requested and the returned response decodes
+        the body while it is read, counting bytes in self.transfer. A request
+        rejected with HTTP 401 is sent once more after renewing a generated
+        access token (see _renew_auth).
+        """
+        allowed, retry_in = self.circuit.allow()
+        if not allowed:
+            state = self.circuit.state()
+            self.module.fail_json(
+                msg="SDP Cloud portal {0} is failing: {1} consecutive server or connection errors. "
+                    "Failing fast; requests resume in {2}s.".format(self.circuit.key, state['failures'], int(retry_in) + 1),
+                circuit=state
+            )
 
-            # Non-retryable error or retries exhausted
-            handle_error(self.module, info, "API Request Failed")
+        timeout = self._timeout('{0} {1}'.format(method, url))
+
+        def _open():
+            if not compress:
+                return fetch_url(self.module, url, data=payload, method=method, headers=request_headers, timeout=timeout)
+            headers = dict(request_headers)
+            headers.setdefault('Accept-Encoding', ACCEPT_ENCODING)
+            response, info = fetch_url(
+                self.module, url, data=payload, method=method, headers=headers, timeout=timeout, decompress=False)
+            encoding = content_encoding(info)
+            if response is None:
+                info['body'] = decode_body(info.get('body'), encoding)
+                return response, info
+            return DecodingReader(response, encoding, self.transfer), info
+
+        def _call():
+            if not (hedge and self.hedge):
+                return _open()
+            return hedged_call(_attempt, self.hedge, discard=lambda result: result[0].close())
+
+        def _attempt():
+            response, info = _open()
+            return response is not None, (response, info)
+
+        with trace_span('HTTP {0}'.format(method), SPAN_KIND_CLIENT, **{
+            'http.request.method': method, 'server.address': self.domain, 'url.full': url,
+        }) as span:
+            # Propagate the trace context (W3C Trace Context) when tracing is on
+            traceparent = span.traceparent()
+            if traceparent:
+                request_headers = dict(request_headers, traceparent=traceparent)
+
+            limiter = self.limiter
+            if limiter is None:
+                response, info = _call()
+            else:
+                with limiter.slot() as outcome:
+                    response, info = _call()
+                    outcome(info.get('status', -1), info)
+
+            status = info.get('status', -1)
+            span.set(**{'http.response.status_code': status})
+            if status < 0 or status >= 400:
+                span.fail(info.get('msg') or 'HTTP {0}'.format(status))
+
+        self.circuit.record(info.get('status', -1))
+        info.setdefault('url', url)
+        if info.get('status', -1) == 401 and not renewed and self._renew_auth(request_headers):
+            return self._fetch(url, payload, method, request_headers, hedge, compress, renewed=True)
+        return response, info
+
+    def _stream_response(self, response, info, list_key, meta):
+        """Validate a streamed list response and iterate over its rows."""
+        if info.get('status', -1) >= 400:
+            return self._parse_response(response, info)
+
+        from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.json_stream import iter_json_array
+
+        def _rows():
+            try:
+                for row in iter_json_array(response, list_key, meta):
+                    yield row
+            except ValueError as e:
+                self.module.fail_json(msg="Invalid JSON response from SDP API: {0}".format(e))
+            except READ_ERRORS as e:
+                self._read_failed(info, e)
+            self._check_response_status(meta)
+
+        return _rows()
+
+    def _check_response_status(self, result):
+        """Fail on API-level errors reported with an HTTP 200 response."""
+        resp_status = result.get('response_status', {})
+        if isinstance(resp_status, dict) and resp_status.get('status_code', 2000) >= 4000:
+            self.module.fail_json(
+                msg="{0}".format(resp_status.get('messages', [{}])[0].get('message', 'API Error')),
+                status=resp_status.get('status_code'),
+                response=result
+            )
 
-        return self._parse_response(response, last_info)
+    def _read_failed(self, info, error):
+        """Fail the module for a connection error raised while reading a response body."""
+        self.module.fail_json(
+            msg="Failed to read the response from {0}: {1}".format(info.get('url'), error),
+            status=info.get('status')
+        )
 
     def _parse_response(self, response, info):
         """Parse and validate the API response."""
         status_code = info.get('status', -1)
-        body = response.read()
+        try:
+            body = response.read()
+        except READ_ERRORS as e:
+            self._read_failed(info, e)
 
         # Treat HTTP 4xx/5xx as failure (e.g. 404 wrong endpoint) so we don't return changed=True
         if status_code >= 400:
@@ -233,19 +674,13 @@ class SDPClient:
             return {"status": status_code, "msg": "Empty response body"}
 
         try:
-            result = json.loads(body)
+            result = json_loads(body)
         except ValueError:
             self.module.fail_json(msg="Invalid JSON response from SDP API", raw_response=body)
 
         # Check for API-level errors even on HTTP 200
         if isinstance(result, dict):
-            resp_status = result.get('response_status', {})
-            if isinstance(resp_status, dict) and resp_status.get('status_code', 2000) >= 4000:
-                self.module.fail_json(
-                    msg="{0}".format(resp_status.get('messages', [{}])[0].get('message', 'API Error')),
-                    status=resp_status.get('status_code'),
-                    response=result
-                )
+            self._check_response_status(result)
 
         return result
 
@@ -260,12 +695,11 @@ class SDPClient:
             'Accept': 'application/v3+json'
         }
 
-        response, info = fetch_url(
-            self.module,
-            url,
-            method='GET',
-            headers=headers
-        )
+        key = ('get_record', url, tuple(sorted(headers.items())))
+        return REQUEST_FLIGHTS.do(key, lambda: self._fetch_record(url, headers))
+
+    def _fetch_record(self, url, headers):
+        response, info = self._fetch(url, None, 'GET', headers, hedge=True, compress=True)
 
         status_code = info.get('status', -1)
 
@@ -273,26 +707,43 @@ class SDPClient:
         if status_code == 404 or not response:
             return None
 
-        body = response.read()
+        try:
+            body = response.read()
+        except READ_ERRORS as e:
+            self._read_failed(info, e)
         if not body:
             return None
 
         try:
-            return json.loads(body)
+            return json_loads(body)
         except ValueError:
             return None
 
 
+def get_record_key(module):
+    """Return the key the API wraps the addressed record in.
+
+    This is the parent module name (e.g. 'request'), or the child's root key
+    (e.g. 'note') when a child_module is addressed.
+    """
+    child_module = module.params.get('child_module')
+    if child_module:
+        return CHILD_MODULE_CONFIG[child_module]['root_key']
+    return module.params['parent_module_name']
+
+
 def get_current_record(client, module):
     """Fetch the current state of a record for idempotency checks.
 
     Returns:
         The record dict (e.g., response['request']) if found, or None if no parent_id
-        or record does not exist.
+        (or child_id, for child records) or record does not exist.
     """
     parent_id = module.params.get('parent_id')
     if not parent_id:
         return None
+    if module.params.get('child_module') and not module.params.get('child_id'):
+        return None
 
     endpoint = construct_endpoint(module)
     result = client.get_record(endpoint)
@@ -301,8 +752,64 @@ def get_current_record(client, module):
         return None
 
     # The API wraps the record under the module name key (e.g., 'request', 'problem')
-    parent_module = module.params['parent_module_name']
-    return result.get(parent_module)
+    return result.get(get_record_key(module))
+
+
+def list_all_records(client, endpoint, list_key, list_info=None, row_count=100, shared_ttl=None, extract_rows=None):
+    """Fetch every row of a list endpoint by following list_info.has_more_rows.
+
+    Args:
+        client: SDPClient instance.
+        endpoint: List endpoint path (e.g. 'requests/1/worklogs').
+        list_key: Key the rows are returned under (e.g. 'worklogs').
+        list_info: Extra list_info keys (sorting, search criteria) sent with every page.
+        row_count: Page size (max 100).
+        shared_ttl: Passed to SDPClient.request for every page.
+        extract_rows: Function returning the rows of a page response, for
+            endpoints that do not always use list_key. Defaults to response[list_key].
+
+    Returns:
+        The list of all rows.
+    """
+    rows = []
+    start_index = 1
+    while True:
+        page_info = dict(list_info or {})
+        page_info.update({'row_count': row_count, 'start_index': start_index})
+        request_args = {'shared_ttl': shared_ttl} if shared_ttl is not None else {}
+        response = client.request(endpoint=endpoint, method='GET', data={'list_info': page_info}, **request_args)
+
+        page = (extract_rows(response) if extract_rows else response.get(list_key)) or []
+        rows.extend(page)
+
+        if not page or not response.get('list_info', {}).get('has_more_rows'):
+            break
+        start_index += len(page)
+
+    return rows
+
+
+def iter_all_records(client, endpoint, list_key, list_info=None, row_count=100):
+    """Iterate over every row of a list endpoint, streaming each page.
+
+    Like list_all_records, but rows are yielded as they are parsed from the
+    response (see SDPClient.request_stream), so memory stays bounded by one
+    row rather than growing with the number of rows.
+    """
+    start_index = 1
+    while True:
+        page_info = dict(list_info or {})
+        page_info.update({'row_count': row_count, 'start_index': start_index})
+        rows, meta = client.request_stream(endpoint, list_key, data={'list_info': page_info})
+
+        count = 0
+        for row in rows:
+            count += 1
+            yield row
+
+        if not count or not meta.get('list_info', {}).get('has_more_rows'):
+            break
+        start_index += count
 
 
 def has_differences(desired_payload, current_record, parent_module):
@@ -341,6 +848,43 @@ def has_differences(desired_payload, current_record, parent_module):
     return False
 
 
+def trim_diff(before, after, desired_fields):
+    """Build a diff limited to the fields that actually change.
+
+    Only the fields in desired_fields (the fields being written) whose desired
+    value differs from before are included, so the diff stays proportional to
+    the change rather than to the record. UDFs are compared one by one.
+
+    Args:
+        before: The record before the write (may be empty).
+        after: The record after the write, or the desired fields in check mode.
+        desired_fields: The fields being written (e.g. payload['request']).
+
+    Returns:
+        A dict with 'before' and 'after' keys.
+    """
+    before = before or {}
+    after = after or {}
+    trimmed_before = {}
+    trimmed_after = {}
+
+    for key, desired_value in (desired_fields or {}).items():
+        if key == 'udf_fields' and isinstance(desired_value, dict):
+            current_udfs = before.get('udf_fields') or {}
+            after_udfs = after.get('udf_fields') or {}
+            for udf_key, udf_value in desired_value.items():
+                if not _values_match(udf_value, current_udfs.get(udf_key)):
+                    trimmed_before.setdefault('udf_fields', {})[udf_key] = current_udfs.get(udf_key)
+                    trimmed_after.setdefault('udf_fields', {})[udf_key] = after_udfs.get(udf_key, udf_value)
+            continue
+
+        if not _values_match(desired_value, before.get(key)):
+            trimmed_before[key] = before.get(key)
+            trimmed_after[key] = after.get(key, desired_value)
+
+    return {'before': trimmed_before, 'after': trimmed_after}
+
+
 def _values_match(desired, current):
     """Compare a desired value with the current value from the API.
 
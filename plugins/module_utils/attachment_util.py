@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import mimetypes
+import os
+import uuid
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import (
+    READ_ERRORS, construct_endpoint, list_all_records,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.error_handler import handle_error
+
+
+# Size of each block read from disk while streaming a file
+CHUNK_SIZE = 64 * 1024
+
+# Sub-resource operations used for attachments on a parent record
+ATTACHMENTS_OPERATION = 'attachments'
+UPLOAD_OPERATION = '_uploads'
+DOWNLOAD_OPERATION = 'download'
+
+# Suffix of partially downloaded files kept on disk for resuming
+PARTIAL_SUFFIX = '.part'
+
+# Multipart form field the upload endpoint expects the file under
+UPLOAD_FIELD_NAME = 'filename'
+
+
+class MultipartFileBody:
+    """A multipart/form-data request body that streams a single file from disk.
+
+    The body is never held in memory: iterating yields the multipart preamble,
+    the file contents in CHUNK_SIZE blocks and the closing boundary. Each
+    iteration reopens the file, so the same body can be resent on retries.
+    The total length is known up front and must be sent as Content-Length.
+    """
+
+    def __init__(self, path, field_name=UPLOAD_FIELD_NAME, chunk_size=CHUNK_SIZE, boundary=None):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.boundary = boundary or uuid.uuid4().hex
+        filename = os.path.basename(path).replace('"', '\\"')
+        file_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+        self._preamble = (
+            '--{0}\r\n'
+            'Content-Disposition: form-data; name="{1}"; filename="{2}"\r\n'
+            'Content-Type: {3}\r\n\r\n'
+        ).format(self.boundary, field_name, filename, file_type).encode('utf-8')
+        self._epilogue = '\r\n--{0}--\r\n'.format(self.boundary).encode('utf-8')
+        self._file_size = os.path.getsize(path)
+
+    @property
+    def content_type(self):
+        return 'multipart/form-data; boundary={0}'.format(self.boundary)
+
+    def __len__(self):
+        return len(self._preamble) + self._file_size + len(self._epilogue)
+
+    def __iter__(self):
+        yield self._preamble
+        with open(self.path, 'rb') as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        yield self._epilogue
+
+    def headers(self):
+        """Return the request headers describing this body."""
+        return {'Content-Type': self.content_type, 'Content-Length': str(len(self))}
+
+
+def attachment_size(attachment):
+    """Return the size in bytes of an attachment record, or None if unknown.
+
+    The API reports size either as a plain number or as {'value': ..., 'display_value': ...}.
+    """
+    size = attachment.get('size')
+    if isinstance(size, dict):
+        size = size.get('value')
+    try:
+        return int(size)
+    except (TypeError, ValueError):
+        return None
+
+
+def list_attachments(module, client, parent_id=None):
+    """List every attachment of a record (parent_id defaults to module.params['parent_id'])."""
+    endpoint = construct_endpoint(module, operation=ATTACHMENTS_OPERATION, parent_id=parent_id)
+    return list_all_records(client, endpoint, ATTACHMENTS_OPERATION)
+
+
+def plan_uploads(paths, existing_attachments):
+    """Split local files into those to upload and those already on the record.
+
+    A file is considered present when an attachment with the same name and
+    size exists. Duplicate paths are only uploaded once.
+
+    Returns:
+        A tuple (to_upload, skipped) of lists of dicts with path, name and size.
+    """
+    existing = set()
+    for attachment in existing_attachments:
+        existing.add((attachment.get('name'), attachment_size(attachment)))
+
+    to_upload = []
+    skipped = []
+    seen = set()
+    for path in paths:
+        entry = {'path': path, 'name': os.path.basename(path), 'size': os.path.getsize(path)}
+        key = (entry['name'], entry['size'])
+        if key in existing or key in seen:
+            skipped.append(entry)
+            continue
+        seen.add(key)
+        to_upload.append(entry)
+
+    return to_upload, skipped
+
+
+def upload_attachment(module, client, path):
+    """Upload a local file to the record identified by parent_id, streaming it from disk."""
+    endpoint = construct_endpoint(module, operation=UPLOAD_OPERATION)
+    body = MultipartFileBody(path)
+    return client.request(endpoint=endpoint, method='POST', body=body, headers=body.headers())
+
+
+def attachment_path(dest, parent_id, attachment):
+    """Return the local path an attachment is downloaded to: <dest>/<parent_id>/<id>/<name>.
+
+    A record can hold several attachments with the same name, so each one is
+    kept in a directory named after its attachment id.
+    """
+    name = os.path.basename(attachment.get('name') or attachment.get('id'))
+    return os.path.join(dest, str(parent_id), str(attachment.get('id')), name)
+
+
+def plan_downloads(dest, attachments_by_record):
+    """Split attachments into those to download and those already on disk.
+
+    A file is considered present when it exists locally with the size the API
+    reports. Attachments without a reported size are always downloaded.
+    Attachments that resolve to the same local path (e.g. listed without an id)
+    would overwrite each other and raise ValueError.
+
+    Args:
+        dest: Destination directory.
+        attachments_by_record: List of (parent_id, [attachment, ...]) tuples.
+
+    Returns:
+        A tuple (to_download, skipped) of lists of dicts with parent_id, id, name, size, path
+        and the attachment's content_url.
+    """
+    to_download = []
+    skipped = []
+    paths = set()
+    for parent_id, attachments in attachments_by_record:
+        for attachment in attachments:
+            path = attachment_path(dest, parent_id, attachment)
+            if path in paths:
+                raise ValueError("Attachments of record {0} resolve to the same local path {1}.".format(parent_id, path))
+            paths.add(path)
+            entry = {
+                'parent_id': parent_id,
+                'id': attachment.get('id'),
+                'name': os.path.basename(path),
+                'size': attachment_size(attachment),
+                'path': path,
+                'content_url': attachment.get('content_url'),
+            }
+            if entry['size'] is not None and os.path.isfile(path) and os.path.getsize(path) == entry['size']:
+                skipped.append(entry)
+            else:
+                to_download.append(entry)
+    return to_download, skipped
+
+
+def download_attachment(module, client, entry, chunk_size=CHUNK_SIZE):
+    """Stream one attachment to entry['path'], resuming a previous partial download.
+
+    Data is written to '<path>.part' in chunk_size blocks, so memory use does
+    not depend on the file size. If a partial file exists, an HTTP Range
+    request continues from its current size; servers that ignore the range
+    answer 200 and the file is rewritten from the start. The partial file is
+    renamed into place once complete. A connection error while reading the
+    body keeps the partial file, so that a re-run resumes from it.
+
+    Returns:
+        entry updated with the number of bytes written and the offset resumed from.
+    """
+    path = entry['path']
+    part_path = path + PARTIAL_SUFFIX
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    endpoint = entry.get('content_url') or construct_endpoint(
+        module,
+        operation='{0}/{1}/{2}'.format(ATTACHMENTS_OPERATION, entry['id'], DOWNLOAD_OPERATION),
+        parent_id=entry['parent_id'],
+    )
+
+    offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+    if entry.get('size') is not None and offset > entry['size']:
+        offset = 0
+
+    headers = {'Accept': '*/*'}
+    if offset:
+        headers['Range'] = 'bytes={0}-'.format(offset)
+
+    response, info = client.open_stream(endpoint, headers=headers)
+    status_code = info.get('status', -1)
+
+    if status_code == 416 and offset:
+        # Partial file no longer matches the remote file; start over
+        offset = 0
+        del headers['Range']
+        response, info = client.open_stream(endpoint, headers=headers)
+        status_code = info.get('status', -1)
+
+    if not response or status_code >= 400:
+        handle_error(module, info, "Failed to download attachment {0}".format(entry['name']))
+
+    if status_code != 206:
+        offset = 0
+
+    written = 0
+    read_error = None
+    with open(part_path, 'ab' if offset else 'wb') as f:
+        while True:
+            try:
+                chunk = response.read(chunk_size)
+            except READ_ERRORS as e:
+                # Keep what was written so far for the next run to resume from
+                read_error = e
+                break
+            if not chunk:
+                break
+            f.write(chunk)
+            written += len(chunk)
+
+    total = offset + written
+    if read_error is not None:
+        module.fail_json(
+            msg="Download of attachment {0} was interrupted after {1} bytes: {2}. Re-run to resume.".format(
+                entry['name'], total, read_error),
+            path=part_path,
+        )
+    if entry.get('size') is not None and total != entry['size']:
+        module.fail_json(
+            msg="Incomplete download of attachment {0}: got {1} of {2} bytes. Re-run to resume.".format(
+                entry['name'], total, entry['size']),
+            path=part_path,
+        )
+
+    os.rename(part_path, path)
+
+    result = dict(entry)
+    result['resumed_from'] = offset
+    result['bytes_written'] = written
+    return result
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import fcntl
+import os
+import socket
+import threading
+import time
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.cache import default_cache_dir
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.serializer import json_dumps, json_loads
+
+
+# Environment variable enabling the broker: '1'/'true'/'yes' for the default socket, or a socket path
+ENV_BROKER = 'SDP_CLOUD_BROKER'
+
+# Seconds without a connection after which a broker exits
+ENV_BROKER_IDLE = 'SDP_CLOUD_BROKER_IDLE'
+BROKER_IDLE_TIMEOUT = 600
+
+# Requests per second allowed per portal across all forks (0 = unlimited)
+ENV_BROKER_RATE = 'SDP_CLOUD_BROKER_RATE'
+
+# Seconds plain GET responses are shared between forks (0 = never)
+ENV_BROKER_GET_TTL = 'SDP_CLOUD_BROKER_GET_TTL'
+
+# Seconds a fork may hold the lease on a missing key before others load it themselves
+LEASE_TIMEOUT = 30
+
+# Seconds a client waits for the socket of a broker it started
+STARTUP_TIMEOUT = 2.0
+
+# Clients already created in this process, by socket path (None once found unusable)
+BROKERS = {}
+
+
+def broker_socket_path():
+    """Return the broker socket path from $SDP_CLOUD_BROKER, or None if the broker is disabled."""
+    value = (os.environ.get(ENV_BROKER) or '').strip()
+    if not value or value.lower() in ('0', 'false', 'no', 'off'):
+        return None
+    if value.lower() in ('1', 'true', 'yes', 'on'):
+        return os.path.join(default_cache_dir(), 'broker.sock')
+    return value
+
+
+def env_number(name, default=0):
+    """Return a non-negative number from the environment, or default if unset or invalid."""
+    try:
+        return max(float(os.environ.get(name, default)), 0)
+    except ValueError:
+        return default
+
+
+class BrokerStore:
+    """The broker's state: values with expiry, load leases and per-key rate buckets."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._values = {}
+        self._leases = {}
+        self._buckets = {}
+
+    def _live(self, key, now):
+        entry = self._values.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= now:
+            del self._values[key]
+            entry = None
+        return entry
+
+    def get(self, key, lease=False):
+        """Return {'found': True, 'value': ...}, or {'found': False, 'lease': bool}.
+
+        With lease, a miss grants the caller the lease to load the key unless
+        another caller holds it; then this waits until that caller stores the
+        value, releases the lease or the lease expires.
+        """
+        with self._cond:
+            while True:
+                now = time.time()
+                entry = self._live(key, now)
+                if entry is not None:
+                    return {'found': True, 'value': entry[1]}
+                if not lease:
+                    return {'found': False, 'lease': False}
+                held_until = self._leases.get(key)
+                if held_until is None or held_until <= now:
+                    self._leases[key] = now + LEASE_TIMEOUT
+                    return {'found': False, 'lease': True}
+                self._cond.wait(held_until - now)
+
+    def set(self, key, value, ttl=None):
+        with self._cond:
+            expires = time.time() + ttl if ttl else None
+            self._values[key] = (expires, value)
+            self._leases.pop(key, None)
+            self._cond.notify_all()
+        return {}
+
+    def release(self, key):
+        with self._cond:
+            self._leases.pop(key, None)
+            self._cond.notify_all()
+        return {}
+
+    def delete(self, key):
+        with self._cond:
+            self._values.pop(key, None)
+        return {}
+
+    def permit(self, key, rate, burst=1):
+        """Reserve a slot in a token bucket and return {'wait': seconds} until it may be used."""
+        with self._cond:
+            now = time.time()
+            tokens, last = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate) - 1
+            self._buckets[key] = (tokens, now)
+        return {'wait': -tokens / rate if tokens < 0 else 0}
+
+    def handle(self, message):
+        op = message.get('op')
+        key = message.get('key')
+        if op == 'get':
+            return self.get(key, bool(message.get('lease')))
+        if op == 'set':
+            return self.set(key, message.get('value'), message.get('ttl'))
+        if op == 'release':
+            return self.release(key)
+        if op == 'delete':
+            return self.delete(key)
+        if op == 'permit':
+            return self.permit(key, float(message['rate']), float(message.get('burst') or 1))
+        if op == 'ping':
+            return {'pid': os.getpid()}
+        raise ValueError("Unknown broker operation: {0}".format(op))
+
+
+class _BrokerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.touch()
+        try:
+            reply = self.server.store.handle(json_loads(self.rfile.readline()))
+            reply['ok'] = True
+        except Exception as e:
+            reply = {'ok': False, 'error': str(e)}
+        self.wfile.write(json_dumps(reply).encode('utf-8') + b'\n')
+
+
+class BrokerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A unix socket server answering one JSON line request per connection."""
+
+    daemon_threads = True
+
+    def __init__(self, path, idle_timeout=BROKER_IDLE_TIMEOUT):
+        self.store = BrokerStore()
+        self.idle_timeout = idle_timeout
+        self.last_seen = time.time()
+        self._stopping = False
+        socketserver.UnixStreamServer.__init__(self, path, _BrokerHandler)
+        os.chmod(path, 0o600)
+
+    def touch(self):
+        self.last_seen = time.time()
+
+    def service_actions(self):
+        if self.idle_timeout and not self._stopping and time.time() - self.last_seen > self.idle_timeout:
+            self._stopping = True
+            # shutdown() waits for serve_forever, so it must not run on this thread
+            threading.Thread(target=self.shutdown).start()
+
+
+def run_broker(path, idle_timeout=BROKER_IDLE_TIMEOUT):
+    """Serve the broker on path until idle, unless another broker already owns it."""
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    with open(path + '.lock', 'a') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (OSError, IOError):
+            return
+        # Holding the lock, any existing socket belongs to a dead broker
+        if os.path.exists(path):
+            os.remove(path)
+        server = BrokerServer(path, idle_timeout)
+        try:
+            server.serve_forever(poll_interval=1)
+        finally:
+            server.server_close()
+            os.remove(path)
+
+
+def spawn_broker(path):
+    """Start a detached broker process serving path."""
+    pid = os.fork()
+    if pid:
+        os.waitpid(pid, 0)
+        return
+
+    # Child: detach from the module process so Ansible does not wait for it
+    try:
+        os.setsid()
+        if os.fork():
+            os._exit(0)
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        run_broker(path, env_number(ENV_BROKER_IDLE, BROKER_IDLE_TIMEOUT))
+    finally:
+        os._exit(0)
+
+
+class BrokerClient:
+    """Client of the controller-local broker shared by all forks of a run.
+
+    Every call opens a short connection and returns None when the broker cannot
+    be reached, so callers fall back to doing the work themselves.
+    """
+
+    def __init__(self, path, timeout=LEASE_TIMEOUT + 5):
+        self.path = path
+        self.timeout = timeout
+
+    def call(self, message):
+        """Send one request and return the reply dict, or None if the broker is unavailable."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+            sock.sendall(json_dumps(message).encode('utf-8') + b'\n')
+            reply = sock.makefile('rb').readline()
+        except (OSError, IOError, socket.error):
+            return None
+        finally:
+            sock.close()
+        try:
+            reply = json_loads(reply)
+        except ValueError:
+            return None
+        return reply if reply.get('ok') else None
+
+    def ping(self):
+        return self.call({'op': 'ping'}) is not None
+
+    def get(self, key):
+        reply = self.call({'op': 'get', 'key': key})
+        return reply.get('value') if reply and reply.get('found') else None
+
+    def set(self, key, value, ttl=None):
+        self.call({'op': 'set', 'key': key, 'value': value, 'ttl': ttl})
+
+    def delete(self, key):
+        self.call({'op': 'delete', 'key': key})
+
+    def fetch(self, key, loader, ttl=None):
+        """Return the shared value of key, calling loader() in only one fork when it is missing.
+
+        Forks asking for a key another fork is loading wait for its value
+        instead of loading it again. loader() must return a JSON-serializable value.
+        """
+        reply = self.call({'op': 'get', 'key': key, 'lease': True})
+        if reply is None:
+            return loader()
+        if reply.get('found'):
+            return reply.get('value')
+        try:
+            value = loader()
+        except BaseException:
+            self.call({'op': 'release', 'key': key})
+            raise
+        self.set(key, value, ttl)
+        return value
+
+    def permit(self, key, rate, burst=1):
+        """Wait for a rate limit slot shared by all forks; returns immediately if unavailable."""
+        reply = self.call({'op': 'permit', 'key': key, 'rate': rate, 'burst': burst})
+        if reply and reply.get('wait'):
+            time.sleep(reply['wait'])
+
+
+def get_broker():
+    """Return the BrokerClient of $SDP_CLOUD_BROKER, starting the broker on demand.
+
+    Returns None when the broker is disabled or cannot be started, in which
+    case callers work as if it did not exist.
+    """
+    path = broker_socket_path()
+    if path is None:
+        return None
+    if path in BROKERS:
+        return BROKERS[path]
+
+    client = BrokerClient(path)
+    if not client.ping():
+        try:
+            spawn_broker(path)
+        except OSError:
+            pass
+        deadline = time.time() + STARTUP_TIMEOUT
+        while not client.ping() and time.time() < deadline:
+            time.sleep(0.05)
+    BROKERS[path] = client if client.ping() else None
+    return BROKERS[path]
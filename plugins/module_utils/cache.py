@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import fcntl
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.serializer import json_dumps, json_loads
+
+
+# Environment variable overriding the cache directory
+ENV_CACHE_DIR = 'SDP_CLOUD_CACHE_DIR'
+
+
+def default_cache_dir():
+    """Return the cache directory: $SDP_CLOUD_CACHE_DIR, else ~/.cache/manageengine.sdp_cloud."""
+    return os.environ.get(ENV_CACHE_DIR) or os.path.join(os.path.expanduser('~'), '.cache', 'manageengine.sdp_cloud')
+
+
+def portal_cache_key(module, *parts):
+    """Build a cache key scoped to the module's domain and portal."""
+    return '/'.join([module.params['domain'], module.params['portal_name']] + [str(p) for p in parts])
+
+
+class FileCache:
+    """A small JSON cache on disk shared by module runs on the same controller.
+
+    Each key is stored in its own file together with the time it was written,
+    so readers can apply their own TTL. Writes go to a temporary file that is
+    renamed into place, so concurrent readers never see a partial entry.
+    Unreadable entries are treated as missing.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest + '.json')
+
+    def get(self, key, ttl=None):
+        """Return the cached value, or None if it is missing, unreadable or older than ttl seconds."""
+        entry = self.get_entry(key)
+        if entry is None:
+            return None
+        if ttl is not None and time.time() - entry['stored_at'] > ttl:
+            return None
+        return entry['value']
+
+    def get_entry(self, key):
+        """Return the raw entry ({'key', 'stored_at', 'value'}) regardless of age, or None."""
+        try:
+            with open(self._path(key), 'rb') as f:
+                entry = json_loads(f.read())
+        except (OSError, IOError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get('key') != key or 'stored_at' not in entry:
+            return None
+        return entry
+
+    def set(self, key, value):
+        """Store a JSON-serializable value. Failures to write are ignored; the cache is an optimization."""
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json_dumps({'key': key, 'stored_at': time.time(), 'value': value}).encode('utf-8'))
+            os.replace(tmp_path, self._path(key))
+        except (OSError, IOError):
+            pass
+
+    @contextmanager
+    def locked(self, key):
+        """Hold an exclusive lock on key across processes, for read-modify-write updates.
+
+        The lock is taken on a separate '.lock' file, so readers of the entry
+        are never blocked. If the lock file cannot be created the block runs
+        unlocked; the cache is an optimization.
+        """
+        f = None
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            f = open(self._path(key)[:-len('.json')] + '.lock', 'a')
+            fcntl.flock(f, fcntl.LOCK_EX)
+        except (OSError, IOError):
+            if f is not None:
+                f.close()
+            f = None
+        try:
+            yield
+        finally:
+            if f is not None:
+                f.close()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
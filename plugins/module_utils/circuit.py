@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import fcntl
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.cache import default_cache_dir
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.serializer import json_dumps, json_loads
+
+
+# Consecutive failures opening the circuit (0 disables the breaker)
+ENV_CIRCUIT_THRESHOLD = 'SDP_CLOUD_CIRCUIT_THRESHOLD'
+CIRCUIT_THRESHOLD = 5
+
+# Seconds an open circuit fails fast before letting a probe request through
+ENV_CIRCUIT_COOLDOWN = 'SDP_CLOUD_CIRCUIT_COOLDOWN'
+CIRCUIT_COOLDOWN = 30
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def is_failure(status):
+    """Tell whether a response status counts against the circuit (5xx or no response at all)."""
+    return status is None or status <= 0 or status >= 500
+
+
+class CircuitBreaker:
+    """A circuit breaker whose state is shared by every process on the host.
+
+    The state of a key (domain/portal) is kept in a small JSON file under
+    the cache directory and updated under an exclusive lock, so all forks of
+    a run count failures together. After `threshold` consecutive failures the
+    circuit opens and allow() refuses requests for `cooldown` seconds; then a
+    single probe request is let through (half-open). Its success closes the
+    circuit, its failure opens it for another cooldown.
+    """
+
+    def __init__(self, key, threshold=CIRCUIT_THRESHOLD, cooldown=CIRCUIT_COOLDOWN, state_dir=None):
+        self.key = key
+        self.threshold = threshold
+        self.cooldown = cooldown
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        self.path = os.path.join(state_dir or default_cache_dir(), 'circuit-' + digest + '.json')
+        # Whether this thread sent the half-open probe
+        self._local = threading.local()
+
+    @contextmanager
+    def _locked(self):
+        directory = os.path.dirname(self.path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        with open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                state = json_loads(f.read() or '{}')
+            except ValueError:
+                state = {}
+            before = dict(state)
+            yield state
+            if state != before:
+                f.seek(0)
+                f.truncate()
+                f.write(json_dumps(state))
+
+    def state(self):
+        """Return the stored state: {'state', 'failures', 'opened_at'}."""
+        try:
+            with open(self.path) as f:
+                state = json_loads(f.read())
+        except (OSError, IOError, ValueError):
+            state = {}
+        return {'state': state.get('state', CLOSED), 'failures': state.get('failures', 0), 'opened_at': state.get('opened_at')}
+
+    def allow(self):
+        """Return (allowed, retry_in): whether a request may be sent now, else seconds until the next probe."""
+        if not self.threshold:
+            return True, 0
+        # Lock-free fast path for the usual closed circuit
+        current = self.state()
+        if current['state'] == CLOSED:
+            return True, 0
+
+        try:
+            with self._locked() as state:
+                now = time.time()
+                if state.get('state', CLOSED) == CLOSED:
+                    return True, 0
+                # An open circuit, or a half-open one whose probe never reported back
+                wait = state.get('opened_at', 0) + self.cooldown - now
+                if wait > 0:
+                    return False, wait
+                state['state'] = HALF_OPEN
+                state['opened_at'] = now
+                self._local.probing = True
+                return True, 0
+        except (OSError, IOError):
+            return True, 0
+
+    def record(self, status):
+        """Record the outcome of a request by its HTTP status (-1 for no response)."""
+        if not self.threshold:
+            return
+        failed = is_failure(status)
+        probing = getattr(self._local, 'probing', False)
+        self._local.probing = False
+        if not failed and not probing:
+            current = self.state()
+            if current['state'] == CLOSED and not current['failures']:
+                return
+
+        try:
+            with self._locked() as state:
+                if not failed:
+                    state.clear()
+                    state.update(state=CLOSED, failures=0)
+                else:
+                    state['failures'] = state.get('failures', 0) + 1
+                    # Late failures of requests sent before the circuit opened do not extend the cooldown
+                    closed = state.get('state', CLOSED) == CLOSED
+                    if probing or (closed and state['failures'] >= self.threshold):
+                        state['state'] = OPEN
+                        state['opened_at'] = time.time()
+        except (OSError, IOError):
+            pass
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+
+
+COLUMNAR_FORMAT = 'sdp_columnar'
+COLUMNAR_VERSION = 1
+
+
+def to_columnar(rows):
+    """
+    Converts a list of row dicts into a columnar layout.
+
+    Each field becomes one list of values (field -> [value per row]), so key names are
+    stored once instead of per row. Columns whose values are all dicts (lookups such as
+    status, priority or users) are interned: identical dicts are stored once in a shared
+    'lookups' table and the column holds their table indexes instead.
+
+    Layout:
+        format/version: identifies the layout for from_columnar().
+        count: number of rows.
+        columns: field -> list of values (or lookup indexes for interned columns).
+        interned: names of the interned columns.
+        lookups: the shared table of interned dicts.
+        absent: field -> row indexes that did not have the field (only when any are missing).
+    """
+    rows = rows or []
+    fields = []
+    seen_fields = set()
+    for row in rows:
+        for field in row:
+            if field not in seen_fields:
+                seen_fields.add(field)
+                fields.append(field)
+
+    columns = {}
+    absent = {}
+    interned = []
+    lookups = []
+    lookup_index = {}
+
+    for field in fields:
+        values = []
+        missing = []
+        for index, row in enumerate(rows):
+            if field not in row:
+                missing.append(index)
+            values.append(row.get(field))
+
+        present = [v for v in values if v is not None]
+        if present and all(isinstance(v, dict) for v in present):
+            refs = []
+            for value in values:
+                if value is None:
+                    refs.append(None)
+                    continue
+                key = json.dumps(value, sort_keys=True)
+                if key not in lookup_index:
+                    lookup_index[key] = len(lookups)
+                    lookups.append(value)
+                refs.append(lookup_index[key])
+            values = refs
+            interned.append(field)
+
+        columns[field] = values
+        if missing:
+            absent[field] = missing
+
+    result = {
+        'format': COLUMNAR_FORMAT,
+        'version': COLUMNAR_VERSION,
+        'count': len(rows),
+        'columns': columns,
+        'interned': interned,
+        'lookups': lookups,
+    }
+    if absent:
+        result['absent'] = absent
+    return result
+
+
+def is_columnar(data):
+    """Returns True if data is a layout produced by to_columnar()."""
+    return isinstance(data, dict) and data.get('format') == COLUMNAR_FORMAT
+
+
+def from_columnar(data):
+    """
+    Rebuilds the list of row dicts from a to_columnar() layout.
+    Interned lookups are copied per row, so rows can be modified independently.
+    """
+    if not is_columnar(data):
+        raise ValueError("Input is not an SDP columnar result.")
+
+    count = data.get('count', 0)
+    columns = data.get('columns', {})
+    interned = set(data.get('interned', []))
+    lookups = data.get('lookups', [])
+    absent = dict((field, set(indexes)) for field, indexes in data.get('absent', {}).items())
+
+    rows = [{} for _index in range(count)]
+    for field, values in columns.items():
+        missing = absent.get(field, ())
+        for index, value in enumerate(values):
+            if index in missing:
+                continue
+            if field in interned and value is not None:
+                value = dict(lookups[value])
+            rows[index][field] = value
+    return rows
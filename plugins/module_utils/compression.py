@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+import zlib
+
+
+# Encodings requested from the API and decoded by DecodingReader
+ACCEPT_ENCODING = 'gzip, deflate'
+
+# Bytes read from the network per chunk
+CHUNK_SIZE = 64 * 1024
+
+
+class TransferStats:
+    """Counts bytes received on the wire and after decoding, across threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        self.responses = 0
+
+    def add(self, wire_bytes, body_bytes, responses=0):
+        with self._lock:
+            self.wire_bytes += wire_bytes
+            self.body_bytes += body_bytes
+            self.responses += responses
+
+    def as_dict(self):
+        with self._lock:
+            return {'wire_bytes': self.wire_bytes, 'body_bytes': self.body_bytes, 'responses': self.responses}
+
+
+def _decoder(encoding, first_bytes):
+    if encoding == 'gzip':
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    # 'deflate' should be zlib-wrapped, but some servers send a raw deflate stream
+    zlib_header = len(first_bytes) >= 2 and first_bytes[0] & 0x0F == 8 and (first_bytes[0] << 8 | first_bytes[1]) % 31 == 0
+    return zlib.decompressobj(zlib.MAX_WBITS if zlib_header else -zlib.MAX_WBITS)
+
+
+def content_encoding(info):
+    """Return the supported content encoding of a fetch_url info dict, or None for identity."""
+    encoding = (info.get('content-encoding') or '').strip().lower()
+    return encoding if encoding in ('gzip', 'deflate') else None
+
+
+class DecodingReader:
+    """A file-like wrapper decoding a gzip or deflate response body while it is read.
+
+    The body is read from the network in chunks and decompressed
+    incrementally, so read(size) never holds more than one chunk of
+    compressed data. With encoding None the body is passed through. Bytes read
+    and returned are added to stats when the body has been read completely.
+    """
+
+    def __init__(self, fp, encoding=None, stats=None):
+        self._fp = fp
+        self.encoding = encoding
+        self.stats = stats
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        self._decoder = None
+        self._buffer = b''
+        self._eof = False
+
+    def _fill(self):
+        """Read and decode one chunk into the buffer; sets _eof at the end of the body."""
+        chunk = self._fp.read(CHUNK_SIZE)
+        if not chunk:
+            if self._decoder is not None:
+                self._buffer += self._decoder.flush()
+            self._eof = True
+            if self.stats is not None:
+                self.stats.add(self.wire_bytes, self.body_bytes + len(self._buffer), responses=1)
+            return
+        self.wire_bytes += len(chunk)
+        if self.encoding is None:
+            self._buffer += chunk
+            return
+        if self._decoder is None:
+            self._decoder = _decoder(self.encoding, chunk)
+        data = self._decoder.decompress(chunk)
+        # A gzip body may hold several members
+        while self._decoder.eof and self._decoder.unused_data:
+            rest = self._decoder.unused_data
+            self._decoder = _decoder(self.encoding, rest)
+            data += self._decoder.decompress(rest)
+        self._buffer += data
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            while not self._eof:
+                self._fill()
+            data, self._buffer = self._buffer, b''
+        else:
+            while len(self._buffer) < size and not self._eof:
+                self._fill()
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        self.body_bytes += len(data)
+        return data
+
+    def close(self):
+        close = getattr(self._fp, 'close', None)
+        if close is not None:
+            close()
+
+
+def decode_body(body, encoding):
+    """Decode a complete gzip or deflate body; returns it unchanged if it cannot be decoded."""
+    if not encoding or not isinstance(body, bytes) or not body:
+        return body
+    try:
+        decoder = _decoder(encoding, body)
+        return decoder.decompress(body) + decoder.flush()
+    except zlib.error:
+        return body
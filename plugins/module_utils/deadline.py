@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import time
+
+
+class Deadline:
+    """A point in time a task must finish by, or no limit when seconds is None."""
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self):
+        """Return the seconds left (possibly negative), or None without a deadline."""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    def expired(self):
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def timeout(self, timeout):
+        """Return timeout, shortened to the time left before the deadline."""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return max(min(timeout, remaining), 0)
+
+    def allows(self, seconds):
+        """Tell whether something taking seconds can still finish before the deadline."""
+        remaining = self.remaining()
+        return remaining is None or remaining > seconds
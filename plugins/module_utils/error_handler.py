@@ -5,7 +5,7 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-import json
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.serializer import json_loads
 
 
 def handle_error(module, info, default_msg):
@@ -24,7 +24,7 @@ def handle_error(module, info, default_msg):
             err_body = None
         try:
             if err_body is None:
-                err_body = json.loads(response_body)
+                err_body = json_loads(response_body)
                 error_details = err_body
             # SDP Cloud V3 API Error Structure
             if err_body and 'response_status' in err_body:
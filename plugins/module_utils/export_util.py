@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import base64
+import time
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import list_all_records
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.serializer import json_dumps, json_loads
+
+
+def time_value(record, field):
+    """Return a record's datetime field as epoch milliseconds, or None.
+
+    The API returns datetime fields as {'value': '<ms>', 'display_value': ...}.
+    """
+    value = record.get(field)
+    if isinstance(value, dict):
+        value = value.get('value')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def updated_time(record):
+    """Return when a record last changed: last_updated_time, or created_time for never-updated records."""
+    value = time_value(record, 'last_updated_time')
+    return value if value is not None else time_value(record, 'created_time')
+
+
+def time_range_criteria(field, start, end):
+    """Build search_criteria selecting start <= field < end."""
+    return [
+        {'field': field, 'condition': 'greater or equal', 'value': str(start)},
+        {'field': field, 'condition': 'lesser than', 'value': str(end), 'logical_operator': 'AND'},
+    ]
+
+
+def split_range(start, end, slices):
+    """Split [start, end) into at most `slices` contiguous, non-overlapping ranges."""
+    slices = max(1, min(slices, end - start))
+    step = (end - start) // slices
+    bounds = [start + step * i for i in range(slices)] + [end]
+    return [(bounds[i], bounds[i + 1]) for i in range(slices) if bounds[i] < bounds[i + 1]]
+
+
+def find_earliest(client, endpoint, list_key, field, end):
+    """Return the smallest value of field among records with field < end, or None if there are none."""
+    response = client.request(endpoint=endpoint, method='GET', data={'list_info': {
+        'row_count': 1,
+        'sort_field': field,
+        'sort_order': 'asc',
+        'search_criteria': [{'field': field, 'condition': 'lesser than', 'value': str(end)}],
+    }})
+    rows = response.get(list_key) or []
+    return time_value(rows[0], field) if rows else None
+
+
+def time_sliced_export(client, endpoint, list_key, field='created_time', start=None, end=None, slices=8, concurrency=4):
+    """Export every record of a list endpoint by fetching time slices in parallel.
+
+    The range [start, end) of a sortable datetime field is split into slices
+    that are paged independently, so each slice only needs shallow start_index
+    offsets. end defaults to the current time and is fixed before the first
+    request, so records created during the export are excluded and the result
+    is a consistent snapshot. start defaults to the earliest value on the
+    portal. Rows are de-duplicated by id.
+
+    Returns:
+        A tuple (rows, info) where info describes the exported range.
+    """
+    if end is None:
+        end = int(time.time() * 1000)
+    if start is None:
+        start = find_earliest(client, endpoint, list_key, field, end)
+
+    info = {'field': field, 'start_time': start, 'end_time': end, 'slices': 0}
+    if start is None or start >= end:
+        return [], info
+
+    ranges = split_range(start, end, slices)
+    info['slices'] = len(ranges)
+
+    def _fetch(bounds):
+        list_info = {
+            'sort_field': field,
+            'sort_order': 'asc',
+            'search_criteria': time_range_criteria(field, bounds[0], bounds[1]),
+        }
+        return list_all_records(client, endpoint, list_key, list_info=list_info)
+
+    rows = []
+    seen = set()
+    for slice_rows in client.map_concurrent(_fetch, ranges, concurrency):
+        for row in slice_rows:
+            row_id = row.get('id')
+            if row_id in seen:
+                continue
+            seen.add(row_id)
+            rows.append(row)
+
+    return rows, info
+
+
+CURSOR_VERSION = 1
+
+# Sort fields a keyset read can page on: every record has a value for them.
+# Other datetime fields (due_by_time, completed_time, ...) may be empty, and
+# such records could neither be ordered nor reached through the keyset bound.
+KEYSET_FIELDS = ('id', 'created_time', 'last_updated_time')
+
+
+def encode_cursor(state):
+    """Encode a keyset read state as an opaque, URL-safe string."""
+    raw = json_dumps(state, sort_keys=True).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor(). Raises ValueError if it is malformed."""
+    try:
+        state = json_loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor: {0}".format(e))
+    if not isinstance(state, dict) or state.get('version') != CURSOR_VERSION:
+        raise ValueError("Invalid cursor: unsupported cursor version.")
+    return state
+
+
+def new_cursor_state(parent_module, sort_field='created_time', sort_order='asc', row_count=100, filters=None):
+    """Return the state of a keyset read that has not fetched anything yet."""
+    return {
+        'version': CURSOR_VERSION,
+        'module': parent_module,
+        'sort_field': sort_field,
+        'sort_order': sort_order,
+        'row_count': row_count,
+        'filters': filters or [],
+        'last_value': None,
+        'last_ids': [],
+        'offset': 0,
+    }
+
+
+def _sort_value(record, field):
+    value = int(record['id']) if field == 'id' else time_value(record, field)
+    if value is None:
+        raise ValueError("Record {0} has no value for sort field '{1}'.".format(record.get('id'), field))
+    return value
+
+
+def _keyset_criteria(state):
+    """Build search_criteria continuing after the cursor position."""
+    criteria = [dict(c) for c in state['filters']]
+    if state['last_value'] is None:
+        return criteria
+
+    ascending = state['sort_order'] == 'asc'
+    if state['sort_field'] == 'id':
+        # ids are unique, so a strict bound never repeats a row
+        condition = 'greater than' if ascending else 'lesser than'
+    else:
+        # Several records may share a timestamp; rows already seen at the bound are filtered out locally
+        condition = 'greater or equal' if ascending else 'lesser or equal'
+    keyset = {'field': state['sort_field'], 'condition': condition, 'value': str(state['last_value'])}
+    if criteria:
+        keyset['logical_operator'] = 'AND'
+    return criteria + [keyset]
+
+
+def budgeted_read(client, endpoint, list_key, state, time_budget=None):
+    """Read a list endpoint with keyset pagination until it is exhausted or the time budget runs out.
+
+    Instead of start_index offsets, each page asks for records at or after the
+    last sort value seen, so a read can stop after any page and continue later
+    from its cursor without refetching or skipping rows. At least one page is
+    always fetched, so every call makes progress.
+
+    Args:
+        client: SDPClient instance.
+        endpoint: List endpoint path.
+        list_key: Key the rows are returned under.
+        state: Cursor state from new_cursor_state() or decode_cursor().
+        time_budget: Seconds after which no further page is requested. None reads to the end.
+
+    Returns:
+        A tuple (rows, state) where state is None once every row has been read.
+    """
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    state = dict(state)
+    state.setdefault('offset', 0)
+    field = state['sort_field']
+    rows = []
+
+    while True:
+        list_info = {
+            'row_count': state['row_count'],
+            'start_index': state['offset'] + 1,
+            'sort_field': field,
+            'sort_order': state['sort_order'],
+        }
+        criteria = _keyset_criteria(state)
+        if criteria:
+            list_info['search_criteria'] = criteria
+        response = client.request(endpoint=endpoint, method='GET', data={'list_info': list_info})
+
+        page = response.get(list_key) or []
+        has_more = bool(page) and response.get('list_info', {}).get('has_more_rows')
+
+        seen = set(state['last_ids'])
+        new_rows = [r for r in page if not (_sort_value(r, field) == state['last_value'] and r.get('id') in seen)]
+
+        moved = False
+        for row in new_rows:
+            value = _sort_value(row, field)
+            if value != state['last_value']:
+                state['last_value'] = value
+                state['last_ids'] = []
+                moved = True
+            state['last_ids'].append(row.get('id'))
+        rows.extend(new_rows)
+
+        if moved:
+            state['offset'] = 0
+        else:
+            # The whole page shares the bound value; page past it, also when resuming from the cursor
+            state['offset'] += len(page)
+
+        if not has_more:
+            return rows, None
+        if deadline is not None and time.monotonic() >= deadline:
+            return rows, state
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import atexit
+import math
+import os
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.cache import FileCache
+
+
+# Latency percentile after which a GET is hedged (unset or 0 disables hedging)
+ENV_HEDGE_PERCENTILE = 'SDP_CLOUD_HEDGE_PERCENTILE'
+
+# Maximum share of GETs, in percent, that may be hedged
+ENV_HEDGE_BUDGET = 'SDP_CLOUD_HEDGE_BUDGET'
+HEDGE_BUDGET = 5
+
+# Latency samples kept per portal, and needed before the percentile is trusted
+HEDGE_SAMPLES = 200
+HEDGE_MIN_SAMPLES = 20
+
+# Hedge delay in seconds while there are too few samples
+HEDGE_DEFAULT_DELAY = 1.0
+
+# Counters are halved beyond this many requests so the budget follows recent traffic
+HEDGE_WINDOW = 10000
+
+# New latency samples collected before they are merged into the shared statistics
+HEDGE_FLUSH_SAMPLES = 20
+
+
+def percentile(values, pct):
+    """Return the pct-th percentile (nearest rank) of a non-empty list."""
+    ordered = sorted(values)
+    rank = int(math.ceil(pct / 100.0 * len(ordered))) - 1
+    return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+
+class HedgePolicy:
+    """Decides when a GET is hedged, from latencies shared by all runs against a portal.
+
+    GET latencies and the number of requests and hedges are kept in the file
+    cache under key, so short module runs benefit from the history of earlier
+    ones. A hedge is only allowed while hedges stay below budget percent of
+    requests.
+
+    New samples and counts are merged into the cached statistics by flush(),
+    under a lock on the cache entry so that concurrent forks add to each
+    other's samples rather than overwrite them. flush() runs every
+    HEDGE_FLUSH_SAMPLES samples and when the process exits.
+    """
+
+    def __init__(self, key, pct, budget=HEDGE_BUDGET, cache=None):
+        self.key = key
+        self.pct = pct
+        self.budget = budget
+        self.cache = cache or FileCache()
+        self._lock = threading.Lock()
+        self._state = None
+        self._pending = {'samples': [], 'requests': 0, 'hedges': 0}
+        atexit.register(self.flush)
+
+    @classmethod
+    def from_env(cls, key):
+        """Return a policy configured by $SDP_CLOUD_HEDGE_PERCENTILE, or None when hedging is off."""
+        try:
+            pct = float(os.environ.get(ENV_HEDGE_PERCENTILE) or 0)
+            budget = float(os.environ.get(ENV_HEDGE_BUDGET) or HEDGE_BUDGET)
+        except ValueError:
+            return None
+        if not 0 < pct < 100:
+            return None
+        return cls(key, pct, budget)
+
+    def _load(self):
+        if self._state is None:
+            state = self.cache.get(self.key)
+            if not isinstance(state, dict):
+                state = {}
+            self._state = {
+                'samples': list(state.get('samples') or []),
+                'requests': state.get('requests', 0),
+                'hedges': state.get('hedges', 0),
+            }
+        return self._state
+
+    def delay(self):
+        """Return the seconds to wait for the first response before hedging."""
+        with self._lock:
+            samples = self._load()['samples']
+            if len(samples) < HEDGE_MIN_SAMPLES:
+                return HEDGE_DEFAULT_DELAY
+            return percentile(samples, self.pct)
+
+    def begin(self):
+        """Count a GET about to be sent."""
+        with self._lock:
+            state = self._load()
+            state['requests'] += 1
+            self._pending['requests'] += 1
+            _apply_window(state)
+
+    def try_hedge(self):
+        """Take a hedge from the budget; returns False when the budget is spent."""
+        with self._lock:
+            state = self._load()
+            if state['hedges'] + 1 > state['requests'] * self.budget / 100.0:
+                return False
+            state['hedges'] += 1
+            self._pending['hedges'] += 1
+            return True
+
+    def observe(self, latency):
+        """Record the latency of a completed GET; the statistics are persisted in batches."""
+        sample = round(latency, 4)
+        with self._lock:
+            state = self._load()
+            state['samples'] = (state['samples'] + [sample])[-HEDGE_SAMPLES:]
+            self._pending['samples'].append(sample)
+            due = len(self._pending['samples']) >= HEDGE_FLUSH_SAMPLES
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Merge the samples and counts collected since the last flush into the cached statistics."""
+        with self._lock:
+            pending = self._pending
+            if not (pending['samples'] or pending['requests'] or pending['hedges']):
+                return
+            self._pending = {'samples': [], 'requests': 0, 'hedges': 0}
+
+        with self.cache.locked(self.key):
+            stored = self.cache.get(self.key)
+            if not isinstance(stored, dict):
+                stored = {}
+            merged = {
+                'samples': (list(stored.get('samples') or []) + pending['samples'])[-HEDGE_SAMPLES:],
+                'requests': stored.get('requests', 0) + pending['requests'],
+                'hedges': stored.get('hedges', 0) + pending['hedges'],
+            }
+            _apply_window(merged)
+            self.cache.set(self.key, merged)
+
+        with self._lock:
+            # Later decisions also see what other forks recorded
+            pending = self._pending
+            self._state = {
+                'samples': (merged['samples'] + pending['samples'])[-HEDGE_SAMPLES:],
+                'requests': merged['requests'] + pending['requests'],
+                'hedges': merged['hedges'] + pending['hedges'],
+            }
+
+
+def _apply_window(state):
+    if state['requests'] > HEDGE_WINDOW:
+        state['requests'] //= 2
+        state['hedges'] //= 2
+
+
+def hedged_call(func, policy, discard=None):
+    """Call func(), and call it a second time if the first call is slower than policy.delay().
+
+    func must be safe to run twice at once and must not fail the module; it
+    returns an (ok, result) tuple. The first ok result wins; when both calls
+    fail, the first one's result (or exception) is returned. A SystemExit
+    (e.g. fail_json called inside func) is re-raised in the calling thread as
+    soon as it arrives. The losing call cannot be interrupted: it runs on in a
+    daemon thread, which does not delay the exit of the module, and its ok
+    result is passed to discard() (e.g. to close a response) instead of being
+    returned.
+    """
+    policy.begin()
+    started = time.monotonic()
+    results = queue.Queue()
+    lock = threading.Lock()
+    decided = []
+
+    def _discard(outcome):
+        if outcome[0] and discard is not None:
+            try:
+                discard(outcome[1])
+            except Exception:
+                pass
+
+    def _run(primary):
+        try:
+            outcome = func()
+        except BaseException as e:
+            # Always queue an outcome, or the caller would wait forever
+            outcome = (False, e)
+        if primary:
+            policy.observe(time.monotonic() - started)
+        with lock:
+            if not decided:
+                results.put(outcome)
+                return
+        _discard(outcome)
+
+    def _decide(outcome):
+        with lock:
+            decided.append(outcome)
+        # A loser that finished before the decision is still queued
+        while True:
+            try:
+                _discard(results.get_nowait())
+            except queue.Empty:
+                break
+        if isinstance(outcome[1], BaseException):
+            raise outcome[1]
+        return outcome[1]
+
+    def _start(primary):
+        thread = threading.Thread(target=_run, args=(primary,))
+        thread.daemon = True
+        thread.start()
+
+    _start(True)
+    calls = 1
+    try:
+        first = results.get(timeout=policy.delay())
+    except queue.Empty:
+        if policy.try_hedge():
+            _start(False)
+            calls = 2
+        first = results.get()
+
+    # SystemExit and the like are not retried errors: fail_json has already run
+    fatal = isinstance(first[1], BaseException) and not isinstance(first[1], Exception)
+    if not first[0] and calls == 2 and not fatal:
+        second = results.get()
+        if second[0]:
+            return _decide(second)
+    return _decide(first)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import threading
+import time
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.serializer import json_dumps, json_loads
+
+
+JOURNAL_VERSION = 1
+
+
+class CheckpointJournal:
+    """Append-only record of completed bulk write items, used to resume an interrupted run.
+
+    Each completed item is written as one JSON line holding its scope (the
+    endpoint it was written to), the caller-supplied item key and the id of
+    the resulting record. Lines are flushed and fsynced before record()
+    returns, so an item is journaled only once its write has succeeded and a
+    crash loses at most the line being written. A truncated or unreadable
+    line is ignored on load.
+
+    One file can hold several scopes; load() only returns entries of the
+    journal's own scope. record() is safe to call from worker threads.
+    """
+
+    def __init__(self, path, scope):
+        self.path = path
+        self.scope = scope
+        self._lock = threading.Lock()
+        self._file = None
+
+    def load(self):
+        """Return a dict of item key -> record id for every completed item in this scope."""
+        completed = {}
+        if not os.path.isfile(self.path):
+            return completed
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json_loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and entry.get('scope') == self.scope and entry.get('key') is not None:
+                    completed[entry['key']] = entry.get('id')
+        return completed
+
+    def record(self, key, record_id):
+        """Durably append a completed item."""
+        line = json_dumps({
+            'v': JOURNAL_VERSION,
+            'scope': self.scope,
+            'key': key,
+            'id': record_id,
+            'time': int(time.time()),
+        }, sort_keys=True) + '\n'
+
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, 'a')
+                self._terminate_partial_line()
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _terminate_partial_line(self):
+        """Start on a fresh line if a previous run died mid-write."""
+        if self._file.tell() == 0:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                self._file.write('\n')
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
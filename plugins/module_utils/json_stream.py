@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import codecs
+import json
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+
+# Bytes read from the response per chunk
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+
+class _Reader:
+    """A text buffer over a binary file, decoded incrementally as UTF-8."""
+
+    def __init__(self, fp, chunk_size):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def more(self):
+        """Append the next chunk to the buffer, dropping the consumed part; returns False at the end."""
+        if self.eof:
+            return False
+        chunk = self._fp.read(self._chunk_size)
+        self.buffer = self.buffer[self.pos:] + self._decoder.decode(chunk or b'', final=not chunk)
+        self.pos = 0
+        self.eof = not chunk
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character, or '' at the end."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.more():
+                return ''
+
+    def expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError("Expected one of {0!r} at character {1}, found {2!r}".format(chars, self.pos, char))
+        self.pos += 1
+        return char
+
+    def value(self, decoder):
+        """Decode the next complete JSON value, reading more input until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if not self.more():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof:
+                self.more()
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_stdlib(fp, key, meta, chunk_size):
+    reader = _Reader(fp, chunk_size)
+    decoder = json.JSONDecoder()
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        name = reader.value(decoder)
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value(decoder)
+                    if reader.expect(',]') == ']':
+                        break
+        else:
+            meta[name] = reader.value(decoder)
+        if reader.expect(',}') == '}':
+            return
+
+
+def _iter_ijson(fp, key, meta):
+    item_prefix = key + '.item'
+    builder = None
+    target = None
+    depth = 0
+    for prefix, event, value in ijson.parse(fp, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+            if depth == 0:
+                if target is None:
+                    yield builder.value
+                else:
+                    meta[target] = builder.value
+                builder = None
+            continue
+
+        if prefix == item_prefix:
+            target = None
+        elif '.' not in prefix and prefix not in ('', key):
+            target = prefix
+        else:
+            continue
+        if event in ('start_map', 'start_array'):
+            builder = ObjectBuilder()
+            builder.event(event, value)
+            depth = 1
+        elif target is None:
+            yield value
+        else:
+            meta[target] = value
+
+
+def iter_json_array(fp, key, meta=None, chunk_size=CHUNK_SIZE):
+    """Yield the elements of the array under top-level key of the JSON object read from fp.
+
+    Elements are decoded one at a time while the body is read in chunks, so
+    neither the whole body nor the whole array is held in memory. The other
+    top-level keys (e.g. list_info, response_status) are put into meta as
+    they are met; keys after the array are only there once every element was
+    consumed. ijson is used when installed, else the stdlib decoder.
+    """
+    if meta is None:
+        meta = {}
+    if HAS_IJSON:
+        return _iter_ijson(fp, key, meta)
+    return _iter_stdlib(fp, key, meta, chunk_size)
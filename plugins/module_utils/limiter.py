@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+# HTTP status codes telling the client to send less
+OVERLOAD_STATUS_CODES = (429, 503)
+
+# A response slower than this multiple of the fastest recent one is not counted as healthy
+LATENCY_TOLERANCE = 2.0
+
+
+class AIMDLimiter:
+    """Adapts the number of requests in flight to what the server sustains.
+
+    Additive increase, multiplicative decrease: every healthy response adds
+    1/limit to the limit (about +1 per round of requests), while an overload
+    signal (HTTP 429/503, Retry-After or an exhausted X-RateLimit-Remaining)
+    multiplies it by `decrease`. Overload signals from requests sent before the
+    last cut are ignored, so one burst of 429s only cuts the limit once.
+    Responses much slower than the fastest one seen neither raise nor cut it.
+    """
+
+    def __init__(self, initial, maximum=None, minimum=1, decrease=0.5):
+        self.minimum = max(1, minimum)
+        self.maximum = max(maximum or initial, self.minimum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.decrease = decrease
+        self.in_flight = 0
+        self.min_latency = None
+        self.decreases = 0
+        self._cut_at = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Wait for a free slot and return the time the request starts."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            return time.monotonic()
+
+    def release(self, started, status=None, headers=None):
+        """Free a slot and adapt the limit to the outcome of the request."""
+        now = time.monotonic()
+        latency = now - started
+        with self._cond:
+            self.in_flight -= 1
+            if is_overloaded(status, headers):
+                if started >= self._cut_at:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self._cut_at = now
+                    self.decreases += 1
+            elif status is not None and status < 400:
+                if self.min_latency is None or latency < self.min_latency:
+                    self.min_latency = latency
+                if latency <= self.min_latency * LATENCY_TOLERANCE + 0.05:
+                    self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot around one request; the caller reports the outcome with outcome(status, headers)."""
+        started = self.acquire()
+        result = {}
+
+        def outcome(status, headers=None):
+            result.update(status=status, headers=headers)
+
+        try:
+            yield outcome
+        finally:
+            self.release(started, result.get('status'), result.get('headers'))
+
+
+def is_overloaded(status, headers=None):
+    """Tell whether a response asks the client to slow down."""
+    if status in OVERLOAD_STATUS_CODES:
+        return True
+    headers = headers or {}
+    if headers.get('retry-after'):
+        return True
+    remaining = headers.get('x-ratelimit-remaining')
+    try:
+        return remaining is not None and int(remaining) <= 0
+    except ValueError:
+        return False
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import list_all_records
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.cache import FileCache, portal_cache_key
+
+
+LOOKUP_RESOLUTION_MODES = ['server', 'validate', 'id']
+
+# Default lifetime in seconds of a cached lookup catalogue
+LOOKUP_CACHE_TTL = 3600
+
+# Catalogues already loaded in this process
+# Key: cache key, Value: (values, fetched_in_this_process)
+LOOKUP_CATALOGUES = {}
+
+
+def fetch_lookup_values(client, endpoint, shared_ttl=None):
+    """List every value of a lookup endpoint as [{'id', 'name'}]."""
+    rows = list_all_records(client, endpoint, endpoint, shared_ttl=shared_ttl)
+    return [{'id': row.get('id'), 'name': row.get('name')} for row in rows if row.get('name') is not None]
+
+
+def get_lookup_values(module, client, endpoint, ttl=LOOKUP_CACHE_TTL, refresh=False):
+    """Return the values of a lookup endpoint from memory, the disk cache or the API.
+
+    Returns:
+        A tuple (values, fetched) where fetched tells whether the values were
+        fetched from the API by this process and so cannot be stale.
+    """
+    key = portal_cache_key(module, 'lookups', endpoint)
+    if not refresh and key in LOOKUP_CATALOGUES:
+        return LOOKUP_CATALOGUES[key]
+
+    cache = FileCache()
+    values = None if refresh else cache.get(key, ttl)
+    fetched = values is None
+    if fetched:
+        values = fetch_lookup_values(client, endpoint, shared_ttl=0 if refresh else ttl)
+        cache.set(key, values)
+
+    LOOKUP_CATALOGUES[key] = (values, fetched)
+    return values, fetched
+
+
+def _find(values, value):
+    """Find the lookup values matching a name (exact, then case-insensitive) or an id.
+
+    Returns:
+        The list of matching entries of the first rule that matches, empty if
+        none does. Catalogues may hold several entries with the same name, e.g.
+        groups of the same name on different sites.
+    """
+    text = str(value)
+    for matches in (
+        lambda entry: entry['name'] == text,
+        lambda entry: entry['name'].lower() == text.lower(),
+        lambda entry: str(entry.get('id')) == text,
+    ):
+        found = [entry for entry in values if matches(entry)]
+        if found:
+            return found
+    return []
+
+
+def resolve_lookup(module, client, module_config, field_name, value, mode, ttl=LOOKUP_CACHE_TTL):
+    """Validate a lookup value against the cached catalogue and return its API form.
+
+    Fields without a catalogue endpoint in module_config['lookup_endpoints'] are
+    left to the server ({'name': value}). A name missing from a cached
+    catalogue triggers one refresh before the value is rejected, so values added
+    on the portal since the cache was written are still accepted.
+
+    In 'id' mode a name shared by several catalogue entries is rejected with
+    their ids, since sending either id could pick the wrong one.
+
+    Returns:
+        {'id': ...} when mode is 'id', else {'name': ...} with the portal's spelling.
+    """
+    endpoint = module_config.get('lookup_endpoints', {}).get(field_name)
+    if mode == 'server' or not endpoint or isinstance(value, dict):
+        return value if isinstance(value, dict) else {'name': value}
+
+    values, fetched = get_lookup_values(module, client, endpoint, ttl)
+    matches = _find(values, value)
+    if not matches and not fetched:
+        values, fetched = get_lookup_values(module, client, endpoint, ttl, refresh=True)
+        matches = _find(values, value)
+
+    if not matches:
+        names = [entry['name'] for entry in values]
+        import difflib
+        suggestions = difflib.get_close_matches(str(value), names, n=3)
+        msg = "Invalid value '{0}' for lookup field '{1}'.".format(value, field_name)
+        if suggestions:
+            msg += " Did you mean: {0}?".format(', '.join(suggestions))
+        module.fail_json(msg=msg, allowed_values=names)
+
+    match = matches[0]
+    if mode == 'id':
+        if len(matches) > 1:
+            module.fail_json(
+                msg="Lookup field '{0}' has {1} values named '{2}'; give the id of the one to use.".format(
+                    field_name, len(matches), match['name']),
+                candidate_ids=[entry['id'] for entry in matches])
+        return {'id': match['id']}
+    return {'name': match['name']}
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import sqlite3
+import time
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import iter_all_records
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.export_util import updated_time
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.serializer import json_dumps, json_loads
+
+
+# Fields always indexed in the mirror, in addition to id and the update time
+DEFAULT_INDEX_FIELDS = ['status']
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS records (
+        scope TEXT NOT NULL,
+        id TEXT NOT NULL,
+        last_updated_time INTEGER,
+        data TEXT NOT NULL,
+        PRIMARY KEY (scope, id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS records_updated ON records (scope, last_updated_time)",
+    """CREATE TABLE IF NOT EXISTS record_fields (
+        scope TEXT NOT NULL,
+        id TEXT NOT NULL,
+        field TEXT NOT NULL,
+        value TEXT,
+        PRIMARY KEY (scope, id, field)
+    )""",
+    "CREATE INDEX IF NOT EXISTS record_fields_value ON record_fields (scope, field, value)",
+    """CREATE TABLE IF NOT EXISTS sync_state (
+        scope TEXT PRIMARY KEY,
+        synced_at REAL NOT NULL,
+        high_water INTEGER,
+        index_fields TEXT NOT NULL
+    )""",
+]
+
+
+def mirror_scope(domain, portal_name, parent_module):
+    """Return the key a module's records are stored under, so one file can mirror several portals."""
+    return '{0}/{1}/{2}'.format(domain, portal_name, parent_module)
+
+
+def field_value(value):
+    """Normalize a field value for indexing and filtering.
+
+    Lookups, users and datetimes are dicts in API records; users are reduced to
+    their email, the others to their name, value or id. Scalars are compared as
+    strings.
+    """
+    if isinstance(value, dict):
+        # Users carry a name too, but are matched on their email address
+        for k in ('email_id', 'name', 'value', 'id'):
+            if value.get(k) is not None:
+                return str(value[k])
+        return None
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _matches(record, filters):
+    for field, wanted in filters.items():
+        wanted = wanted if isinstance(wanted, list) else [wanted]
+        if field_value(record.get(field)) not in [field_value(w) for w in wanted]:
+            return False
+    return True
+
+
+class RecordMirror:
+    """A local SQLite copy of SDP list results, refreshed incrementally.
+
+    Records are stored as JSON per scope (portal and module, see mirror_scope)
+    and indexed on id, update time and a configurable set of fields, so
+    filtered reads are local queries. sync() fetches only records created or
+    updated since the newest update time already mirrored; records deleted on
+    the portal are only removed by a full sync.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def state(self, scope):
+        """Return the sync state of a scope (synced_at, high_water, index_fields), or None if never synced."""
+        row = self._conn.execute(
+            'SELECT synced_at, high_water, index_fields FROM sync_state WHERE scope = ?', (scope,)).fetchone()
+        if row is None:
+            return None
+        return {'synced_at': row[0], 'high_water': row[1], 'index_fields': json_loads(row[2])}
+
+    def age(self, scope):
+        """Return the seconds since the scope was last synced, or None if never synced."""
+        state = self.state(scope)
+        return None if state is None else time.time() - state['synced_at']
+
+    def sync(self, client, endpoint, list_key, scope, full=False, index_fields=None):
+        """Bring a scope up to date with the portal.
+
+        An incremental sync lists only records whose last_updated_time or
+        created_time is at or after the mirror's high-water mark; the overlap
+        at the mark is harmless as records are upserted. A full sync (or the
+        first sync of a scope) replaces every mirrored record. index_fields
+        extends the fields indexed for the scope.
+
+        Returns:
+            A dict with the number of records fetched, whether the sync was full and the sync time.
+        """
+        state = self.state(scope)
+        full = full or state is None
+        fields = list(DEFAULT_INDEX_FIELDS)
+        for field in (state or {}).get('index_fields', []) + (index_fields or []):
+            if field not in fields:
+                fields.append(field)
+        reindex = state is not None and fields != state['index_fields']
+
+        list_info = {'sort_field': 'id', 'sort_order': 'asc'}
+        if not full and state['high_water'] is not None:
+            mark = str(state['high_water'])
+            list_info['search_criteria'] = [
+                {'field': 'last_updated_time', 'condition': 'greater or equal', 'value': mark},
+                {'field': 'created_time', 'condition': 'greater or equal', 'value': mark, 'logical_operator': 'OR'},
+            ]
+
+        # Taken before fetching, so changes made during the sync are picked up by the next one
+        synced_at = time.time()
+
+        high_water = None if full else state['high_water']
+        fetched = 0
+        # Rows are streamed into the transaction as they are parsed; a failed fetch rolls it back
+        with self._conn:
+            if full:
+                self._conn.execute('DELETE FROM records WHERE scope = ?', (scope,))
+                self._conn.execute('DELETE FROM record_fields WHERE scope = ?', (scope,))
+            for record in iter_all_records(client, endpoint, list_key, list_info=list_info):
+                fetched += 1
+                updated = updated_time(record)
+                if updated is not None and (high_water is None or updated > high_water):
+                    high_water = updated
+                self._upsert(scope, record, updated, fields)
+            if reindex and not full:
+                self._reindex(scope, fields)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sync_state (scope, synced_at, high_water, index_fields) VALUES (?, ?, ?, ?)',
+                (scope, synced_at, high_water, json_dumps(fields)))
+
+        return {'fetched': fetched, 'full': full, 'synced_at': synced_at}
+
+    def _upsert(self, scope, record, updated, fields):
+        record_id = str(record.get('id'))
+        self._conn.execute(
+            'INSERT OR REPLACE INTO records (scope, id, last_updated_time, data) VALUES (?, ?, ?, ?)',
+            (scope, record_id, updated, json_dumps(record)))
+        self._conn.execute('DELETE FROM record_fields WHERE scope = ? AND id = ?', (scope, record_id))
+        self._conn.executemany(
+            'INSERT INTO record_fields (scope, id, field, value) VALUES (?, ?, ?, ?)',
+            [(scope, record_id, field, field_value(record.get(field))) for field in fields])
+
+    def _reindex(self, scope, fields):
+        for record_id, data in self._conn.execute('SELECT id, data FROM records WHERE scope = ?', (scope,)).fetchall():
+            record = json_loads(data)
+            self._conn.execute('DELETE FROM record_fields WHERE scope = ? AND id = ?', (scope, record_id))
+            self._conn.executemany(
+                'INSERT INTO record_fields (scope, id, field, value) VALUES (?, ?, ?, ?)',
+                [(scope, record_id, field, field_value(record.get(field))) for field in fields])
+
+    def count(self, scope):
+        """Return the number of mirrored records in a scope."""
+        return self._conn.execute('SELECT COUNT(*) FROM records WHERE scope = ?', (scope,)).fetchone()[0]
+
+    def get(self, scope, record_id):
+        """Return one mirrored record, or None if it is not in the mirror."""
+        row = self._conn.execute(
+            'SELECT data FROM records WHERE scope = ? AND id = ?', (scope, str(record_id))).fetchone()
+        return json_loads(row[0]) if row else None
+
+    def query(self, scope, filters=None):
+        """Return the mirrored records matching filters, ordered by id.
+
+        filters maps field names to a value or a list of accepted values,
+        compared after field_value() normalization. Filters on indexed fields
+        are answered by the index; the rest are applied to the loaded records.
+        """
+        filters = filters or {}
+        state = self.state(scope) or {'index_fields': []}
+        sql = 'SELECT r.data FROM records r'
+        params = []
+        remaining = {}
+        for position, (field, wanted) in enumerate(sorted(filters.items())):
+            if field not in state['index_fields']:
+                remaining[field] = wanted
+                continue
+            values = [field_value(w) for w in (wanted if isinstance(wanted, list) else [wanted])]
+            if not values:
+                return []
+            alias = 'f{0}'.format(position)
+            sql += ' JOIN record_fields {0} ON {0}.scope = r.scope AND {0}.id = r.id AND {0}.field = ? AND {0}.value IN ({1})'.format(
+                alias, ', '.join('?' * len(values)))
+            params.extend([field] + values)
+        sql += ' WHERE r.scope = ? ORDER BY CAST(r.id AS INTEGER), r.id'
+        params.append(scope)
+
+        records = [json_loads(row[0]) for row in self._conn.execute(sql, params)]
+        if remaining:
+            records = [record for record in records if _matches(record, remaining)]
+        return records
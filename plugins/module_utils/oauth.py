@@ -5,10 +5,11 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-import json
 from ansible.module_utils.urls import fetch_url
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import DC_MAP
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.error_handler import handle_error
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.serializer import json_loads
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.tracing import trace_span, SPAN_KIND_CLIENT
 
 
 try:
@@ -18,10 +19,11 @@ except ImportError:
     urllib_parse = urllib
 
 
-def get_access_token(module, client_id, client_secret, refresh_token, dc):
+def get_access_token(module, client_id, client_secret, refresh_token, dc, timeout=10):
     """
     Generate Access Token using Refresh Token.
     Returns the full JSON response from the token endpoint.
+    timeout is the timeout in seconds of the token request.
     """
     accounts_url = DC_MAP.get(dc)
     if not accounts_url:
@@ -37,19 +39,24 @@ def get_access_token(module, client_id, client_secret, refresh_token, dc):
     }
     payload = urllib_parse.urlencode(payload_data)
 
-    response, info = fetch_url(
-        module,
-        token_url,
-        data=payload,
-        method='POST',
-        headers={'Content-Type': 'application/x-www-form-urlencoded'}
-    )
+    with trace_span('POST oauth/v2/token', SPAN_KIND_CLIENT, **{'http.request.method': 'POST', 'url.full': token_url}) as span:
+        response, info = fetch_url(
+            module,
+            token_url,
+            data=payload,
+            method='POST',
+            headers={'Content-Type': 'application/x-www-form-urlencoded'},
+            timeout=timeout
+        )
+        span.set(**{'http.response.status_code': info.get('status', -1)})
+        if not response:
+            span.fail(info.get('msg') or 'HTTP {0}'.format(info.get('status', -1)))
 
     if not response:
         handle_error(module, info, "Failed to generate Access Token")
 
     try:
-        data = json.loads(response.read())
+        data = json_loads(response.read())
         if 'access_token' in data:
             return data
         if 'error' in data:
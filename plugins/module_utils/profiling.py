@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+
+
+# 'result' to return a profile summary in the module result, or a directory to
+# also write the profile and memory snapshot to (unset disables profiling)
+ENV_PROFILE = 'SDP_CLOUD_PROFILE'
+
+# Number of functions and allocation sites listed in the summary
+ENV_PROFILE_TOP = 'SDP_CLOUD_PROFILE_TOP'
+PROFILE_TOP = 20
+
+# Stack frames kept per allocation in the memory snapshot
+TRACEMALLOC_FRAMES = 10
+
+
+def profile_target():
+    """Return 'result', a directory, or None when $SDP_CLOUD_PROFILE disables profiling."""
+    value = (os.environ.get(ENV_PROFILE) or '').strip()
+    if not value or value.lower() in ('0', 'false', 'no', 'off'):
+        return None
+    if value.lower() in ('1', 'true', 'yes', 'on', 'result'):
+        return 'result'
+    return value
+
+
+def _location(filename, lineno, name=None):
+    location = '{0}:{1}'.format(filename, lineno)
+    return '{0}({1})'.format(location, name) if name else location
+
+
+class ModuleProfiler:
+    """Profiles a module run with cProfile and tracemalloc.
+
+    Only the main thread is profiled by cProfile; memory allocated by every
+    thread is traced. The profilers are imported here rather than with the
+    module so that runs without profiling do not pay for them.
+    """
+
+    def __init__(self, name, target, top=PROFILE_TOP):
+        import cProfile
+
+        self.name = name
+        self.target = target
+        self.top = top
+        self.profiler = cProfile.Profile()
+        self.snapshot = None
+        self.started = None
+        self.elapsed = None
+        self.peak_memory = None
+        self.files = None
+
+    def start(self):
+        import tracemalloc
+
+        self.started = time.monotonic()
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.profiler.enable()
+
+    def stop(self):
+        """Stop profiling; later calls do nothing."""
+        import tracemalloc
+
+        if self.elapsed is not None:
+            return
+        self.profiler.disable()
+        self.elapsed = time.monotonic() - self.started
+        self.peak_memory = tracemalloc.get_traced_memory()[1]
+        self.snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ])
+        tracemalloc.stop()
+
+    def summary(self):
+        """Return the top functions by cumulative time and the top allocation sites."""
+        import pstats
+
+        stats = pstats.Stats(self.profiler).stats
+        functions = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top]
+        allocations = self.snapshot.statistics('lineno')[:self.top]
+        return {
+            'elapsed': round(self.elapsed, 4),
+            'functions': [{
+                'function': _location(*key),
+                'calls': calls,
+                'tottime': round(tottime, 6),
+                'cumtime': round(cumtime, 6),
+            } for key, (dummy, calls, tottime, cumtime, dummy_callers) in functions],
+            'memory': {
+                'peak': self.peak_memory,
+                'allocated': sum(stat.size for stat in self.snapshot.statistics('filename')),
+                'top': [{
+                    'location': _location(stat.traceback[0].filename, stat.traceback[0].lineno),
+                    'size': stat.size,
+                    'count': stat.count,
+                } for stat in allocations],
+            },
+        }
+
+    def write(self, directory):
+        """Write <name>-<time>-<pid>.prof (pstats) and .tracemalloc (tracemalloc.Snapshot.load) to directory."""
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, '{0}-{1}-{2}'.format(self.name, time.strftime('%Y%m%dT%H%M%S'), os.getpid()))
+        self.profiler.dump_stats(base + '.prof')
+        self.snapshot.dump(base + '.tracemalloc')
+        self.files = [base + '.prof', base + '.tracemalloc']
+        return self.files
+
+    def report(self):
+        """Stop profiling and return the summary, with the written files unless target is 'result'."""
+        self.stop()
+        report = self.summary()
+        if self.target != 'result':
+            try:
+                report['files'] = self.write(self.target)
+            except (OSError, IOError) as e:
+                report['error'] = "Failed to write profile to {0}: {1}".format(self.target, e)
+        return report
+
+
+def run_profiled(run_module, name, module_class=AnsibleModule):
+    """Call run_module(), profiled when $SDP_CLOUD_PROFILE is set.
+
+    While profiling, exit_json and fail_json of module_class add the report
+    under the 'profile' key of the result. Without $SDP_CLOUD_PROFILE this is
+    a plain call to run_module().
+    """
+    target = profile_target()
+    if target is None:
+        return run_module()
+
+    try:
+        top = int(os.environ.get(ENV_PROFILE_TOP) or PROFILE_TOP)
+    except ValueError:
+        top = PROFILE_TOP
+    profiler = ModuleProfiler(name, target, top)
+    originals = {}
+
+    def _hook(method):
+        original = originals[method] = getattr(module_class, method)
+
+        def _exit(self, *args, **kwargs):
+            kwargs['profile'] = profiler.report()
+            return original(self, *args, **kwargs)
+        setattr(module_class, method, _exit)
+
+    _hook('exit_json')
+    _hook('fail_json')
+    profiler.start()
+    try:
+        return run_module()
+    finally:
+        profiler.stop()
+        for method, original in originals.items():
+            setattr(module_class, method, original)
+        # A run ending without exit_json or fail_json (e.g. a traceback) still leaves its profile
+        if profiler.target != 'result' and profiler.files is None:
+            try:
+                profiler.write(profiler.target)
+            except (OSError, IOError):
+                pass
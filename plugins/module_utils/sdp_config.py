@@ -18,9 +18,24 @@ DC_MAP = {
 
 DC_CHOICES = list(DC_MAP.keys())
 
+# 'lookup_endpoints' maps lookup fields to the list endpoint of their allowed values.
+# User fields with 'role': 'technician' only accept technicians.
 MODULE_CONFIG = {
     'request': {
         'endpoint': 'requests',
+        'sub_resources': ['notes', 'tasks', 'worklogs', 'approval_levels'],
+        'lookup_endpoints': {
+            'priority': 'priorities',
+            'urgency': 'urgencies',
+            'impact': 'impacts',
+            'category': 'categories',
+            'site': 'sites',
+            'group': 'groups',
+            'status': 'statuses',
+            'level': 'levels',
+            'mode': 'modes',
+            'template': 'request_templates'
+        },
         'sortable_fields': [
             'created_time', 'due_by_time', 'first_response_due_by_time', 'last_updated_time',
             'scheduled_start_time', 'scheduled_end_time', 'subject', 'id', 'priority', 'status'
@@ -44,7 +59,7 @@ MODULE_CONFIG = {
             'subcategory': {'type': 'lookup'},
             'item': {'type': 'lookup'},
             'requester': {'type': 'user'},
-            'technician': {'type': 'user'},
+            'technician': {'type': 'user', 'role': 'technician'},
             'on_behalf_of': {'type': 'user'},
             'editor': {'type': 'user'},
             'due_by_time': {'type': 'datetime'},
@@ -55,6 +70,16 @@ MODULE_CONFIG = {
     },
     'problem': {
         'endpoint': 'problems',
+        'sub_resources': ['notes', 'tasks', 'worklogs'],
+        'lookup_endpoints': {
+            'priority': 'priorities',
+            'urgency': 'urgencies',
+            'impact': 'impacts',
+            'category': 'categories',
+            'site': 'sites',
+            'group': 'groups',
+            'template': 'problem_templates'
+        },
         'sortable_fields': [
             'reported_time', 'due_by_time', 'closed_time', 'created_time', 'id', 'title', 'priority', 'status'
         ],
@@ -66,7 +91,7 @@ MODULE_CONFIG = {
             'due_by_time': {'type': 'datetime'},
             'closed_time': {'type': 'datetime'},
             'reported_by': {'type': 'user'},
-            'technician': {'type': 'user'},
+            'technician': {'type': 'user', 'role': 'technician'},
             'requester': {'type': 'user'},
             'category': {'type': 'lookup'},
             'impact': {'type': 'lookup'},
@@ -91,6 +116,18 @@ MODULE_CONFIG = {
     },
     'change': {
         'endpoint': 'changes',
+        'sub_resources': ['notes', 'tasks', 'worklogs', 'approval_levels', 'initiated_requests'],
+        'lookup_endpoints': {
+            'priority': 'priorities',
+            'urgency': 'urgencies',
+            'impact': 'impacts',
+            'category': 'categories',
+            'site': 'sites',
+            'group': 'groups',
+            'risk': 'risks',
+            'change_type': 'change_types',
+            'template': 'change_templates'
+        },
         'sortable_fields': [
             'created_time', 'completed_time', 'scheduled_start_time',
             'scheduled_end_time', 'id', 'title', 'priority', 'status', 'stage'
@@ -108,8 +145,8 @@ MODULE_CONFIG = {
             'status': {'type': 'lookup'},
             'template': {'type': 'lookup'},
             'change_requester': {'type': 'user'},
-            'change_manager': {'type': 'user'},
-            'change_owner': {'type': 'user'},
+            'change_manager': {'type': 'user', 'role': 'technician'},
+            'change_owner': {'type': 'user', 'role': 'technician'},
             'reason_for_change': {'type': 'lookup'},
             'risk': {'type': 'lookup'},
             'impact': {'type': 'lookup'},
@@ -130,6 +167,18 @@ MODULE_CONFIG = {
     },
     'release': {
         'endpoint': 'releases',
+        'sub_resources': ['notes', 'tasks', 'worklogs'],
+        'lookup_endpoints': {
+            'priority': 'priorities',
+            'urgency': 'urgencies',
+            'impact': 'impacts',
+            'category': 'categories',
+            'site': 'sites',
+            'group': 'groups',
+            'risk': 'risks',
+            'release_type': 'release_types',
+            'template': 'release_templates'
+        },
         'sortable_fields': [
             'created_time', 'completed_time', 'scheduled_start_time',
             'scheduled_end_time', 'id', 'title', 'priority', 'status', 'stage'
@@ -147,8 +196,8 @@ MODULE_CONFIG = {
             'status': {'type': 'lookup'},
             'workflow': {'type': 'lookup'},
             'release_requester': {'type': 'user'},
-            'release_engineer': {'type': 'user'},
-            'release_manager': {'type': 'user'},
+            'release_engineer': {'type': 'user', 'role': 'technician'},
+            'release_manager': {'type': 'user', 'role': 'technician'},
             'reason_for_release': {'type': 'lookup'},
             'impact': {'type': 'lookup'},
             'priority': {'type': 'lookup'},
@@ -167,3 +216,53 @@ MODULE_CONFIG = {
         }
     }
 }
+
+# Child resources that can be written under a parent record, e.g. requests/{id}/notes.
+# 'root_key' is the key the API wraps a single child record in.
+CHILD_MODULE_CONFIG = {
+    'notes': {
+        'endpoint': 'notes',
+        'root_key': 'note',
+        'supports_udf': False,
+        'supported_system_field_meta': {
+            'description': {'type': 'string'},
+            'show_to_requester': {'type': 'bool'},
+            'notify_technician': {'type': 'bool'},
+            'mark_first_response': {'type': 'bool'},
+            'add_to_linked_requests': {'type': 'bool'}
+        }
+    },
+    'worklogs': {
+        'endpoint': 'worklogs',
+        'root_key': 'worklog',
+        'supports_udf': False,
+        'supported_system_field_meta': {
+            'description': {'type': 'string'},
+            'owner': {'type': 'user', 'role': 'technician'},
+            'start_time': {'type': 'datetime'},
+            'end_time': {'type': 'datetime'},
+            'worklog_type': {'type': 'lookup'},
+            'include_nonoperational_hours': {'type': 'bool'},
+            'other_charge': {'type': 'num'},
+            'tech_charge': {'type': 'num'}
+        }
+    },
+    'tasks': {
+        'endpoint': 'tasks',
+        'root_key': 'task',
+        'supports_udf': False,
+        'supported_system_field_meta': {
+            'title': {'type': 'string'},
+            'description': {'type': 'string'},
+            'status': {'type': 'lookup'},
+            'priority': {'type': 'lookup'},
+            'task_type': {'type': 'lookup'},
+            'group': {'type': 'lookup'},
+            'owner': {'type': 'user', 'role': 'technician'},
+            'scheduled_start_time': {'type': 'datetime'},
+            'scheduled_end_time': {'type': 'datetime'},
+            'percentage_completion': {'type': 'num'},
+            'additional_cost': {'type': 'num'}
+        }
+    }
+}
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import math
+import os
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ujson
+    HAS_UJSON = True
+except ImportError:
+    HAS_UJSON = False
+
+
+# Environment variable forcing a backend: 'orjson', 'ujson' or 'json'
+ENV_JSON_BACKEND = 'SDP_CLOUD_JSON_BACKEND'
+
+BACKENDS = ['orjson', 'ujson', 'json']
+
+
+def available_backends():
+    """Return the installed backends, fastest first."""
+    installed = {'orjson': HAS_ORJSON, 'ujson': HAS_UJSON, 'json': True}
+    return [name for name in BACKENDS if installed[name]]
+
+
+def select_backend(name=None):
+    """Return the backend to use: name or $SDP_CLOUD_JSON_BACKEND if installed, else the fastest installed one."""
+    name = name or os.environ.get(ENV_JSON_BACKEND)
+    available = available_backends()
+    return name if name in available else available[0]
+
+
+def _json_dumps(obj, sort_keys):
+    return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':'), ensure_ascii=False)
+
+
+def _portable_floats(obj):
+    """Return False if obj holds a float the fast backends write differently from json.
+
+    They drop the exponent sign and padding (1e16, 1e-7 for 1e+16, 1e-07) and
+    write NaN and infinities as null; other floats come out the same.
+    """
+    if isinstance(obj, float):
+        return math.isfinite(obj) and 'e' not in repr(obj)
+    if isinstance(obj, dict):
+        return all(_portable_floats(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return all(_portable_floats(value) for value in obj)
+    return True
+
+
+def _orjson_dumps(obj, sort_keys):
+    if not _portable_floats(obj):
+        return _json_dumps(obj, sort_keys)
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode('utf-8')
+    except TypeError:
+        # Values orjson rejects (e.g. integers over 64 bits, non-string keys)
+        return _json_dumps(obj, sort_keys)
+
+
+def _ujson_dumps(obj, sort_keys):
+    if not _portable_floats(obj):
+        return _json_dumps(obj, sort_keys)
+    try:
+        return ujson.dumps(obj, sort_keys=sort_keys, ensure_ascii=False, escape_forward_slashes=False)
+    except (TypeError, OverflowError):
+        return _json_dumps(obj, sort_keys)
+
+
+def _json_loads(data):
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+class Serializer:
+    """JSON encoding and decoding through the fastest installed backend.
+
+    Every backend produces the same text: compact separators, keys in
+    insertion order unless sort_keys, and non-ASCII characters kept as UTF-8.
+    Values a fast backend cannot encode, or would write differently (floats in
+    exponent notation, NaN, infinities), fall back to the json module.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = select_backend(backend)
+        self._dumps = {'orjson': _orjson_dumps, 'ujson': _ujson_dumps, 'json': _json_dumps}[self.backend]
+        self._loads = {
+            'orjson': getattr(orjson, 'loads', None) if HAS_ORJSON else None,
+            'ujson': getattr(ujson, 'loads', None) if HAS_UJSON else None,
+            'json': _json_loads,
+        }[self.backend]
+
+    def dumps(self, obj, sort_keys=False):
+        """Encode obj as a JSON str."""
+        return self._dumps(obj, sort_keys)
+
+    def loads(self, data):
+        """Decode JSON from str or UTF-8 bytes. Raises ValueError on invalid JSON."""
+        return self._loads(data)
+
+
+# The serializer used throughout the collection
+SERIALIZER = Serializer()
+
+
+def json_dumps(obj, sort_keys=False):
+    return SERIALIZER.dumps(obj, sort_keys)
+
+
+def json_loads(data):
+    return SERIALIZER.loads(data)
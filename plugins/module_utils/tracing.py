@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import binascii
+import fcntl
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.serializer import json_dumps
+
+
+# Where spans are exported: a file path (OTLP JSON, one export request per line)
+# or an http(s) URL of an OTLP/HTTP collector (e.g. http://localhost:4318/v1/traces)
+ENV_TRACE = 'SDP_CLOUD_TRACE'
+
+# W3C traceparent ('00-<trace id>-<span id>-<flags>') or bare trace id joining runs into one trace
+ENV_TRACEPARENT = 'SDP_CLOUD_TRACEPARENT'
+ENV_TRACEPARENT_STANDARD = 'TRACEPARENT'
+
+# Seconds to wait for a collector endpoint
+EXPORT_TIMEOUT = 5
+
+SERVICE_NAME = 'manageengine.sdp_cloud'
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_TRACEPARENT = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+_TRACE_ID = re.compile(r'^[0-9a-f]{32}$')
+
+# The tracer of the running module, set by run_traced
+TRACER = None
+
+
+def trace_target():
+    """Return the file path or URL of $SDP_CLOUD_TRACE, or None when tracing is off."""
+    value = (os.environ.get(ENV_TRACE) or '').strip()
+    if not value or value.lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return value
+
+
+def parse_traceparent(value):
+    """Return (trace_id, parent_span_id) from a traceparent or bare trace id; parent_span_id may be None.
+
+    Returns None for missing or invalid values, including all-zero ids.
+    """
+    value = (value or '').strip().lower()
+    match = _TRACEPARENT.match(value)
+    if match:
+        trace_id, span_id = match.groups()
+    elif _TRACE_ID.match(value):
+        trace_id, span_id = value, None
+    else:
+        return None
+    if not trace_id.strip('0') or (span_id is not None and not span_id.strip('0')):
+        return None
+    return trace_id, span_id
+
+
+def _random_id(size):
+    return binascii.hexlify(os.urandom(size)).decode('ascii')
+
+
+def _now():
+    return int(time.time() * 1e9)
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes):
+    return [{'key': key, 'value': _otlp_value(value)} for key, value in sorted(attributes.items()) if value is not None]
+
+
+class Span:
+    """A timed operation of a trace. Finished spans are handed to the tracer for export."""
+
+    def __init__(self, tracer, name, kind, parent_id, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.trace_id = tracer.trace_id
+        self.span_id = _random_id(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.start = _now()
+        self.end = None
+        self.status = None
+
+    def set(self, **attributes):
+        """Set attributes; dotted OpenTelemetry names can be passed with set(**{'http.method': 'GET'})."""
+        self.attributes.update(attributes)
+
+    def fail(self, message):
+        self.status = {'code': STATUS_ERROR, 'message': str(message)}
+
+    def traceparent(self):
+        return '00-{0}-{1}-01'.format(self.trace_id, self.span_id)
+
+    def finish(self):
+        if self.end is None:
+            self.end = _now()
+            self.tracer.finished(self)
+
+    def as_otlp(self):
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start),
+            'endTimeUnixNano': str(self.end),
+            'attributes': _otlp_attributes(self.attributes),
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        if self.status:
+            span['status'] = self.status
+        return span
+
+
+class _NoopSpan:
+    """Stands in for a span when tracing is off."""
+
+    def set(self, **attributes):
+        pass
+
+    def fail(self, message):
+        pass
+
+    def traceparent(self):
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Collects the spans of one module run and exports them when it ends.
+
+    Spans opened with span() nest per thread; a thread without an open span
+    (e.g. a worker of SDPClient.map_concurrent) parents its spans to the root
+    span of the run.
+    """
+
+    def __init__(self, target, traceparent=None):
+        parsed = parse_traceparent(traceparent)
+        self.target = target
+        self.trace_id = parsed[0] if parsed else _random_id(16)
+        self.parent_id = parsed[1] if parsed else None
+        self.root = None
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def current(self):
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else self.root
+
+    def start_root(self, name, **attributes):
+        self.root = Span(self, name, SPAN_KIND_INTERNAL, self.parent_id, attributes)
+        return self.root
+
+    @contextmanager
+    def span(self, name, kind=SPAN_KIND_INTERNAL, **attributes):
+        parent = self.current()
+        span = Span(self, name, kind, parent.span_id if parent else self.parent_id, attributes)
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(span)
+        try:
+            yield span
+        except Exception as e:
+            span.fail(e)
+            raise
+        finally:
+            stack.pop()
+            span.finish()
+
+    def close(self, message=None):
+        """Finish the spans open in this thread, failed with message if given, and the root span.
+
+        exit_json and fail_json end the process from inside open spans, so
+        those are finished before the trace is exported.
+        """
+        for span in reversed(getattr(self._local, 'stack', None) or []):
+            if message is not None:
+                span.fail(message)
+            span.finish()
+        if self.root is not None:
+            self.root.finish()
+
+    def finished(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def export_request(self):
+        """Return the finished spans as an OTLP ExportTraceServiceRequest."""
+        with self._lock:
+            spans = [span.as_otlp() for span in self.spans]
+        return {'resourceSpans': [{
+            'resource': {'attributes': _otlp_attributes({'service.name': SERVICE_NAME})},
+            'scopeSpans': [{'scope': {'name': SERVICE_NAME}, 'spans': spans}],
+        }]}
+
+    def export(self):
+        """Write or send the finished spans. Failures are ignored: tracing never fails a task."""
+        if not self.spans:
+            return
+        data = json_dumps(self.export_request())
+        try:
+            if self.target.startswith(('http://', 'https://')):
+                from ansible.module_utils.urls import open_url
+                open_url(self.target, data=data, method='POST', headers={'Content-Type': 'application/json'},
+                         timeout=EXPORT_TIMEOUT).read()
+            else:
+                directory = os.path.dirname(os.path.abspath(self.target))
+                if not os.path.isdir(directory):
+                    os.makedirs(directory, exist_ok=True)
+                # Forks append to the same file; the lock keeps their lines whole
+                with open(self.target, 'a') as f:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                    f.write(data + '\n')
+        except Exception:
+            pass
+        with self._lock:
+            self.spans = []
+
+
+@contextmanager
+def trace_span(name, kind=SPAN_KIND_INTERNAL, **attributes):
+    """Open a span in the running module's trace; yields NOOP_SPAN when tracing is off."""
+    tracer = TRACER
+    if tracer is None:
+        yield NOOP_SPAN
+        return
+    with tracer.span(name, kind, **attributes) as span:
+        yield span
+
+
+def run_traced(run_module, name, module_class=AnsibleModule):
+    """Call run_module() inside a root span, when $SDP_CLOUD_TRACE is set.
+
+    While tracing, exit_json and fail_json of module_class finish the root
+    span, export the trace and add its ids under the 'trace' key of the
+    result. Without $SDP_CLOUD_TRACE this is a plain call to run_module().
+    """
+    global TRACER
+
+    target = trace_target()
+    if target is None:
+        return run_module()
+
+    tracer = Tracer(target, os.environ.get(ENV_TRACEPARENT) or os.environ.get(ENV_TRACEPARENT_STANDARD))
+    root = tracer.start_root(name, **{'ansible.module': '{0}.{1}'.format(SERVICE_NAME, name)})
+    originals = {}
+
+    def _hook(method, failed):
+        original = originals[method] = getattr(module_class, method)
+
+        def _exit(self, *args, **kwargs):
+            root.set(**{'ansible.changed': bool(kwargs.get('changed')), 'ansible.check_mode': bool(getattr(self, 'check_mode', False))})
+            message = None
+            if failed:
+                message = kwargs.get('msg', args[0] if args else '')
+                root.fail(message)
+            else:
+                root.status = {'code': STATUS_OK}
+            tracer.close(message)
+            tracer.export()
+            kwargs['trace'] = {'trace_id': tracer.trace_id, 'span_id': root.span_id, 'traceparent': root.traceparent()}
+            return original(self, *args, **kwargs)
+        setattr(module_class, method, _exit)
+
+    _hook('exit_json', False)
+    _hook('fail_json', True)
+    TRACER = tracer
+    try:
+        return run_module()
+    except Exception as e:
+        root.fail(e)
+        raise
+    finally:
+        TRACER = None
+        for method, original in originals.items():
+            setattr(module_class, method, original)
+        # A run ending without exit_json or fail_json still exports its spans
+        if root.end is None:
+            tracer.close()
+            tracer.export()
@@ -5,13 +5,27 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import threading
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.cache import FileCache, portal_cache_key
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.singleflight import SingleFlight
+
 
 # Allowed UDF Prefixes (must be lowercase)
 UDF_PREFIXES = ["udf_char", "udf_bool", "udf_long", "udf_double", "txt_", "num_", "date_", "dt_", "bool_", "dbl_"]
 
 # Cache for UDF metadata to avoid repeated calls within the same execution context
 # Key: module_name (e.g., 'request'), Value: { field_name: field_details }
+# Worker threads share it: access goes through UDF_METADATA_LOCK, and concurrent
+# misses for the same module share one fetch.
 UDF_METADATA_CACHE = {}
+# Modules whose cached UDF definitions were fetched from the API by this process, so cannot be stale
+UDF_METADATA_FETCHED = set()
+UDF_METADATA_LOCK = threading.Lock()
+UDF_METADATA_FLIGHTS = SingleFlight()
+
+# Lifetime in seconds of _metainfo responses cached on disk, shared across tasks and runs
+METAINFO_CACHE_TTL = 24 * 3600
 
 
 def is_udf_field(field_name):
@@ -23,30 +37,72 @@ def is_udf_field(field_name):
     return any(field_lower.startswith(prefix) for prefix in UDF_PREFIXES)
 
 
-def fetch_udf_metadata(module, client, module_name):
+def metainfo_endpoint(module_name):
+    """Return the _metainfo endpoint of a module (e.g. 'requests/_metainfo')."""
+    return '{0}/_metainfo'.format(MODULE_CONFIG[module_name]['endpoint'])
+
+
+def fetch_metainfo(module, client, module_name, ttl=METAINFO_CACHE_TTL, refresh=False):
+    """
+    Returns the 'metainfo' section of a module's _metainfo response.
+    Responses are cached on disk per portal for ttl seconds, so a warm-up task
+    (see the sdp_metadata module) removes the fetch from later tasks.
+
+    Returns:
+        A tuple (metainfo, fetched) where fetched tells whether the API was called.
+    """
+    cache = FileCache()
+    key = portal_cache_key(module, 'metainfo', module_name)
+
+    metainfo = None if refresh else cache.get(key, ttl)
+    if metainfo is not None:
+        return metainfo, False
+
+    # SDPClient handles auth token generation/reuse and base URL; forks share the response through the broker
+    response = client.request(metainfo_endpoint(module_name), method='GET', shared_ttl=0 if refresh else ttl)
+    metainfo = response.get('metainfo', {}) if isinstance(response, dict) else {}
+    cache.set(key, metainfo)
+    return metainfo, True
+
+
+def udf_definitions(metainfo):
+    """Return the UDF definitions of a metainfo section: { field_name: field_details }."""
+    # Structure: metainfo['fields']['udf_fields']['fields']
+    return metainfo.get('fields', {}).get('udf_fields', {}).get('fields', {}) or {}
+
+
+def fetch_udf_metadata(module, client, module_name, refresh=False):
     """
     Fetches the metadata for the given module to retrieve UDF definitions.
     Uses SDPClient for auth handling and caching to prevent redundant API calls.
+    refresh bypasses the in-memory and disk caches.
     """
-    if module_name in UDF_METADATA_CACHE:
-        return UDF_METADATA_CACHE[module_name]
+    with UDF_METADATA_LOCK:
+        if not refresh and module_name in UDF_METADATA_CACHE:
+            return UDF_METADATA_CACHE[module_name]
 
-    # Use construct_endpoint with '_metainfo' operation
-    from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import construct_endpoint
-    endpoint = construct_endpoint(module, operation='_metainfo')
+    return UDF_METADATA_FLIGHTS.do(
+        (module_name, refresh), lambda: _load_udf_metadata(module, client, module_name, refresh))
 
-    # SDPClient handles auth token generation/reuse and base URL
-    response = client.request(endpoint, method='GET')
 
-    # Parse response to get UDF fields
-    # Structure: response['metainfo']['fields']['udf_fields']['fields']
+def _load_udf_metadata(module, client, module_name, refresh=False):
     try:
-        udf_definitions = response.get('metainfo', {}).get('fields', {}).get('udf_fields', {}).get('fields', {})
-        UDF_METADATA_CACHE[module_name] = udf_definitions
-        return udf_definitions
+        metainfo, fetched = fetch_metainfo(module, client, module_name, refresh=refresh)
+        udf_defs = udf_definitions(metainfo)
     except Exception as e:
         module.warn("Failed to parse UDF metadata for module {0}: {1}".format(module_name, str(e)))
         return {}
+    store_udf_metadata(module_name, udf_defs)
+    if fetched:
+        with UDF_METADATA_LOCK:
+            UDF_METADATA_FETCHED.add(module_name)
+    return udf_defs
+
+
+def store_udf_metadata(module_name, udf_defs):
+    """Put a module's UDF definitions into UDF_METADATA_CACHE."""
+    with UDF_METADATA_LOCK:
+        UDF_METADATA_CACHE[module_name] = udf_defs
 
 
 def resolve_udf_type(udf_definition):
@@ -77,7 +133,9 @@ def resolve_udf_type(udf_definition):
 def get_udf_field_type(module, client, module_name, field_name):
     """
     Retrieves the type of a specific UDF field.
-    Fetches and caches metadata if not already present.
+    Fetches and caches metadata if not already present. A field missing from
+    cached metadata triggers one refresh before it is rejected, so UDFs added
+    on the portal since the cache was written are still accepted.
     """
     # 1. Fetch/Get Metadata
     udf_defs = fetch_udf_metadata(module, client, module_name)
@@ -86,6 +144,12 @@ def get_udf_field_type(module, client, module_name, field_name):
     field_key = field_name.lower()
     field_def = udf_defs.get(field_key)
 
+    with UDF_METADATA_LOCK:
+        fetched = module_name in UDF_METADATA_FETCHED
+    if not field_def and not fetched:
+        udf_defs = fetch_udf_metadata(module, client, module_name, refresh=True)
+        field_def = udf_defs.get(field_key)
+
     if not field_def:
         # Strict validation: Fail if UDF matches prefix but is not in metadata
         module.fail_json(msg="Invalid UDF field '{0}'. Field not found in module metadata.".format(field_name))
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import time
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import list_all_records
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.cache import FileCache, portal_cache_key
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.export_util import updated_time
+
+
+USER_RESOLUTION_MODES = ['server', 'validate', 'id']
+
+# Default interval in seconds between incremental refreshes of a cached directory
+USER_CACHE_TTL = 600
+
+# Interval in seconds after which the directory is downloaded again in full, dropping removed users
+USER_FULL_REFRESH_INTERVAL = 24 * 3600
+
+USERS_ENDPOINT = 'users'
+
+# Directories already loaded in this process
+# Key: cache key, Value: (directory, refreshed_in_this_process)
+USER_DIRECTORIES = {}
+
+
+def _is_active(row):
+    """Return whether a user row is active, or None when the API does not say.
+
+    Users carry either an 'is_active' flag or a 'status' given as a name or a
+    {'name': ...} lookup (e.g. 'Active', 'Inactive').
+    """
+    if row.get('is_active') is not None:
+        return bool(row['is_active'])
+    status = row.get('status')
+    if isinstance(status, dict):
+        status = status.get('name') or status.get('value')
+    if not status:
+        return None
+    return str(status).lower() == 'active'
+
+
+def _user_entry(row):
+    return {
+        'id': row.get('id'),
+        'name': row.get('name'),
+        'email_id': row.get('email_id'),
+        # None when the API does not report the flag; only an explicit False rejects a user
+        'is_technician': row.get('is_technician'),
+        'is_active': _is_active(row),
+    }
+
+
+def refresh_user_directory(client, directory=None):
+    """Fetch users into a directory dict, incrementally when possible.
+
+    The directory maps lower-cased email to a user entry under 'users'. With
+    an existing directory that has a high-water mark, only users updated at or
+    after it are listed and merged in; otherwise every user is listed and the
+    directory is rebuilt.
+
+    Returns:
+        The refreshed directory (a new dict).
+    """
+    now = time.time()
+    incremental = bool(directory) and directory.get('high_water') is not None
+    list_info = {'sort_field': 'id', 'sort_order': 'asc'}
+    if incremental:
+        list_info['search_criteria'] = [
+            {'field': 'last_updated_time', 'condition': 'greater or equal', 'value': str(directory['high_water'])},
+        ]
+        users = dict(directory['users'])
+        high_water = directory['high_water']
+        full_at = directory['full_at']
+    else:
+        users = {}
+        high_water = None
+        full_at = now
+
+    for row in list_all_records(client, USERS_ENDPOINT, USERS_ENDPOINT, list_info=list_info):
+        updated = updated_time(row)
+        if updated is not None and (high_water is None or updated > high_water):
+            high_water = updated
+        if row.get('email_id'):
+            users[row['email_id'].lower()] = _user_entry(row)
+
+    return {'users': users, 'high_water': high_water, 'refreshed_at': now, 'full_at': full_at}
+
+
+def get_user_directory(module, client, ttl=USER_CACHE_TTL, refresh=False):
+    """Return the portal's user directory from memory, the disk cache or the API.
+
+    A cached directory older than ttl is refreshed incrementally, and one whose
+    last full download is older than USER_FULL_REFRESH_INTERVAL is downloaded
+    again. refresh forces an incremental refresh.
+
+    Returns:
+        A tuple (directory, refreshed) where refreshed tells whether the
+        directory was refreshed by this process.
+    """
+    key = portal_cache_key(module, USERS_ENDPOINT)
+    if not refresh and key in USER_DIRECTORIES:
+        return USER_DIRECTORIES[key]
+
+    cache = FileCache()
+    directory = USER_DIRECTORIES[key][0] if key in USER_DIRECTORIES else cache.get(key)
+    now = time.time()
+    if directory and now - directory.get('full_at', 0) > USER_FULL_REFRESH_INTERVAL:
+        directory = None
+
+    refreshed = refresh or not directory or now - directory.get('refreshed_at', 0) > ttl
+    if refreshed:
+        directory = refresh_user_directory(client, directory)
+        cache.set(key, directory)
+
+    USER_DIRECTORIES[key] = (directory, refreshed)
+    return directory, refreshed
+
+
+def resolve_user(module, client, field_name, email, mode, ttl=USER_CACHE_TTL, role=None):
+    """Validate a user field against the cached directory and return its API form.
+
+    Lookups are by lower-cased email. An email missing from a directory that
+    was not refreshed in this process triggers one incremental refresh before
+    the value is rejected, so newly added users are accepted; a user cached as
+    inactive is refreshed the same way before being rejected. role='technician'
+    additionally requires the user to be a technician.
+
+    Returns:
+        {'id': ...} when mode is 'id', else {'email_id': ...}.
+    """
+    if mode == 'server':
+        return {'email_id': email}
+
+    directory, refreshed = get_user_directory(module, client, ttl)
+    user = directory['users'].get(email.lower())
+    if (user is None or user.get('is_active') is False) and not refreshed:
+        directory, refreshed = get_user_directory(module, client, ttl, refresh=True)
+        user = directory['users'].get(email.lower())
+
+    if user is None:
+        module.fail_json(msg="User field '{0}': no user with email '{1}' exists on the portal.".format(field_name, email))
+    if user.get('is_active') is False:
+        module.fail_json(msg="User field '{0}': user '{1}' is inactive on the portal.".format(field_name, email))
+    if role == 'technician' and user.get('is_technician') is False:
+        module.fail_json(msg="User field '{0}' requires a technician, but '{1}' is not one.".format(field_name, email))
+
+    if mode == 'id':
+        return {'id': user['id']}
+    return {'email_id': user['email_id']}
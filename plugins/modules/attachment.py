@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: attachment
+author:
+  - Harish Kumar (@harishkumar-k-7052)
+short_description: Manage attachments on ManageEngine ServiceDesk Plus Cloud records
+description:
+  - Uploads local files as attachments to a Request, Problem, Change or Release, or downloads existing attachments to disk.
+  - Files are streamed from and to disk in fixed-size chunks, so memory use does not depend on file size.
+  - Multiple files are transferred concurrently.
+  - When uploading, files whose name and size already exist on the record are skipped, so re-runs upload nothing.
+  - When downloading, files already present in I(dest) with the expected size are skipped, and partially
+    downloaded files are resumed with HTTP Range requests.
+  - Supports check mode.
+extends_documentation_fragment:
+  - manageengine.sdp_cloud.sdp
+  - manageengine.sdp_cloud.auth
+  - manageengine.sdp_cloud.concurrency
+options:
+  state:
+    description:
+      - C(present) ensures the given I(files) are attached to the record identified by I(parent_id).
+      - C(downloaded) ensures all attachments of the given records exist in I(dest).
+    type: str
+    default: present
+    choices: [present, downloaded]
+  files:
+    description:
+      - Local paths of the files to attach.
+      - Required when I(state=present).
+    type: list
+    elements: path
+  parent_ids:
+    description:
+      - IDs of the records to download attachments from when I(state=downloaded).
+      - Combined with I(parent_id) if both are given.
+    type: list
+    elements: str
+  dest:
+    description:
+      - Directory to download attachments into. Each attachment is saved as C(<dest>/<record id>/<attachment id>/<file name>),
+        so attachments sharing a name on one record do not overwrite each other.
+      - Required when I(state=downloaded).
+    type: path
+'''
+
+EXAMPLES = r'''
+- name: Attach deployment logs to a Change
+  manageengine.sdp_cloud.attachment:
+    domain: "sdpondemand.manageengine.com"
+    parent_module_name: "change"
+    parent_id: "200"
+    files:
+      - /var/log/deploy/app.log
+      - /var/log/deploy/db_migration.log
+    client_id: "your_client_id"
+    client_secret: "your_client_secret"
+    refresh_token: "your_refresh_token"
+    dc: "US"
+    portal_name: "ithelpdesk"
+
+- name: Download evidence attachments from several Requests
+  manageengine.sdp_cloud.attachment:
+    domain: "sdpondemand.manageengine.com"
+    parent_module_name: "request"
+    parent_ids:
+      - "100"
+      - "101"
+    state: downloaded
+    dest: /srv/audit/evidence
+    client_id: "your_client_id"
+    client_secret: "your_client_secret"
+    refresh_token: "your_refresh_token"
+    dc: "US"
+    portal_name: "ithelpdesk"
+'''
+
+RETURN = r'''
+uploaded:
+  description: The files that were uploaded (or would be uploaded in check mode).
+  returned: when I(state=present)
+  type: list
+  elements: dict
+downloaded:
+  description:
+    - The attachments that were downloaded (or would be downloaded in check mode).
+    - Each entry includes C(path), C(size) and C(resumed_from), the byte offset a partial download resumed at.
+  returned: when I(state=downloaded)
+  type: list
+  elements: dict
+skipped:
+  description:
+    - The files skipped because they already exist.
+    - When uploading, an attachment with the same name and size exists on the record.
+    - When downloading, the local file exists with the expected size.
+  returned: always
+  type: list
+  elements: dict
+trace:
+  description:
+    - Ids of the trace of the module run, present when the C(SDP_CLOUD_TRACE) environment variable is set.
+    - Pass C(traceparent) to later tasks in their C(SDP_CLOUD_TRACEPARENT) environment variable to make their spans
+      children of this run.
+  returned: when the C(SDP_CLOUD_TRACE) environment variable is set
+  type: dict
+  contains:
+    trace_id:
+      description: The trace id shared by all spans of the run.
+      type: str
+    span_id:
+      description: The id of the root span of the run.
+      type: str
+    traceparent:
+      description: The W3C traceparent of the root span.
+      type: str
+'''
+
+import os
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import (
+    SDPClient, common_argument_spec, concurrency_argument_spec, check_module_config,
+    AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.attachment_util import (
+    list_attachments, plan_uploads, upload_attachment, plan_downloads, download_attachment
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.tracing import run_traced
+
+
+def _handle_present(module, client):
+    """Handle state=present (upload) logic."""
+    files = module.params.get('files')
+    if not module.params.get('parent_id'):
+        module.fail_json(msg="parent_id is required when state=present.")
+    if not files:
+        module.fail_json(msg="files is required when state=present.")
+
+    for path in files:
+        if not os.path.isfile(path):
+            module.fail_json(msg="File not found: {0}".format(path))
+
+    existing = list_attachments(module, client)
+    to_upload, skipped = plan_uploads(files, existing)
+
+    if not to_upload or module.check_mode:
+        module.exit_json(changed=bool(to_upload), uploaded=to_upload, skipped=skipped)
+
+    def _upload(entry):
+        result = dict(entry)
+        result['response'] = upload_attachment(module, client, entry['path'])
+        return result
+
+    uploaded = client.map_concurrent(_upload, to_upload, module.params['concurrency'])
+
+    module.exit_json(changed=True, uploaded=uploaded, skipped=skipped)
+
+
+def _handle_downloaded(module, client):
+    """Handle state=downloaded logic."""
+    dest = module.params.get('dest')
+    if not dest:
+        module.fail_json(msg="dest is required when state=downloaded.")
+
+    parent_ids = []
+    for parent_id in [module.params.get('parent_id')] + (module.params.get('parent_ids') or []):
+        if parent_id and parent_id not in parent_ids:
+            parent_ids.append(parent_id)
+    if not parent_ids:
+        module.fail_json(msg="parent_id or parent_ids is required when state=downloaded.")
+
+    concurrency = module.params['concurrency']
+
+    def _list(parent_id):
+        return parent_id, list_attachments(module, client, parent_id=parent_id)
+
+    attachments_by_record = client.map_concurrent(_list, parent_ids, concurrency)
+    try:
+        to_download, skipped = plan_downloads(dest, attachments_by_record)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
+    if not to_download or module.check_mode:
+        module.exit_json(changed=bool(to_download), downloaded=to_download, skipped=skipped)
+
+    def _download(entry):
+        return download_attachment(module, client, entry)
+
+    downloaded = client.map_concurrent(_download, to_download, concurrency)
+
+    module.exit_json(changed=True, downloaded=downloaded, skipped=skipped)
+
+
+def run_module():
+    """Main execution entry point for attachment module."""
+    module_args = common_argument_spec()
+    module_args.update(concurrency_argument_spec())
+    module_args.update(dict(
+        state=dict(type='str', default='present', choices=['present', 'downloaded']),
+        files=dict(type='list', elements='path'),
+        parent_ids=dict(type='list', elements='str'),
+        dest=dict(type='path'),
+    ))
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE,
+        required_together=AUTH_REQUIRED_TOGETHER
+    )
+
+    check_module_config(module)
+
+    client = SDPClient(module)
+
+    if module.params['state'] == 'downloaded':
+        _handle_downloaded(module, client)
+    else:
+        _handle_present(module, client)
+
+
+def main():
+    run_traced(run_module, 'attachment')
+
+
+if __name__ == '__main__':
+    main()
@@ -68,10 +68,38 @@ token_type:
   description: The type of token (e.g., Bearer).
   returned: always
   type: str
+profile:
+  description:
+    - Profile of the module run, present when the C(SDP_CLOUD_PROFILE) environment variable is set.
+    - C(elapsed) is the run time in seconds, C(functions) the slowest functions of the main thread by cumulative time,
+      and C(memory) the peak traced memory and the largest allocation sites.
+    - C(files) lists the C(.prof) (pstats) and C(.tracemalloc) (memory snapshot) files written when
+      C(SDP_CLOUD_PROFILE) is a directory.
+  returned: when the C(SDP_CLOUD_PROFILE) environment variable is set
+  type: dict
+trace:
+  description:
+    - Ids of the trace of the module run, present when the C(SDP_CLOUD_TRACE) environment variable is set.
+    - Pass C(traceparent) to later tasks in their C(SDP_CLOUD_TRACEPARENT) environment variable to make their spans
+      children of this run.
+  returned: when the C(SDP_CLOUD_TRACE) environment variable is set
+  type: dict
+  contains:
+    trace_id:
+      description: The trace id shared by all spans of the run.
+      type: str
+    span_id:
+      description: The id of the root span of the run.
+      type: str
+    traceparent:
+      description: The W3C traceparent of the root span.
+      type: str
 '''
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.oauth import get_access_token
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.profiling import run_profiled
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.tracing import run_traced
 
 
 def run_module():
@@ -103,7 +131,7 @@ def run_module():
 
 
 def main():
-    run_module()
+    run_traced(lambda: run_profiled(run_module, 'oauth_token'), 'oauth_token')
 
 
 if __name__ == '__main__':
@@ -18,6 +18,7 @@ description:
 extends_documentation_fragment:
   - manageengine.sdp_cloud.sdp
   - manageengine.sdp_cloud.auth
+  - manageengine.sdp_cloud.concurrency
 options:
   payload:
     description:
@@ -26,6 +27,107 @@ options:
       - Supported keys are C(row_count) (1-100, default 10), C(sort_field), C(sort_order) (asc/desc), C(get_total_count), and C(start_index).
       - Ignored when C(parent_id) is provided.
     type: dict
+  expand:
+    description:
+      - Related sub-resources to fetch alongside a single record, for example C(notes), C(tasks), C(worklogs).
+      - The sub-resources are fetched concurrently and returned under C(expanded).
+      - Allowed values depend on I(parent_module_name). C(request) supports C(notes), C(tasks), C(worklogs) and C(approval_levels).
+        C(problem) and C(release) support C(notes), C(tasks) and C(worklogs). C(change) additionally supports
+        C(approval_levels) and C(initiated_requests).
+      - Requires I(parent_id).
+    type: list
+    elements: str
+  return_mode:
+    description:
+      - Controls how much data is returned, to keep registered results small in large loops.
+      - C(full) returns the API response and the constructed payload.
+      - C(minimal) returns the API response without C(response_status), and no payload.
+      - C(id) returns only C(id) for a single record or C(ids) for a list.
+      - C(none) returns only C(changed).
+    type: str
+    default: full
+    choices: [full, minimal, id, none]
+  output_format:
+    description:
+      - Layout of the records in a list response.
+      - C(rows) returns the list of records as sent by the API.
+      - C(columnar) replaces the list with a columnar layout (field to list of values) in which lookup objects
+        such as C(status) or C(priority) are stored once in a shared table. This cuts the result size several-fold
+        for wide lists. Use the P(manageengine.sdp_cloud.columnar_to_rows#filter) filter to re-hydrate the rows.
+      - Ignored when I(parent_id) is provided.
+    type: str
+    default: rows
+    choices: [rows, columnar]
+  export:
+    description:
+      - Export every record in a time range instead of reading one page.
+      - The range of I(export.field) is split into time slices that are fetched in parallel (up to I(concurrency)),
+        each with shallow C(start_index) offsets. The upper bound is fixed when the export starts, so records
+        created meanwhile do not shift rows between pages. Rows are de-duplicated by id.
+      - Mutually exclusive with I(parent_id) and I(payload).
+    type: dict
+    suboptions:
+      field:
+        description:
+          - Sortable datetime field used to slice the range.
+        type: str
+        default: created_time
+      start_time:
+        description:
+          - Lower bound (inclusive) as epoch milliseconds.
+          - Defaults to the earliest value of I(export.field) on the portal.
+        type: int
+      end_time:
+        description:
+          - Upper bound (exclusive) as epoch milliseconds.
+          - Defaults to the time the export starts.
+        type: int
+      slices:
+        description:
+          - Number of time slices the range is split into.
+        type: int
+        default: 8
+  time_budget:
+    description:
+      - Read the whole list page by page, stopping once this many seconds have elapsed.
+      - Pages are read with keyset pagination on the I(payload) C(sort_field) (default C(created_time)), which must be
+        C(id), C(created_time) or C(last_updated_time). If the budget runs out before the end of the list, the module
+        returns C(cursor); pass it to a later run to continue exactly where this one stopped.
+      - Pages hold 100 records unless I(payload) sets C(row_count).
+      - The page in flight when the budget runs out is completed, so a run can exceed the budget by one request.
+      - Mutually exclusive with I(parent_id) and I(export).
+    type: int
+  cursor:
+    description:
+      - Opaque cursor returned by a previous run with I(time_budget).
+      - Continues that read with its original sort field, order, page size and filters, so I(payload) must not be given.
+      - Without I(time_budget), the rest of the list is read in one run.
+    type: str
+  mirror:
+    description:
+      - Answer the read from a local SQLite mirror of the module's records instead of listing them from the API.
+      - If the mirror is older than I(mirror.max_age), it is first refreshed incrementally, which only fetches records
+        created or updated since the previous refresh. A mirror that does not exist yet is filled with a full sync.
+      - With I(parent_id), the record is returned from the mirror when present; otherwise it is read from the API.
+      - The mirror can also be refreshed on its own with M(manageengine.sdp_cloud.record_mirror).
+      - Mutually exclusive with I(payload), I(export), I(time_budget) and I(cursor).
+    type: dict
+    suboptions:
+      path:
+        description:
+          - Path of the SQLite database file. It is created if missing.
+        type: path
+        required: true
+      max_age:
+        description:
+          - Maximum age in seconds of the mirrored data before the read refreshes it.
+        type: int
+        default: 300
+      filters:
+        description:
+          - Return only records whose fields match, as a mapping of field name to a value or a list of accepted values.
+          - Lookup fields such as C(status) or C(priority) match on their name, users on their email address.
+        type: dict
 '''
 
 EXAMPLES = r'''
@@ -52,21 +154,146 @@ EXAMPLES = r'''
     payload:
       row_count: 10
       start_index: 1
+
+- name: Get a Change with its notes, tasks and approvals
+  manageengine.sdp_cloud.read_record:
+    domain: "sdpondemand.manageengine.com"
+    parent_module_name: "change"
+    parent_id: "200"
+    expand:
+      - notes
+      - tasks
+      - approval_levels
+    client_id: "your_client_id"
+    client_secret: "your_client_secret"
+    refresh_token: "your_refresh_token"
+    dc: "US"
+    portal_name: "ithelpdesk"
+
+- name: Export all Changes created in 2024
+  manageengine.sdp_cloud.read_record:
+    domain: "sdpondemand.manageengine.com"
+    parent_module_name: "change"
+    client_id: "your_client_id"
+    client_secret: "your_client_secret"
+    refresh_token: "your_refresh_token"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    concurrency: 8
+    output_format: columnar
+    export:
+      start_time: 1704067200000
+      end_time: 1735689600000
+      slices: 16
+
+- name: Read Requests for at most 5 minutes per task, resuming where the previous task stopped
+  manageengine.sdp_cloud.read_record:
+    domain: "sdpondemand.manageengine.com"
+    parent_module_name: "request"
+    client_id: "your_client_id"
+    client_secret: "your_client_secret"
+    refresh_token: "your_refresh_token"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    time_budget: 300
+    cursor: "{{ previous_read.cursor | default(omit) }}"
+  register: previous_read
+
+- name: Get open Changes from a local mirror refreshed at most every 10 minutes
+  manageengine.sdp_cloud.read_record:
+    domain: "sdpondemand.manageengine.com"
+    parent_module_name: "change"
+    client_id: "your_client_id"
+    client_secret: "your_client_secret"
+    refresh_token: "your_refresh_token"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    mirror:
+      path: /var/cache/sdp/mirror.db
+      max_age: 600
+      filters:
+        status: ["Requested", "Planning", "Implementation"]
 '''
 
 RETURN = r'''
 response:
-  description: The raw response from the SDP Cloud API.
-  returned: always
+  description:
+    - The raw response from the SDP Cloud API.
+    - With I(output_format=columnar), the list of records is replaced by its columnar layout.
+  returned: when I(return_mode) is C(full) or C(minimal)
+  type: dict
+id:
+  description: The ID of the record read.
+  returned: when I(return_mode=id) and I(parent_id) is provided
+  type: str
+ids:
+  description: The IDs of the listed records.
+  returned: when I(return_mode=id) and I(parent_id) is not provided
+  type: list
+  elements: str
+expanded:
+  description:
+    - The sub-resources requested through I(expand), keyed by sub-resource name.
+    - Each value is the list of sub-records returned by the API.
+  returned: when I(expand) is provided and I(return_mode) is C(full) or C(minimal)
+  type: dict
+cursor:
+  description:
+    - Opaque cursor to continue the read from, or C(null) once every record has been read.
+  returned: when I(time_budget) or I(cursor) is provided
+  type: str
+mirror:
+  description:
+    - State of the local mirror used for the read.
+    - C(refreshed) tells whether the mirror was synced during this run, C(age) is its age in seconds after the read.
+  returned: when I(mirror) is provided
+  type: dict
+transfer:
+  description:
+    - Bytes of API responses received by the task. Responses are requested gzip or deflate compressed.
+    - C(wire_bytes) counts bytes received on the network, C(body_bytes) the decompressed JSON, C(responses) the responses read.
+  returned: when I(return_mode=full)
   type: dict
+  sample: {"wire_bytes": 41250, "body_bytes": 389112, "responses": 4}
+profile:
+  description:
+    - Profile of the module run, present when the C(SDP_CLOUD_PROFILE) environment variable is set.
+    - C(elapsed) is the run time in seconds, C(functions) the slowest functions of the main thread by cumulative time,
+      and C(memory) the peak traced memory and the largest allocation sites.
+    - C(files) lists the C(.prof) (pstats) and C(.tracemalloc) (memory snapshot) files written when
+      C(SDP_CLOUD_PROFILE) is a directory.
+  returned: when the C(SDP_CLOUD_PROFILE) environment variable is set
+  type: dict
+trace:
+  description:
+    - Ids of the trace of the module run, present when the C(SDP_CLOUD_TRACE) environment variable is set.
+    - Pass C(traceparent) to later tasks in their C(SDP_CLOUD_TRACEPARENT) environment variable to make their spans
+      children of this run.
+  returned: when the C(SDP_CLOUD_TRACE) environment variable is set
+  type: dict
+  contains:
+    trace_id:
+      description: The trace id shared by all spans of the run.
+      type: str
+    span_id:
+      description: The id of the root span of the run.
+      type: str
+    traceparent:
+      description: The W3C traceparent of the root span.
+      type: str
 '''
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import (
-    SDPClient, common_argument_spec, check_module_config, construct_endpoint,
-    AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER
+    SDPClient, common_argument_spec, concurrency_argument_spec, check_module_config, construct_endpoint,
+    list_all_records, AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER, RETURN_MODES
 )
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.export_util import (
+    KEYSET_FIELDS, time_sliced_export, budgeted_read, new_cursor_state, encode_cursor, decode_cursor
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.profiling import run_profiled
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.tracing import run_traced
 
 
 def construct_payload(module):
@@ -137,25 +364,257 @@ def construct_payload(module):
     return {"list_info": validated_payload}
 
 
+def validate_expand(module):
+    """Validate the expand option against the parent module's sub-resources."""
+    expand = module.params.get('expand')
+    if not expand:
+        return []
+
+    if not module.params.get('parent_id'):
+        module.fail_json(msg="expand requires parent_id.")
+
+    parent_module = module.params['parent_module_name']
+    allowed = MODULE_CONFIG.get(parent_module).get('sub_resources', [])
+    for name in expand:
+        if name not in allowed:
+            module.fail_json(msg="Invalid expand value '{0}' for {1}. Allowed values: {2}".format(name, parent_module, allowed))
+
+    # Preserve order but drop duplicates so each sub-resource is fetched once
+    unique = []
+    for name in expand:
+        if name not in unique:
+            unique.append(name)
+    return unique
+
+
+def fetch_expanded(module, client, names):
+    """Fetch the given sub-resources of the current record concurrently.
+
+    Each sub-resource is read page by page until list_info.has_more_rows is
+    false, so records with more than one page of sub-records are complete.
+
+    Returns:
+        A dict mapping each sub-resource name to its list of sub-records.
+    """
+    def _fetch(name):
+        endpoint = construct_endpoint(module, operation=name)
+        rows = list_all_records(client, endpoint, name,
+                                extract_rows=lambda response: _extract_sub_records(response, name))
+        return name, rows
+
+    concurrency = module.params.get('concurrency') or 1
+    return dict(client.map_concurrent(_fetch, names, concurrency))
+
+
+def _extract_sub_records(response, name):
+    """Return the list of sub-records from a sub-resource list response."""
+    if not isinstance(response, dict):
+        return []
+    if name in response:
+        return response[name]
+    # Some endpoints wrap the list under a singular or differently named key
+    for key, value in response.items():
+        if key not in ('response_status', 'list_info') and isinstance(value, list):
+            return value
+    return []
+
+
+def run_export(module, client, endpoint):
+    """Run a time-sliced export and return a list-shaped response."""
+    export = module.params['export']
+    parent_module = module.params['parent_module_name']
+    module_config = MODULE_CONFIG.get(parent_module)
+    field = export.get('field') or 'created_time'
+
+    time_fields = [f for f in module_config.get('sortable_fields', []) if f.endswith('_time')]
+    if field not in time_fields:
+        module.fail_json(msg="Invalid export field '{0}'. Allowed fields: {1}".format(field, time_fields))
+    if export.get('slices') is not None and export['slices'] < 1:
+        module.fail_json(msg="export.slices must be at least 1.")
+
+    list_key = module_config['endpoint']
+    rows, info = time_sliced_export(
+        client, endpoint, list_key,
+        field=field,
+        start=export.get('start_time'),
+        end=export.get('end_time'),
+        slices=export.get('slices') or 8,
+        concurrency=module.params.get('concurrency') or 1,
+    )
+
+    list_info = dict(info)
+    list_info.update({'row_count': len(rows), 'has_more_rows': False})
+    return {list_key: rows, 'list_info': list_info}
+
+
+def run_budgeted_read(module, client, endpoint):
+    """Run a keyset read limited by time_budget and return (response, cursor)."""
+    parent_module = module.params['parent_module_name']
+    module_config = MODULE_CONFIG.get(parent_module)
+
+    if module.params.get('cursor'):
+        try:
+            state = decode_cursor(module.params['cursor'])
+        except ValueError as e:
+            module.fail_json(msg=str(e))
+        if state.get('module') != parent_module:
+            module.fail_json(msg="The cursor was created for '{0}', not '{1}'.".format(state.get('module'), parent_module))
+    else:
+        data = construct_payload(module) or {'list_info': {}}
+        list_info = data['list_info']
+        sort_field = list_info.get('sort_field', 'created_time')
+        keyset_fields = [f for f in module_config.get('sortable_fields', []) if f in KEYSET_FIELDS]
+        if sort_field not in keyset_fields:
+            module.fail_json(msg="time_budget requires sort_field to be one of {0}.".format(keyset_fields))
+        # construct_payload defaults row_count to 10; keyset pages are full-size unless row_count was given
+        row_count = list_info['row_count'] if 'row_count' in (module.params.get('payload') or {}) else 100
+        state = new_cursor_state(
+            parent_module,
+            sort_field=sort_field,
+            sort_order=list_info.get('sort_order', 'asc'),
+            row_count=row_count,
+        )
+
+    time_budget = module.params.get('time_budget')
+    if time_budget is not None and time_budget < 1:
+        module.fail_json(msg="time_budget must be at least 1 second.")
+
+    list_key = module_config['endpoint']
+    try:
+        rows, state = budgeted_read(client, endpoint, list_key, state, time_budget)
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
+    response = {list_key: rows, 'list_info': {'row_count': len(rows), 'has_more_rows': state is not None}}
+    return response, encode_cursor(state) if state else None
+
+
+def run_mirror_read(module, client):
+    """Answer the read from the local mirror, refreshing it first when stale.
+
+    Returns:
+        A tuple (response, mirror_info). response is None when a single record
+        is not in the mirror and must be read from the API.
+    """
+    from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.mirror import RecordMirror, mirror_scope
+
+    options = module.params['mirror']
+    parent_module = module.params['parent_module_name']
+    list_key = MODULE_CONFIG[parent_module]['endpoint']
+    scope = mirror_scope(module.params['domain'], module.params['portal_name'], parent_module)
+    max_age = options.get('max_age')
+    if max_age is None:
+        max_age = 300
+
+    try:
+        with RecordMirror(options['path']) as mirror:
+            age = mirror.age(scope)
+            refreshed = age is None or age > max_age
+            if refreshed:
+                # The list endpoint is named like the list key; parent_id must not narrow the sync
+                mirror.sync(client, list_key, list_key, scope)
+
+            parent_id = module.params.get('parent_id')
+            if parent_id:
+                record = mirror.get(scope, parent_id)
+                response = {parent_module: record} if record is not None else None
+            else:
+                rows = mirror.query(scope, options.get('filters'))
+                response = {list_key: rows, 'list_info': {'row_count': len(rows), 'has_more_rows': False}}
+            mirror_info = {'path': options['path'], 'refreshed': refreshed, 'age': mirror.age(scope)}
+    except Exception as e:
+        module.fail_json(msg="Failed to read from mirror {0}: {1}".format(options['path'], e))
+
+    return response, mirror_info
+
+
+def build_result(module, response, data, expanded=None, transfer=None):
+    """Build the module result, shaped by return_mode."""
+    return_mode = module.params.get('return_mode') or 'full'
+    parent_module = module.params['parent_module_name']
+    list_key = MODULE_CONFIG[parent_module]['endpoint']
+    result = dict(changed=False)
+
+    columnar = module.params.get('output_format') == 'columnar' and return_mode in ('full', 'minimal')
+    if columnar and isinstance(response.get(list_key), list):
+        from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.columnar import to_columnar
+        response = dict(response)
+        response[list_key] = to_columnar(response[list_key])
+
+    if return_mode == 'full':
+        result.update(response=response, payload=data)
+        if transfer is not None:
+            result['transfer'] = transfer
+    elif return_mode == 'minimal':
+        result['response'] = dict((k, v) for k, v in response.items() if k != 'response_status')
+    elif return_mode == 'id':
+        if module.params.get('parent_id'):
+            result['id'] = (response.get(parent_module) or {}).get('id')
+        else:
+            result['ids'] = [row.get('id') for row in response.get(list_key) or []]
+
+    if expanded is not None and return_mode in ('full', 'minimal'):
+        result['expanded'] = expanded
+
+    return result
+
+
 def run_module():
     """Main execution entry point for read module."""
     module_args = common_argument_spec()
+    module_args.update(concurrency_argument_spec())
     module_args.update(dict(
-        payload=dict(type='dict')
+        payload=dict(type='dict'),
+        expand=dict(type='list', elements='str'),
+        return_mode=dict(type='str', default='full', choices=RETURN_MODES),
+        output_format=dict(type='str', default='rows', choices=['rows', 'columnar']),
+        export=dict(type='dict', options=dict(
+            field=dict(type='str', default='created_time'),
+            start_time=dict(type='int'),
+            end_time=dict(type='int'),
+            slices=dict(type='int', default=8),
+        )),
+        time_budget=dict(type='int'),
+        cursor=dict(type='str', no_log=False),
+        mirror=dict(type='dict', options=dict(
+            path=dict(type='path', required=True),
+            max_age=dict(type='int', default=300),
+            filters=dict(type='dict'),
+        )),
     ))
 
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=True,
-        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE,
+        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE + [
+            ('export', 'parent_id'), ('export', 'payload'), ('export', 'time_budget'), ('export', 'cursor'),
+            ('time_budget', 'parent_id'), ('cursor', 'parent_id'), ('cursor', 'payload'),
+            ('mirror', 'payload'), ('mirror', 'export'), ('mirror', 'time_budget'), ('mirror', 'cursor'),
+        ],
         required_together=AUTH_REQUIRED_TOGETHER
     )
 
     check_module_config(module)
+    expand = validate_expand(module)
 
     client = SDPClient(module)
     endpoint = construct_endpoint(module)
 
+    if module.params.get('export'):
+        response = run_export(module, client, endpoint)
+        module.exit_json(**build_result(module, response, None, transfer=client.transfer.as_dict()))
+
+    if module.params.get('time_budget') is not None or module.params.get('cursor'):
+        response, cursor = run_budgeted_read(module, client, endpoint)
+        module.exit_json(cursor=cursor, **build_result(module, response, None, transfer=client.transfer.as_dict()))
+
+    mirror_info = None
+    if module.params.get('mirror'):
+        response, mirror_info = run_mirror_read(module, client)
+        if response is not None:
+            expanded = fetch_expanded(module, client, expand) if expand else None
+            module.exit_json(mirror=mirror_info, **build_result(module, response, None, expanded, client.transfer.as_dict()))
+
     # Construct Payload
     data = construct_payload(module)
 
@@ -165,11 +624,16 @@ def run_module():
         data=data
     )
 
-    module.exit_json(changed=False, response=response, payload=data)
+    expanded = fetch_expanded(module, client, expand) if expand else None
+
+    result = build_result(module, response, data, expanded, client.transfer.as_dict())
+    if mirror_info is not None:
+        result['mirror'] = mirror_info
+    module.exit_json(**result)
 
 
 def main():
-    run_module()
+    run_traced(lambda: run_profiled(run_module, 'read_record'), 'read_record')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: record_mirror
+author:
+  - Harish Kumar (@harishkumar-k-7052)
+short_description: Sync ManageEngine ServiceDesk Plus Cloud records into a local SQLite mirror
+description:
+  - Copies the Requests, Problems, Changes or Releases of a portal into a local SQLite database, so that
+    M(manageengine.sdp_cloud.read_record) can answer list reads with its I(mirror) option as local queries.
+  - The first sync of a module fetches every record. Later syncs are incremental and only fetch records
+    created or updated since the newest update time already mirrored.
+  - Records deleted on the portal are only removed from the mirror by a full sync (I(full=true)).
+  - Mirrored records are indexed on id, C(last_updated_time), C(status) and the fields in I(index_fields).
+  - In check mode the mirror is not synced; the result describes its current state.
+extends_documentation_fragment:
+  - manageengine.sdp_cloud.sdp
+  - manageengine.sdp_cloud.auth
+options:
+  path:
+    description:
+      - Path of the SQLite database file. It is created if missing.
+      - One file can mirror several modules and portals.
+    type: path
+    required: true
+  full:
+    description:
+      - Replace every mirrored record of the module instead of fetching only the changes.
+    type: bool
+    default: false
+  max_age:
+    description:
+      - Skip the sync if the mirror was synced less than this many seconds ago.
+      - By default the mirror is always synced.
+    type: int
+  index_fields:
+    description:
+      - Additional record fields to index for filtering, for example C(priority), C(technician) or C(site).
+      - Fields indexed by earlier syncs stay indexed.
+    type: list
+    elements: str
+'''
+
+EXAMPLES = r'''
+- name: Refresh the local mirror of Changes
+  manageengine.sdp_cloud.record_mirror:
+    domain: "sdpondemand.manageengine.com"
+    parent_module_name: "change"
+    path: /var/cache/sdp/mirror.db
+    index_fields:
+      - change_type
+      - change_owner
+    client_id: "your_client_id"
+    client_secret: "your_client_secret"
+    refresh_token: "your_refresh_token"
+    dc: "US"
+    portal_name: "ithelpdesk"
+
+- name: Rebuild the Request mirror nightly, dropping deleted Requests
+  manageengine.sdp_cloud.record_mirror:
+    domain: "sdpondemand.manageengine.com"
+    parent_module_name: "request"
+    path: /var/cache/sdp/mirror.db
+    full: true
+    client_id: "your_client_id"
+    client_secret: "your_client_secret"
+    refresh_token: "your_refresh_token"
+    dc: "US"
+    portal_name: "ithelpdesk"
+'''
+
+RETURN = r'''
+synced:
+  description: Whether the mirror was synced during this run.
+  returned: always
+  type: bool
+fetched:
+  description: The number of records fetched from the API.
+  returned: always
+  type: int
+full:
+  description: Whether the sync replaced every mirrored record.
+  returned: always
+  type: bool
+record_count:
+  description: The number of records of the module in the mirror after the run.
+  returned: always
+  type: int
+age:
+  description: The age of the mirror in seconds after the run, or C(null) if it was never synced.
+  returned: always
+  type: float
+trace:
+  description:
+    - Ids of the trace of the module run, present when the C(SDP_CLOUD_TRACE) environment variable is set.
+    - Pass C(traceparent) to later tasks in their C(SDP_CLOUD_TRACEPARENT) environment variable to make their spans
+      children of this run.
+  returned: when the C(SDP_CLOUD_TRACE) environment variable is set
+  type: dict
+  contains:
+    trace_id:
+      description: The trace id shared by all spans of the run.
+      type: str
+    span_id:
+      description: The id of the root span of the run.
+      type: str
+    traceparent:
+      description: The W3C traceparent of the root span.
+      type: str
+'''
+
+import os
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import (
+    SDPClient, common_argument_spec, check_module_config,
+    AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.mirror import RecordMirror, mirror_scope
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.tracing import run_traced
+
+
+def run_module():
+    """Main execution entry point for record_mirror module."""
+    module_args = common_argument_spec()
+    module_args.update(dict(
+        path=dict(type='path', required=True),
+        full=dict(type='bool', default=False),
+        max_age=dict(type='int'),
+        index_fields=dict(type='list', elements='str'),
+    ))
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE,
+        required_together=AUTH_REQUIRED_TOGETHER
+    )
+
+    check_module_config(module)
+
+    parent_module = module.params['parent_module_name']
+    list_key = MODULE_CONFIG[parent_module]['endpoint']
+    scope = mirror_scope(module.params['domain'], module.params['portal_name'], parent_module)
+    max_age = module.params.get('max_age')
+
+    result = dict(changed=False, synced=False, fetched=0, full=False)
+    if module.check_mode and not os.path.exists(module.params['path']):
+        module.exit_json(record_count=0, age=None, **result)
+
+    try:
+        with RecordMirror(module.params['path']) as mirror:
+            age = mirror.age(scope)
+            stale = age is None or max_age is None or age > max_age
+            if stale and not module.check_mode:
+                client = SDPClient(module)
+                summary = mirror.sync(
+                    client, list_key, list_key, scope,
+                    full=module.params['full'],
+                    index_fields=module.params.get('index_fields'),
+                )
+                result.update(changed=summary['fetched'] > 0, synced=True, fetched=summary['fetched'], full=summary['full'])
+            result['record_count'] = mirror.count(scope)
+            result['age'] = mirror.age(scope)
+    except Exception as e:
+        module.fail_json(msg="Failed to sync mirror {0}: {1}".format(module.params['path'], e))
+
+    module.exit_json(**result)
+
+
+def main():
+    run_traced(run_module, 'record_mirror')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: sdp_metadata
+author:
+  - Harish Kumar (@harishkumar-k-7052)
+short_description: Fetch and cache field metadata of ManageEngine ServiceDesk Plus Cloud modules
+description:
+  - Fetches the field metadata (C(_metainfo)) of Requests, Problems, Changes and Releases concurrently and stores it
+    in the on-disk cache used by M(manageengine.sdp_cloud.write_record) to resolve UDF fields.
+  - Running it once at the start of a play removes the metadata fetches from every later task.
+  - Returns a normalized schema of each module, listing the system and UDF fields accepted by
+    M(manageengine.sdp_cloud.write_record) with their types and groups, and the fields lists can be sorted on.
+  - The cache lives in C($SDP_CLOUD_CACHE_DIR) (default C(~/.cache/manageengine.sdp_cloud)), per portal.
+extends_documentation_fragment:
+  - manageengine.sdp_cloud.sdp
+  - manageengine.sdp_cloud.auth
+  - manageengine.sdp_cloud.concurrency
+options:
+  parent_module_name:
+    description:
+      - The module to fetch metadata for.
+      - By default metadata of every module is fetched.
+    required: false
+  refresh:
+    description:
+      - Fetch the metadata even if a cached copy younger than I(cache_ttl) exists.
+    type: bool
+    default: false
+  cache_ttl:
+    description:
+      - Maximum age in seconds of cached metadata.
+    type: int
+    default: 86400
+'''
+
+EXAMPLES = r'''
+- name: Warm up the metadata cache at the start of the play
+  manageengine.sdp_cloud.sdp_metadata:
+    domain: "sdpondemand.manageengine.com"
+    client_id: "your_client_id"
+    client_secret: "your_client_secret"
+    refresh_token: "your_refresh_token"
+    dc: "US"
+    portal_name: "ithelpdesk"
+  register: sdp_schema
+
+- name: Fail early if a Change UDF used later in the play does not exist
+  ansible.builtin.assert:
+    that: "'udf_char1' in sdp_schema.schema.change.fields"
+'''
+
+RETURN = r'''
+schema:
+  description:
+    - Normalized schema per module name.
+    - C(fields) maps each field name to its C(type) (C(string), C(num), C(bool), C(datetime), C(lookup) or C(user)),
+      C(category) (C(system) or C(udf)) and, where applicable, C(group_name), C(display_name) and C(role).
+    - C(sortable_fields) lists the fields lists can be sorted on, C(endpoint) the API endpoint.
+  returned: always
+  type: dict
+fetched:
+  description: The modules whose metadata was fetched from the API; the rest came from the cache.
+  returned: always
+  type: list
+  elements: str
+trace:
+  description:
+    - Ids of the trace of the module run, present when the C(SDP_CLOUD_TRACE) environment variable is set.
+    - Pass C(traceparent) to later tasks in their C(SDP_CLOUD_TRACEPARENT) environment variable to make their spans
+      children of this run.
+  returned: when the C(SDP_CLOUD_TRACE) environment variable is set
+  type: dict
+  contains:
+    trace_id:
+      description: The trace id shared by all spans of the run.
+      type: str
+    span_id:
+      description: The id of the root span of the run.
+      type: str
+    traceparent:
+      description: The W3C traceparent of the root span.
+      type: str
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import (
+    SDPClient, common_argument_spec, concurrency_argument_spec,
+    AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.udf_utils import (
+    fetch_metainfo, udf_definitions, resolve_udf_type, store_udf_metadata, METAINFO_CACHE_TTL
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.tracing import run_traced
+
+
+def build_schema(module_name, metainfo):
+    """Build the normalized schema of a module from its config and metainfo."""
+    module_config = MODULE_CONFIG[module_name]
+    fields = {}
+
+    for name, meta in module_config.get('supported_system_field_meta', {}).items():
+        field = {'type': meta.get('type'), 'category': 'system'}
+        if meta.get('group_name'):
+            field['group_name'] = meta['group_name']
+        if meta.get('role'):
+            field['role'] = meta['role']
+        fields[name] = field
+
+    for name, definition in udf_definitions(metainfo).items():
+        field = {'type': resolve_udf_type(definition), 'category': 'udf'}
+        if definition.get('display_name'):
+            field['display_name'] = definition['display_name']
+        fields[name] = field
+
+    return {
+        'endpoint': module_config['endpoint'],
+        'sortable_fields': list(module_config.get('sortable_fields', [])),
+        'fields': fields,
+    }
+
+
+def run_module():
+    """Main execution entry point for sdp_metadata module."""
+    module_args = common_argument_spec()
+    module_args.update(concurrency_argument_spec())
+    module_args['parent_module_name']['required'] = False
+    module_args.update(dict(
+        refresh=dict(type='bool', default=False),
+        cache_ttl=dict(type='int', default=METAINFO_CACHE_TTL),
+    ))
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE,
+        required_together=AUTH_REQUIRED_TOGETHER
+    )
+
+    parent_module = module.params.get('parent_module_name')
+    module_names = [parent_module] if parent_module else list(MODULE_CONFIG.keys())
+
+    client = SDPClient(module)
+
+    def _fetch(module_name):
+        metainfo, fetched = fetch_metainfo(
+            module, client, module_name, ttl=module.params['cache_ttl'], refresh=module.params['refresh'])
+        return module_name, metainfo, fetched
+
+    schema = {}
+    fetched = []
+    for module_name, metainfo, was_fetched in client.map_concurrent(_fetch, module_names, module.params['concurrency']):
+        store_udf_metadata(module_name, udf_definitions(metainfo))
+        schema[module_name] = build_schema(module_name, metainfo)
+        if was_fetched:
+            fetched.append(module_name)
+
+    module.exit_json(changed=False, schema=schema, fetched=fetched)
+
+
+def main():
+    run_traced(run_module, 'sdp_metadata')
+
+
+if __name__ == '__main__':
+    main()
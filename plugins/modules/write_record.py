@@ -33,9 +33,13 @@ description:
   - When C(state=present) (default), automatically infers create vs update based on the presence of C(parent_id).
   - When C(state=absent), deletes the record identified by C(parent_id).
   - Supports idempotency, check mode, and diff mode.
+  - Child records (notes, worklogs, tasks) of an existing record can be managed with I(child_module),
+    either one at a time or in bulk with I(items).
+  - Bulk creates can be made resumable with I(journal).
 extends_documentation_fragment:
   - manageengine.sdp_cloud.sdp
   - manageengine.sdp_cloud.auth
+  - manageengine.sdp_cloud.concurrency
 options:
   state:
     description:
@@ -52,6 +56,93 @@ options:
       - For update operations, this should contain only the fields to be modified.
       - Not used when C(state=absent).
     type: dict
+  child_module:
+    description:
+      - Manage a child record of the record identified by I(parent_id) instead of the record itself.
+      - When set, I(payload) and I(items) contain fields of the child record, and C(state=absent) deletes I(child_id).
+    type: str
+    choices: [notes, worklogs, tasks]
+  child_id:
+    description:
+      - The ID of the child record to update or delete.
+      - Requires I(child_module).
+    type: str
+  items:
+    description:
+      - A batch of record payloads to create, posted through one client with bounded concurrency.
+      - With I(child_module), child records are created under I(parent_id). Without it, new records of
+        I(parent_module_name) are created and I(parent_id) must not be set.
+      - Mutually exclusive with I(payload) and I(child_id).
+      - All items are validated before any of them is sent.
+    type: list
+    elements: dict
+  item_key:
+    description:
+      - Field of each item used to de-duplicate the batch.
+      - Items whose key value repeats within I(items), or matches the same field on an existing child record, are skipped.
+      - User fields such as C(owner) are compared on their email address, case-insensitively.
+      - Required when I(journal) is set.
+    type: str
+  journal:
+    description:
+      - Path of a local checkpoint journal for I(items).
+      - Every item created is appended to the file with its I(item_key) value and the id of the new record as soon
+        as its API call succeeds. A re-run with the same journal skips items already recorded there without any
+        API call, so an interrupted bulk create resumes at the first incomplete item.
+      - Entries are scoped by endpoint, so one journal file can be shared by several tasks.
+      - The journal is not written in check mode.
+    type: path
+  return_mode:
+    description:
+      - Controls how much data is returned, to keep registered results small in large loops.
+      - C(full) returns the API response, the constructed payload and the full before/after diff.
+      - C(minimal) returns C(id) and a C(response) holding only the record id and the written fields.
+      - C(id) returns only C(id) (or C(ids) for I(items)).
+      - C(none) returns only C(changed) and C(msg).
+      - In every mode other than C(full), the diff shows only the fields that change.
+    type: str
+    default: full
+    choices: [full, minimal, id, none]
+  lookup_resolution:
+    description:
+      - How values of lookup fields such as C(status), C(priority), C(category), C(site), C(group) or C(template) are handled.
+      - C(server) sends the value as a name and leaves resolution to the server, which reports unknown values only
+        after the request is sent.
+      - C(validate) checks each value against a cached catalogue of the portal's lookup values before any record is
+        written, and sends the name as spelled on the portal. In a bulk write, one invalid item fails the task before
+        the first item is sent.
+      - C(id) validates like C(validate) and sends the id of the value instead of its name.
+      - Catalogues are cached on disk per portal in C($SDP_CLOUD_CACHE_DIR) (default C(~/.cache/manageengine.sdp_cloud)).
+        A value missing from a cached catalogue triggers one refresh before it is rejected.
+      - Lookup fields without a catalogue, and UDF lookups, are always resolved by the server.
+    type: str
+    default: server
+    choices: [server, validate, id]
+  lookup_cache_ttl:
+    description:
+      - Maximum age in seconds of a cached lookup catalogue used by I(lookup_resolution).
+    type: int
+    default: 3600
+  user_resolution:
+    description:
+      - How values of user fields such as C(requester), C(technician), C(change_manager) or C(owner) are handled.
+      - C(server) sends the email address and leaves resolution to the server.
+      - C(validate) checks each email against a cached directory of the portal's users before any record is written,
+        that the user is active, and that fields for technicians (for example C(technician), C(change_manager),
+        C(release_engineer)) name a technician. In a bulk write, one invalid item fails the task before the first
+        item is sent.
+      - C(id) validates like C(validate) and sends the id of the user instead of the email.
+      - The directory is cached on disk per portal next to the lookup catalogues and indexed by lower-cased email.
+        It is refreshed incrementally (only users updated since the last refresh are fetched) once older than
+        I(user_cache_ttl), or when an email is not found or is cached as inactive, and downloaded again in full once a day.
+    type: str
+    default: server
+    choices: [server, validate, id]
+  user_cache_ttl:
+    description:
+      - Maximum age in seconds of the cached user directory before it is refreshed incrementally.
+    type: int
+    default: 600
 '''
 
 EXAMPLES = r'''
@@ -95,23 +186,141 @@ EXAMPLES = r'''
     refresh_token: "your_refresh_token"
     dc: "US"
     portal_name: "ithelpdesk"
+
+- name: Add a Note to a Request
+  manageengine.sdp_cloud.write_record:
+    domain: "sdpondemand.manageengine.com"
+    parent_module_name: "request"
+    parent_id: "100"
+    child_module: notes
+    client_id: "your_client_id"
+    client_secret: "your_client_secret"
+    refresh_token: "your_refresh_token"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    payload:
+      description: "Deployment finished"
+      show_to_requester: true
+
+- name: Record CI time entries as Change worklogs
+  manageengine.sdp_cloud.write_record:
+    domain: "sdpondemand.manageengine.com"
+    parent_module_name: "change"
+    parent_id: "200"
+    child_module: worklogs
+    item_key: description
+    concurrency: 8
+    client_id: "your_client_id"
+    client_secret: "your_client_secret"
+    refresh_token: "your_refresh_token"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    items:
+      - description: "pipeline 4711: build"
+        owner: "ci-bot@example.com"
+        start_time: 1717000000000
+        end_time: 1717000600000
+      - description: "pipeline 4711: deploy"
+        owner: "ci-bot@example.com"
+        start_time: 1717000600000
+        end_time: 1717001200000
+
+- name: Bulk import Requests, resuming after failures
+  manageengine.sdp_cloud.write_record:
+    domain: "sdpondemand.manageengine.com"
+    parent_module_name: "request"
+    item_key: subject
+    journal: /var/lib/sdp/import_requests.journal
+    lookup_resolution: id
+    user_resolution: id
+    client_id: "your_client_id"
+    client_secret: "your_client_secret"
+    refresh_token: "your_refresh_token"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    items: "{{ requests_to_import }}"
 '''
 
 RETURN = r'''
 response:
-  description: The raw response from the SDP Cloud API.
-  returned: always
+  description:
+    - The raw response from the SDP Cloud API.
+    - With I(return_mode=minimal), only the record id and the written fields.
+  returned: when I(return_mode) is C(full) or C(minimal)
+  type: dict
+id:
+  description: The ID of the record written.
+  returned: when I(return_mode) is C(minimal) or C(id) and I(items) is not provided
+  type: str
+ids:
+  description:
+    - The IDs of the records created from I(items).
+    - With I(journal), includes the records created by earlier runs.
+  returned: when I(return_mode=id) and I(items) is provided
+  type: list
+  elements: str
+created:
+  description:
+    - The records created from I(items) (or that would be created in check mode).
+    - Each entry has the C(index) of the item in I(items), its C(key) value and the C(id) of the created record.
+  returned: when I(items) is provided and I(return_mode) is C(full) or C(minimal)
+  type: list
+  elements: dict
+skipped:
+  description: The items skipped as duplicates, each with its C(index) and C(key) value.
+  returned: when I(items) is provided and I(return_mode) is C(full) or C(minimal)
+  type: list
+  elements: dict
+resumed:
+  description:
+    - The items skipped because I(journal) records them as created by an earlier run.
+    - Each entry has the C(index) of the item in I(items), its C(key) value and the journaled C(id).
+  returned: when I(journal) is provided and I(return_mode) is C(full) or C(minimal)
+  type: list
+  elements: dict
+profile:
+  description:
+    - Profile of the module run, present when the C(SDP_CLOUD_PROFILE) environment variable is set.
+    - C(elapsed) is the run time in seconds, C(functions) the slowest functions of the main thread by cumulative time,
+      and C(memory) the peak traced memory and the largest allocation sites.
+    - C(files) lists the C(.prof) (pstats) and C(.tracemalloc) (memory snapshot) files written when
+      C(SDP_CLOUD_PROFILE) is a directory.
+  returned: when the C(SDP_CLOUD_PROFILE) environment variable is set
   type: dict
+trace:
+  description:
+    - Ids of the trace of the module run, present when the C(SDP_CLOUD_TRACE) environment variable is set.
+    - Pass C(traceparent) to later tasks in their C(SDP_CLOUD_TRACEPARENT) environment variable to make their spans
+      children of this run.
+  returned: when the C(SDP_CLOUD_TRACE) environment variable is set
+  type: dict
+  contains:
+    trace_id:
+      description: The trace id shared by all spans of the run.
+      type: str
+    span_id:
+      description: The id of the root span of the run.
+      type: str
+    traceparent:
+      description: The W3C traceparent of the root span.
+      type: str
 '''
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import (
-    SDPClient, common_argument_spec, check_module_config, construct_endpoint,
-    get_current_record, has_differences,
-    AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER
+    SDPClient, common_argument_spec, concurrency_argument_spec, check_module_config, construct_endpoint,
+    get_current_record, get_record_key, has_differences, list_all_records, trim_diff,
+    AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER, RETURN_MODES
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG, CHILD_MODULE_CONFIG
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.lookup_util import (
+    resolve_lookup, LOOKUP_RESOLUTION_MODES, LOOKUP_CACHE_TTL
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.user_directory import (
+    resolve_user, USER_RESOLUTION_MODES, USER_CACHE_TTL
 )
-from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
-from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.udf_utils import is_udf_field, get_udf_field_type
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.profiling import run_profiled
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.tracing import run_traced
 
 
 def resolve_field_metadata(module, client, module_config, field_name):
@@ -127,16 +336,19 @@ def resolve_field_metadata(module, client, module_config, field_name):
         f_config = system_fields[field_name]
         return f_config.get('type'), 'system', f_config.get('group_name')
 
-    # 2. Check UDF
-    if is_udf_field(field_name):
-        if not client:
-            module.warn("UDF field '{0}' found but no client available. Treating as string.".format(field_name))
-            return 'string', 'udf', None
+    # 2. Check UDF (child records such as notes have no UDFs)
+    # udf_utils is only loaded once a payload has a field that is not a system field
+    if module_config.get('supports_udf', True):
+        from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.udf_utils import is_udf_field, get_udf_field_type
+        if is_udf_field(field_name):
+            if not client:
+                module.warn("UDF field '{0}' found but no client available. Treating as string.".format(field_name))
+                return 'string', 'udf', None
 
-        # Fetch UDF type from parent module metadata
-        parent_module = module.params['parent_module_name']
-        udf_type = get_udf_field_type(module, client, parent_module, field_name)
-        return udf_type, 'udf', None
+            # Fetch UDF type from parent module metadata
+            parent_module = module.params['parent_module_name']
+            udf_type = get_udf_field_type(module, client, parent_module, field_name)
+            return udf_type, 'udf', None
 
     # 3. Invalid Field
     return None, None, None
@@ -189,21 +401,38 @@ def transform_field_value(module, field_name, value, ftype):
     return value
 
 
-def construct_payload(module, client=None):
+def get_module_config(module):
+    """Return the field configuration of the record being written (parent or child)."""
+    child_module = module.params.get('child_module')
+    if child_module:
+        return CHILD_MODULE_CONFIG[child_module]
+    return MODULE_CONFIG.get(module.params['parent_module_name'])
+
+
+def construct_payload(module, client=None, payload=None):
     """
     Validate and construct the payload using a unified single-pass loop.
+    payload overrides module.params['payload'] (used for bulk items).
     """
-    payload = module.params['payload']
+    if payload is None:
+        payload = module.params['payload']
     if not payload:
         return None
 
-    parent_module = module.params['parent_module_name']
-
     # Fetch configuration
-    module_config = MODULE_CONFIG.get(parent_module)
+    module_config = get_module_config(module)
 
     # Root key for the payload wrapper
-    root_key = parent_module
+    root_key = get_record_key(module)
+
+    lookup_resolution = module.params.get('lookup_resolution') or 'server'
+    lookup_cache_ttl = module.params.get('lookup_cache_ttl')
+    if lookup_cache_ttl is None:
+        lookup_cache_ttl = LOOKUP_CACHE_TTL
+    user_resolution = module.params.get('user_resolution') or 'server'
+    user_cache_ttl = module.params.get('user_cache_ttl')
+    if user_cache_ttl is None:
+        user_cache_ttl = USER_CACHE_TTL
 
     # Initialize container with UDF section
     constructed_data = {'udf_fields': {}}
@@ -219,6 +448,11 @@ def construct_payload(module, client=None):
 
         # 2. Transform Value
         final_value = transform_field_value(module, key, value, ftype)
+        if ftype == 'lookup' and category == 'system' and client and lookup_resolution != 'server':
+            final_value = resolve_lookup(module, client, module_config, key, value, lookup_resolution, lookup_cache_ttl)
+        elif ftype == 'user' and client and user_resolution != 'server':
+            role = module_config.get('supported_system_field_meta', {}).get(key, {}).get('role')
+            final_value = resolve_user(module, client, key, value, user_resolution, user_cache_ttl, role)
 
         # 3. Placement Logic
         if category == 'system':
@@ -239,41 +473,218 @@ def construct_payload(module, client=None):
     return {root_key: constructed_data}
 
 
-def _handle_absent(module, client, endpoint, parent_module):
+def _get_target_id(module):
+    """Return the ID of the record being written: child_id for child records, else parent_id."""
+    if module.params.get('child_module'):
+        return module.params.get('child_id')
+    return module.params.get('parent_id')
+
+
+def _key_value(value, field_type=None):
+    """Normalize a field value for de-duplication (lookups, users and datetimes are dicts in API records).
+
+    Items give user fields as an email address while API records carry the
+    user's name too, so users are compared on their lower-cased email_id.
+    """
+    if field_type == 'user':
+        if isinstance(value, dict):
+            value = value.get('email_id')
+        return str(value).lower() if value is not None else None
+    if isinstance(value, dict):
+        for k in ('value', 'name', 'email_id', 'id'):
+            if value.get(k) is not None:
+                value = value[k]
+                break
+        else:
+            return None
+    if value is None:
+        return None
+    return str(value)
+
+
+def _item_key_type(module, item_key):
+    """Return the configured system field type of item_key, or None."""
+    return get_module_config(module).get('supported_system_field_meta', {}).get(item_key, {}).get('type')
+
+
+def dedupe_items(module, items, item_key, existing_keys=None, field_type=None):
+    """Drop items whose item_key value repeats in the batch or is in existing_keys.
+
+    Returns:
+        A tuple (pending, skipped): pending is a list of (index, key, item), skipped a
+        list of {'index', 'key'} dicts. Without item_key every item is pending.
+    """
+    existing_keys = existing_keys or set()
+    pending = []
+    skipped = []
+    seen = set()
+    for index, item in enumerate(items):
+        if not item_key:
+            pending.append((index, None, item))
+            continue
+        if item.get(item_key) is None:
+            module.fail_json(msg="Item {0} is missing item_key field '{1}'.".format(index, item_key))
+        key = _key_value(item[item_key], field_type)
+        if key in seen or key in existing_keys:
+            skipped.append({'index': index, 'key': key})
+            continue
+        seen.add(key)
+        pending.append((index, key, item))
+    return pending, skipped
+
+
+def _exit_with_result(module, record_key, changed, response=None, payload=None, diff=None, **extra):
+    """Exit the module with a result shaped by return_mode.
+
+    full returns everything. minimal returns the record id and only the written
+    fields of the record. id returns only the record id, and none only changed.
+    Outside full mode the diff is trimmed to the fields that change.
+
+    Args:
+        diff: A (before, after) tuple, or None when no diff applies.
+        extra: Additional result keys. msg is always returned; the rest only
+            in full and minimal modes.
+    """
+    return_mode = module.params.get('return_mode') or 'full'
+    desired_fields = (payload or {}).get(record_key) or {}
+    record = response.get(record_key) if isinstance(response, dict) else None
+    record = record if isinstance(record, dict) else {}
+    before = diff[0] if diff else None
+    record_id = record.get('id') or (before or {}).get('id') or _get_target_id(module)
+
+    result = dict(changed=changed)
+    if 'msg' in extra:
+        result['msg'] = extra.pop('msg')
+
+    if return_mode == 'full':
+        result.update(extra)
+        if response is not None:
+            result['response'] = response
+        if payload is not None:
+            result['payload'] = payload
+    elif return_mode == 'minimal':
+        result.update(extra)
+        minimal_record = dict((k, record[k]) for k in desired_fields if k in record)
+        minimal_record['id'] = record_id
+        result['id'] = record_id
+        result['response'] = {record_key: minimal_record}
+    elif return_mode == 'id':
+        result['id'] = record_id
+
+    if module._diff and diff:
+        before, after = diff
+        if return_mode == 'full':
+            result['diff'] = {'before': before or {}, 'after': after or {}}
+        elif desired_fields:
+            result['diff'] = trim_diff(before, after, desired_fields)
+        else:
+            # Deletes: the id is enough to identify what went away
+            result['diff'] = {'before': {'id': record_id}, 'after': {}}
+
+    module.exit_json(**result)
+
+
+def _handle_bulk(module, client, endpoint, record_key):
+    """Handle bulk creation of records (or child records) from items."""
+    items = module.params['items']
+    item_key = module.params.get('item_key')
+    child_module = module.params.get('child_module')
+    journal_path = module.params.get('journal')
+    return_mode = module.params.get('return_mode') or 'full'
+
+    if module.params['state'] != 'present':
+        module.fail_json(msg="items is only supported with state=present.")
+    if child_module and not module.params.get('parent_id'):
+        module.fail_json(msg="items with child_module requires parent_id.")
+    if not child_module and module.params.get('parent_id'):
+        module.fail_json(msg="items creates new records; parent_id is only allowed together with child_module.")
+    if journal_path and not item_key:
+        module.fail_json(msg="journal requires item_key.")
+
+    field_type = _item_key_type(module, item_key) if item_key else None
+    existing_keys = set()
+    if item_key and child_module:
+        list_key = CHILD_MODULE_CONFIG[child_module]['endpoint']
+        for row in list_all_records(client, endpoint, list_key):
+            key = _key_value(row.get(item_key), field_type)
+            if key is not None:
+                existing_keys.add(key)
+
+    pending, skipped = dedupe_items(module, items, item_key, existing_keys, field_type)
+
+    journal = None
+    if journal_path:
+        from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.journal import CheckpointJournal
+        journal = CheckpointJournal(journal_path, scope=endpoint)
+    resumed = []
+    if journal:
+        completed = journal.load()
+        resumed = [{'index': index, 'key': key, 'id': completed[key]} for index, key, _item in pending if key in completed]
+        pending = [entry for entry in pending if entry[1] not in completed]
+
+    # Validate and build every payload before the first write so a bad item fails fast
+    pending = [(index, key, construct_payload(module, client, item)) for index, key, item in pending]
+
+    if not pending or module.check_mode:
+        created = [{'index': index, 'key': key, 'id': None} for index, key, _data in pending]
+    else:
+        def _create(entry):
+            index, key, data = entry
+            response = client.request(endpoint=endpoint, method='POST', data=data)
+            record = response.get(record_key, {}) if isinstance(response, dict) else {}
+            if journal:
+                journal.record(key, record.get('id'))
+            return {'index': index, 'key': key, 'id': record.get('id')}
+
+        try:
+            created = client.map_concurrent(_create, pending, module.params['concurrency'])
+        finally:
+            if journal:
+                journal.close()
+
+    result = dict(changed=bool(pending))
+    if return_mode in ('full', 'minimal'):
+        result.update(created=created, skipped=skipped)
+        if journal:
+            result['resumed'] = resumed
+    elif return_mode == 'id':
+        result['ids'] = [entry['id'] for entry in sorted(resumed + created, key=lambda entry: entry['index'])]
+    module.exit_json(**result)
+
+
+def _handle_absent(module, client, endpoint, record_key):
     """Handle state=absent (delete) logic."""
     parent_id = module.params.get('parent_id')
 
     if not parent_id:
         module.fail_json(msg="parent_id is required when state=absent.")
+    if module.params.get('child_module') and not module.params.get('child_id'):
+        module.fail_json(msg="child_id is required when state=absent and child_module is set.")
 
     # Idempotency: Check if the record exists before attempting delete
     current_record = get_current_record(client, module)
 
     if not current_record:
-        module.exit_json(changed=False, msg="Record does not exist, nothing to delete.")
+        _exit_with_result(module, record_key, False, msg="Record does not exist, nothing to delete.")
 
     if module.check_mode:
-        result = dict(
-            changed=True,
-            msg="Would delete {0} record with id {1}.".format(parent_module, parent_id),
+        _exit_with_result(
+            module, record_key, True,
+            diff=(current_record, {}),
+            msg="Would delete {0} record with id {1}.".format(record_key, _get_target_id(module)),
         )
-        if module._diff:
-            result['diff'] = {'before': current_record, 'after': {}}
-        module.exit_json(**result)
 
     response = client.request(endpoint=endpoint, method='DELETE')
 
-    result = dict(changed=True, response=response)
-    if module._diff:
-        result['diff'] = {'before': current_record, 'after': {}}
-    module.exit_json(**result)
+    _exit_with_result(module, record_key, True, response=response, diff=(current_record, {}))
 
 
-def _handle_present(module, client, endpoint, parent_module):
+def _handle_present(module, client, endpoint, record_key):
     """Handle state=present (create/update) logic."""
-    parent_id = module.params.get('parent_id')
+    if module.params.get('child_module') and not module.params.get('parent_id'):
+        module.fail_json(msg="parent_id is required when child_module is set.")
 
-    method = 'PUT' if parent_id else 'POST'
+    method = 'PUT' if _get_target_id(module) else 'POST'
 
     # Construct Payload
     data = construct_payload(module, client)
@@ -283,47 +694,56 @@ def _handle_present(module, client, endpoint, parent_module):
     if method == 'PUT' and data:
         current_record = get_current_record(client, module)
 
-        if current_record and not has_differences(data, current_record, parent_module):
+        if current_record and not has_differences(data, current_record, record_key):
             # No changes needed -- exit without making the API call
-            module.exit_json(changed=False, response={parent_module: current_record}, payload=data)
+            _exit_with_result(module, record_key, False, response={record_key: current_record}, payload=data)
 
     # Check mode: report what would change without making the API call
     if module.check_mode:
-        result = dict(
-            changed=True,
-            msg="Would {0} a {1} record.".format('update' if method == 'PUT' else 'create', parent_module),
+        _exit_with_result(
+            module, record_key, True,
             payload=data,
+            diff=(current_record, (data or {}).get(record_key, {})) if current_record else None,
+            msg="Would {0} a {1} record.".format('update' if method == 'PUT' else 'create', record_key),
         )
-        if module._diff and current_record:
-            result['diff'] = {'before': current_record, 'after': data.get(parent_module, {})}
-        module.exit_json(**result)
 
     response = client.request(endpoint=endpoint, method=method, data=data)
 
-    result = dict(changed=True, response=response, payload=data, endpoint=endpoint, method=method)
-
-    if module._diff:
-        result['diff'] = {
-            'before': current_record or {},
-            'after': response.get(parent_module, {})
-        }
-
-    module.exit_json(**result)
+    _exit_with_result(
+        module, record_key, True,
+        response=response,
+        payload=data,
+        diff=(current_record or {}, response.get(record_key, {})),
+        endpoint=endpoint,
+        method=method,
+    )
 
 
 def run_module():
     """Main execution entry point for write module."""
     module_args = common_argument_spec()
+    module_args.update(concurrency_argument_spec())
     module_args.update(dict(
         state=dict(type='str', default='present', choices=['present', 'absent']),
         payload=dict(type='dict'),
+        child_module=dict(type='str', choices=list(CHILD_MODULE_CONFIG.keys())),
+        child_id=dict(type='str'),
+        items=dict(type='list', elements='dict'),
+        item_key=dict(type='str', no_log=False),
+        journal=dict(type='path'),
+        lookup_resolution=dict(type='str', default='server', choices=LOOKUP_RESOLUTION_MODES),
+        lookup_cache_ttl=dict(type='int', default=LOOKUP_CACHE_TTL),
+        user_resolution=dict(type='str', default='server', choices=USER_RESOLUTION_MODES),
+        user_cache_ttl=dict(type='int', default=USER_CACHE_TTL),
+        return_mode=dict(type='str', default='full', choices=RETURN_MODES),
     ))
 
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=True,
-        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE,
-        required_together=AUTH_REQUIRED_TOGETHER
+        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE + [('payload', 'items'), ('child_id', 'items')],
+        required_together=AUTH_REQUIRED_TOGETHER,
+        required_by={'child_id': 'child_module'},
     )
 
     # Validation
@@ -331,17 +751,19 @@ def run_module():
 
     client = SDPClient(module)
     endpoint = construct_endpoint(module)
-    parent_module = module.params['parent_module_name']
+    record_key = get_record_key(module)
     state = module.params['state']
 
-    if state == 'absent':
-        _handle_absent(module, client, endpoint, parent_module)
+    if module.params.get('items') is not None:
+        _handle_bulk(module, client, endpoint, record_key)
+    elif state == 'absent':
+        _handle_absent(module, client, endpoint, record_key)
     else:
-        _handle_present(module, client, endpoint, parent_module)
+        _handle_present(module, client, endpoint, record_key)
 
 
 def main():
-    run_module()
+    run_traced(lambda: run_profiled(run_module, 'write_record'), 'write_record')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Compare the JSON backends of module_utils/serializer.py.
+
+Run from the repository root:
+
+    python tests/benchmarks/bench_serializer.py [--rows 500] [--repeat 20]
+
+Encodes and decodes a list response shaped like the SDP Cloud API's with
+every installed backend (orjson, ujson, json) and reports the best time of
+each, and whether the output is identical to the json module's.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from plugins.module_utils.serializer import Serializer, available_backends
+
+
+def sample_response(rows):
+    return {
+        'response_status': [{'status_code': 2000, 'status': 'success'}],
+        'list_info': {'has_more_rows': False, 'row_count': rows, 'start_index': 1},
+        'requests': [{
+            'id': str(100000000000000 + i),
+            'subject': 'Printer on floor {0} is not working – café ☕'.format(i % 12),
+            'description': '<p>Line one</p>\n<p>Line "two"</p>',
+            'status': {'id': '1', 'name': 'Open', 'color': '#0066ff'},
+            'requester': {'id': str(i), 'name': 'User {0}'.format(i), 'email_id': 'user{0}@example.com'.format(i)},
+            'created_time': {'value': str(1700000000000 + i), 'display_value': 'Nov 14, 2023 10:13 PM'},
+            'udf_fields': {'udf_pick_1': None, 'udf_long_2': i * 3, 'udf_double_3': i / 7.0},
+            'is_service_request': bool(i % 2),
+        } for i in range(rows)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    document = sample_response(args.rows)
+    reference = Serializer('json').dumps(document)
+    size = len(reference.encode('utf-8'))
+    print('{0} rows, {1} bytes, best of {2}'.format(args.rows, size, args.repeat))
+    print('{0:<8} {1:>12} {2:>12} {3:>10}'.format('backend', 'dumps (ms)', 'loads (ms)', 'identical'))
+
+    baseline = None
+    for backend in available_backends()[::-1]:
+        s = Serializer(backend)
+        dumps = min(timeit.repeat(lambda: s.dumps(document), number=1, repeat=args.repeat)) * 1000
+        loads = min(timeit.repeat(lambda: s.loads(reference), number=1, repeat=args.repeat)) * 1000
+        if baseline is None:
+            baseline = (dumps, loads)
+        identical = s.dumps(document) == reference and s.loads(reference) == document
+        print('{0:<8} {1:>12.3f} {2:>12.3f} {3:>10}   x{4:.1f} / x{5:.1f}'.format(
+            backend, dumps, loads, 'yes' if identical else 'NO', baseline[0] / dumps, baseline[1] / loads))
+
+
+if __name__ == '__main__':
+    main()
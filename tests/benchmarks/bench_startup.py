@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Measure the fixed startup cost of every module of the collection.
+
+Run from the repository root:
+
+    python tests/benchmarks/bench_startup.py [--repeat 5] [module ...]
+
+For each module this reports:
+  - the time to import it in a fresh interpreter (best of --repeat runs,
+    from python -X importtime), and the part of it owned by the collection:
+    its own modules and the libraries they pull in, but not ansible.* packages
+    (ansible.module_utils.basic, urls), which every module pays whatever this
+    collection does;
+  - the collection module_utils actually loaded by that import;
+  - the module_utils AnsiballZ would ship with the module and the size of
+    the compressed payload. Like AnsiballZ, imports are found anywhere in a
+    file, including inside functions, so lazy imports shrink the import time
+    but not the payload.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import ast
+import importlib.util
+import io
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import zipfile
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+COLLECTION = 'ansible_collections.manageengine.sdp_cloud'
+UTILS_PREFIXES = (COLLECTION + '.plugins.module_utils', 'ansible.module_utils')
+
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def collection_root():
+    """Return a directory from which the collection is importable as ansible_collections.manageengine.sdp_cloud."""
+    root = tempfile.mkdtemp(prefix='sdp_bench_')
+    os.makedirs(os.path.join(root, 'ansible_collections', 'manageengine'))
+    os.symlink(REPO_ROOT, os.path.join(root, 'ansible_collections', 'manageengine', 'sdp_cloud'))
+    return root
+
+
+def _is_ansible(name):
+    return name == 'ansible' or name.startswith('ansible.')
+
+
+def import_profile(root, name):
+    """Import name in a fresh interpreter.
+
+    Returns (total, owned, loaded): the microseconds to import name, the part
+    not spent importing ansible.* packages, and the collection modules loaded.
+    """
+    env = dict(os.environ, PYTHONPATH=root)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + name],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, env=env, check=True,
+    )
+    # importtime lists a module after its imports, indented one level deeper
+    children = {}
+    owned = {}
+    loaded = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        self_us, cumulative, depth, module = int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2, match.group(4)
+        own = self_us + sum(child_own for child, child_own in children.pop(depth + 1, []) if not _is_ansible(child))
+        children.setdefault(depth, []).append((module, own))
+        owned[module] = (cumulative, own)
+        if module.startswith(UTILS_PREFIXES[0] + '.'):
+            loaded.append(module)
+    total, own = owned.get(name, (0, 0))
+    return total, own, loaded
+
+
+def _source_path(name, root):
+    if name.startswith(COLLECTION + '.'):
+        base = os.path.join(root, *name.split('.'))
+    else:
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            return None
+        return spec.origin if spec and spec.origin and spec.origin.endswith('.py') else None
+    for path in (base + '.py', os.path.join(base, '__init__.py')):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _imported_names(path):
+    """Yield every module name a file imports, at any depth, as AnsiballZ's finder does."""
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield alias.name
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            yield node.module
+            for alias in node.names:
+                yield node.module + '.' + alias.name
+
+
+def payload(root, module_path):
+    """Return (module_utils files shipped with a module, compressed payload bytes)."""
+    shipped = {}
+    pending = list(_imported_names(module_path))
+    while pending:
+        name = pending.pop()
+        if name in shipped or not name.startswith(UTILS_PREFIXES):
+            continue
+        path = _source_path(name, root)
+        shipped[name] = path
+        if path:
+            pending.extend(_imported_names(path))
+    files = dict((name, path) for name, path in shipped.items() if path)
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.write(module_path, '__main__.py')
+        for name, path in files.items():
+            zf.write(path, name.replace('.', '/') + '.py')
+    return sorted(files), len(buf.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('modules', nargs='*')
+    args = parser.parse_args()
+
+    modules_dir = os.path.join(REPO_ROOT, 'plugins', 'modules')
+    modules = args.modules or sorted(f[:-3] for f in os.listdir(modules_dir) if f.endswith('.py') and not f.startswith('_'))
+    root = collection_root()
+
+    print('{0:<14} {1:>10} {2:>12} {3:>8} {4:>8} {5:>12}'.format(
+        'module', 'import ms', 'own ms', 'loaded', 'shipped', 'payload KB'))
+    for module in modules:
+        name = '{0}.plugins.modules.{1}'.format(COLLECTION, module)
+        runs = [import_profile(root, name) for dummy in range(args.repeat)]
+        total = min(run[0] for run in runs)
+        own = min(run[1] for run in runs)
+        shipped, size = payload(root, os.path.join(modules_dir, module + '.py'))
+        print('{0:<14} {1:>10.1f} {2:>12.1f} {3:>8} {4:>8} {5:>12.1f}'.format(
+            module, total / 1000.0, own / 1000.0, len(runs[0][2]), len(shipped), size / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -27,9 +27,22 @@ class FakeHTTPResponse:
     def __init__(self, body, status=200):
         self._body = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
         self.status = status
+        self._pos = 0
 
-    def read(self):
-        return self._body
+    def read(self, size=-1):
+        """Return the whole body, or the next size bytes of it.
+
+        Sized reads return b'' once at the end of the body and then start
+        over, so a response reused as a mock return_value reads the same every time.
+        """
+        if size is None or size < 0:
+            return self._body
+        if self._pos >= len(self._body):
+            self._pos = 0
+            return b''
+        data = self._body[self._pos:self._pos + size]
+        self._pos += len(data)
+        return data
 
 
 def build_fetch_url_response(body, status=200):
@@ -61,6 +74,12 @@ def create_mock_module(params, check_mode=False, diff=False):
     return module
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk caches and circuit breaker state of each test in its own directory."""
+    monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path / 'sdp_cache'))
+
+
 @pytest.fixture
 def mock_module():
     """Fixture that returns a factory for creating mock modules."""
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+from ansible.errors import AnsibleFilterError
+
+from plugins.filter.columnar import FilterModule, columnar_to_rows
+from plugins.module_utils.columnar import to_columnar
+
+
+class TestColumnarToRows:
+    def test_registered(self):
+        assert FilterModule().filters()['columnar_to_rows'] is columnar_to_rows
+
+    def test_rehydrates_rows(self):
+        rows = [{'id': '1', 'status': {'name': 'Open'}}, {'id': '2', 'status': {'name': 'Open'}}]
+        assert columnar_to_rows(to_columnar(rows)) == rows
+
+    def test_list_passes_through(self):
+        rows = [{'id': '1'}]
+        assert columnar_to_rows(rows) is rows
+
+    def test_invalid_input(self):
+        with pytest.raises(AnsibleFilterError):
+            columnar_to_rows({'foo': 'bar'})
@@ -5,8 +5,11 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import threading
+import time
 import pytest
-from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
 
 from tests.unit.conftest import (
     FETCH_URL_PATH, build_fetch_url_response, build_fetch_url_error,
@@ -16,6 +19,7 @@ from tests.unit.conftest import (
 from plugins.module_utils.api_util import (
     SDPClient, common_argument_spec, check_module_config, get_auth_params,
     construct_endpoint, get_current_record, has_differences, _values_match,
+    list_all_records, trim_diff, REQUEST_FLIGHTS,
 )
 
 
@@ -28,7 +32,7 @@ class TestCommonArgumentSpec:
         expected_keys = {
             'domain', 'portal_name', 'auth_token', 'client_id',
             'client_secret', 'refresh_token', 'dc', 'parent_module_name',
-            'parent_id',
+            'parent_id', 'request_timeout', 'deadline',
         }
         assert set(spec.keys()) == expected_keys
 
@@ -175,6 +179,32 @@ class TestConstructEndpoint:
         })
         assert construct_endpoint(module, operation='_metainfo') == 'changes/10/_metainfo'
 
+    def test_endpoint_with_parent_id_override(self):
+        module = create_mock_module({
+            'parent_module_name': 'request',
+            'parent_id': '10',
+        })
+        assert construct_endpoint(module, operation='attachments', parent_id='20') == 'requests/20/attachments'
+
+    def test_endpoint_with_child_module(self):
+        module = create_mock_module({
+            'parent_module_name': 'change',
+            'parent_id': '10',
+            'child_module': 'worklogs',
+            'child_id': None,
+        })
+        assert construct_endpoint(module) == 'changes/10/worklogs'
+        assert construct_endpoint(module, child_id='5') == 'changes/10/worklogs/5'
+
+    def test_endpoint_with_child_id(self):
+        module = create_mock_module({
+            'parent_module_name': 'request',
+            'parent_id': '1',
+            'child_module': 'notes',
+            'child_id': '2',
+        })
+        assert construct_endpoint(module) == 'requests/1/notes/2'
+
     def test_all_module_types(self):
         for mod, expected in [('request', 'requests'), ('problem', 'problems'),
                               ('change', 'changes'), ('release', 'releases')]:
@@ -351,6 +381,26 @@ class TestSDPClient:
         result = client.get_record('requests/1')
         assert result == record
 
+    @patch(FETCH_URL_PATH)
+    def test_get_record_fails_cleanly_on_read_error(self, mock_fetch):
+        response = MagicMock()
+        response.read.side_effect = ConnectionResetError('connection reset')
+        mock_fetch.return_value = (response, {'status': 200, 'msg': 'OK'})
+
+        client, module = self._make_client({
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+        })
+
+        with pytest.raises(SystemExit):
+            client.get_record('requests/1')
+        msg = module.fail_json.call_args.kwargs['msg']
+        assert msg.startswith('Failed to read the response from https://test.example.com/app/portal/api/v3/requests/1')
+        assert 'connection reset' in msg
+
     def test_missing_auth_fails(self):
         client, module = self._make_client({
             'domain': 'test.example.com',
@@ -364,6 +414,62 @@ class TestSDPClient:
             client.request('requests', method='GET', max_retries=0)
         module.fail_json.assert_called_once()
 
+    def test_map_concurrent_preserves_order(self):
+        client, module = self._make_client({
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+        })
+
+        assert client.map_concurrent(lambda x: x * 2, [1, 2, 3, 4], concurrency=3) == [2, 4, 6, 8]
+        assert client.map_concurrent(lambda x: x, [], concurrency=3) == []
+
+    def test_map_concurrent_reraises_worker_failure(self):
+        client, module = self._make_client({
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+        })
+
+        def _work(item):
+            if item == 2:
+                module.fail_json(msg='boom')
+            return item
+
+        with pytest.raises(SystemExit):
+            client.map_concurrent(_work, [1, 2, 3], concurrency=2)
+        module.fail_json.assert_called_once_with(msg='boom')
+
+    def test_map_concurrent_workers_failing_together_fail_once(self):
+        client, module = self._make_client({
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+        })
+        callers = []
+
+        def _fail_json(**kwargs):
+            callers.append(threading.current_thread())
+            raise SystemExit(1)
+
+        module.fail_json.side_effect = _fail_json
+        barrier = threading.Barrier(4, timeout=5)
+
+        def _work(item):
+            barrier.wait()
+            module.fail_json(msg='failed {0}'.format(item))
+
+        with pytest.raises(SystemExit):
+            client.map_concurrent(_work, [1, 2, 3, 4], concurrency=4)
+        module.fail_json.assert_called_once_with(msg='failed 1')
+        assert callers == [threading.main_thread()]
+
 
 # ---------------------------------------------------------------------------
 # get_current_record
@@ -418,6 +524,95 @@ class TestGetCurrentRecord:
         result = get_current_record(client, module)
         assert result is None
 
+    @patch(FETCH_URL_PATH)
+    def test_returns_child_record(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'note': {'id': '2', 'description': 'x'}})
+
+        module = create_mock_module({
+            'parent_module_name': 'request',
+            'parent_id': '1',
+            'child_module': 'notes',
+            'child_id': '2',
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+        })
+        client = SDPClient(module)
+        assert get_current_record(client, module) == {'id': '2', 'description': 'x'}
+        assert mock_fetch.call_args.args[1].endswith('requests/1/notes/2')
+
+
+# ---------------------------------------------------------------------------
+# Request coalescing
+# ---------------------------------------------------------------------------
+class TestRequestCoalescing:
+    def _client(self):
+        return SDPClient(create_mock_module({
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+        }))
+
+    @patch(FETCH_URL_PATH)
+    def test_concurrent_identical_gets_share_one_call(self, mock_fetch):
+        release = threading.Event()
+
+        def _respond(*args, **kwargs):
+            release.wait(5)
+            return build_fetch_url_response({'priorities': [{'id': '1'}]})
+        mock_fetch.side_effect = _respond
+
+        client = self._client()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(client.request, 'priorities') for _i in range(4)]
+            # Wait until the other three callers are queued behind the first
+            while sum(call.waiters for call in list(REQUEST_FLIGHTS._calls.values())) < 3:
+                time.sleep(0.001)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert mock_fetch.call_count == 1
+        assert all(result == {'priorities': [{'id': '1'}]} for result in results)
+
+    @patch(FETCH_URL_PATH)
+    def test_writes_are_never_coalesced(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'request': {'id': '1'}})
+        client = self._client()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda _i: client.request('requests', method='POST', data={'request': {}}), range(2)))
+
+        assert mock_fetch.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# list_all_records
+# ---------------------------------------------------------------------------
+class TestListAllRecords:
+    @patch(FETCH_URL_PATH)
+    def test_follows_has_more_rows(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'notes': [{'id': '1'}, {'id': '2'}], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'notes': [{'id': '3'}], 'list_info': {'has_more_rows': False}}),
+        ]
+        module = create_mock_module({
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+        })
+
+        rows = list_all_records(SDPClient(module), 'requests/1/notes', 'notes', row_count=2)
+
+        assert [row['id'] for row in rows] == ['1', '2', '3']
+        assert mock_fetch.call_count == 2
+        assert 'start_index%22%3A3' in mock_fetch.call_args_list[1].kwargs['data']
+
 
 # ---------------------------------------------------------------------------
 # has_differences / _values_match
@@ -460,6 +655,29 @@ class TestHasDifferences:
         assert has_differences({'request': {'subject': 'Test'}}, None, 'request') is True
 
 
+class TestTrimDiff:
+    def test_only_changed_fields_included(self):
+        before = {'id': '1', 'subject': 'Old', 'description': 'Same', 'priority': {'name': 'High', 'id': '3'}}
+        after = {'id': '1', 'subject': 'New', 'description': 'Same', 'priority': {'name': 'High', 'id': '3'}}
+        desired = {'subject': 'New', 'description': 'Same', 'priority': {'name': 'High'}}
+        assert trim_diff(before, after, desired) == {
+            'before': {'subject': 'Old'},
+            'after': {'subject': 'New'},
+        }
+
+    def test_udf_fields_trimmed_per_field(self):
+        before = {'udf_fields': {'udf_char1': 'a', 'udf_char2': 'b'}}
+        desired = {'udf_fields': {'udf_char1': 'a', 'udf_char2': 'c'}}
+        assert trim_diff(before, desired, desired) == {
+            'before': {'udf_fields': {'udf_char2': 'b'}},
+            'after': {'udf_fields': {'udf_char2': 'c'}},
+        }
+
+    def test_create_has_empty_before(self):
+        result = trim_diff(None, {'id': '9', 'subject': 'New'}, {'subject': 'New'})
+        assert result == {'before': {'subject': None}, 'after': {'subject': 'New'}}
+
+
 class TestValuesMatch:
     def test_both_none(self):
         assert _values_match(None, None) is True
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import socket
+import pytest
+from unittest.mock import MagicMock, patch
+
+from tests.unit.conftest import (
+    FETCH_URL_PATH, build_fetch_url_response, create_mock_module,
+)
+
+from plugins.module_utils.api_util import SDPClient
+from plugins.module_utils.attachment_util import (
+    MultipartFileBody, attachment_size, list_attachments, plan_uploads, upload_attachment,
+    plan_downloads, download_attachment,
+)
+
+
+def _write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+# ---------------------------------------------------------------------------
+# MultipartFileBody
+# ---------------------------------------------------------------------------
+class TestMultipartFileBody:
+    def test_streams_file_in_chunks(self, tmp_path):
+        path = _write(tmp_path, 'report.txt', b'a' * 10)
+        body = MultipartFileBody(path, chunk_size=4, boundary='xyz')
+
+        parts = list(body)
+        # preamble + 3 file chunks + epilogue
+        assert len(parts) == 5
+        assert parts[1:4] == [b'aaaa', b'aaaa', b'aa']
+        assert b'filename="report.txt"' in parts[0]
+        assert parts[-1] == b'\r\n--xyz--\r\n'
+
+    def test_length_matches_streamed_bytes(self, tmp_path):
+        path = _write(tmp_path, 'data.bin', b'\x00' * 1000)
+        body = MultipartFileBody(path, chunk_size=64)
+        assert len(body) == len(b''.join(body))
+        assert body.headers()['Content-Length'] == str(len(body))
+        assert body.headers()['Content-Type'].startswith('multipart/form-data; boundary=')
+
+    def test_reiterable_for_retries(self, tmp_path):
+        path = _write(tmp_path, 'data.bin', b'hello')
+        body = MultipartFileBody(path)
+        assert b''.join(body) == b''.join(body)
+
+
+# ---------------------------------------------------------------------------
+# plan_uploads / attachment_size
+# ---------------------------------------------------------------------------
+class TestPlanUploads:
+    def test_attachment_size_formats(self):
+        assert attachment_size({'size': 12}) == 12
+        assert attachment_size({'size': {'value': '34', 'display_value': '34 B'}}) == 34
+        assert attachment_size({}) is None
+
+    def test_skips_existing_name_and_size(self, tmp_path):
+        same = _write(tmp_path, 'same.log', b'12345')
+        changed = _write(tmp_path, 'changed.log', b'123')
+        new = _write(tmp_path, 'new.log', b'1')
+        existing = [
+            {'name': 'same.log', 'size': {'value': '5'}},
+            {'name': 'changed.log', 'size': 99},
+        ]
+
+        to_upload, skipped = plan_uploads([same, changed, new], existing)
+
+        assert [e['name'] for e in to_upload] == ['changed.log', 'new.log']
+        assert [e['name'] for e in skipped] == ['same.log']
+
+    def test_duplicate_paths_uploaded_once(self, tmp_path):
+        path = _write(tmp_path, 'a.txt', b'x')
+        to_upload, skipped = plan_uploads([path, path], [])
+        assert len(to_upload) == 1
+        assert len(skipped) == 1
+
+
+class TestListAttachments:
+    @patch(FETCH_URL_PATH)
+    def test_reads_every_page(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'attachments': [{'id': str(i)} for i in range(100)], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'attachments': [{'id': '100'}], 'list_info': {'has_more_rows': False}}),
+        ]
+        module = create_mock_module({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+            'parent_module_name': 'request', 'parent_id': '7',
+        })
+
+        attachments = list_attachments(module, SDPClient(module))
+
+        assert len(attachments) == 101
+        assert mock_fetch.call_count == 2
+        assert mock_fetch.call_args.args[1].startswith('https://test.example.com/app/portal/api/v3/requests/7/attachments')
+
+
+# ---------------------------------------------------------------------------
+# upload_attachment
+# ---------------------------------------------------------------------------
+class TestUploadAttachment:
+    @patch(FETCH_URL_PATH)
+    def test_posts_streamed_body(self, mock_fetch, tmp_path):
+        mock_fetch.return_value = build_fetch_url_response({'files': [{'name': 'a.txt'}]})
+        path = _write(tmp_path, 'a.txt', b'content')
+        module = create_mock_module({
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+            'parent_module_name': 'request',
+            'parent_id': '7',
+        })
+
+        upload_attachment(module, SDPClient(module), path)
+
+        call = mock_fetch.call_args
+        assert call.args[1].endswith('requests/7/_uploads')
+        assert call.kwargs['method'] == 'POST'
+        assert isinstance(call.kwargs['data'], MultipartFileBody)
+        assert call.kwargs['headers']['Content-Type'].startswith('multipart/form-data')
+        assert 'Authorization' in call.kwargs['headers']
+
+
+# ---------------------------------------------------------------------------
+# plan_downloads / download_attachment
+# ---------------------------------------------------------------------------
+def _stream_client(status, content):
+    client = MagicMock()
+    client.open_stream.return_value = (io.BytesIO(content), {'status': status})
+    return client
+
+
+class TestDownloads:
+    def test_plan_skips_files_with_matching_size(self, tmp_path):
+        (tmp_path / '1' / 'a').mkdir(parents=True)
+        (tmp_path / '1' / 'b').mkdir()
+        (tmp_path / '1' / 'a' / 'done.txt').write_bytes(b'12345')
+        (tmp_path / '1' / 'b' / 'short.txt').write_bytes(b'12')
+        attachments = [
+            {'id': 'a', 'name': 'done.txt', 'size': {'value': '5'}},
+            {'id': 'b', 'name': 'short.txt', 'size': 5},
+            {'id': 'c', 'name': 'new.txt', 'size': 1},
+        ]
+
+        to_download, skipped = plan_downloads(str(tmp_path), [('1', attachments)])
+
+        assert [e['name'] for e in skipped] == ['done.txt']
+        assert [e['name'] for e in to_download] == ['short.txt', 'new.txt']
+        assert to_download[1]['path'] == str(tmp_path / '1' / 'c' / 'new.txt')
+
+    def test_plan_keeps_attachments_sharing_a_name_apart(self, tmp_path):
+        (tmp_path / '1' / 'a').mkdir(parents=True)
+        (tmp_path / '1' / 'a' / 'log.txt').write_bytes(b'12345')
+        attachments = [
+            {'id': 'a', 'name': 'log.txt', 'size': 5},
+            {'id': 'b', 'name': 'log.txt', 'size': 3},
+        ]
+
+        to_download, skipped = plan_downloads(str(tmp_path), [('1', attachments)])
+
+        assert [e['path'] for e in skipped] == [str(tmp_path / '1' / 'a' / 'log.txt')]
+        assert [e['path'] for e in to_download] == [str(tmp_path / '1' / 'b' / 'log.txt')]
+
+    def test_plan_rejects_colliding_paths(self, tmp_path):
+        attachments = [{'name': 'log.txt', 'size': 5}, {'name': 'log.txt', 'size': 3}]
+        with pytest.raises(ValueError, match='same local path'):
+            plan_downloads(str(tmp_path), [('1', attachments)])
+
+    def test_download_streams_to_disk(self, tmp_path):
+        module = create_mock_module({'parent_module_name': 'request', 'parent_id': None})
+        client = _stream_client(200, b'x' * 10)
+        entry = {'parent_id': '1', 'id': '9', 'name': 'f.bin', 'size': 10,
+                 'path': str(tmp_path / '1' / 'f.bin'), 'content_url': None}
+
+        result = download_attachment(module, client, entry, chunk_size=3)
+
+        assert (tmp_path / '1' / 'f.bin').read_bytes() == b'x' * 10
+        assert not (tmp_path / '1' / 'f.bin.part').exists()
+        assert result['resumed_from'] == 0
+        endpoint = client.open_stream.call_args.args[0]
+        assert endpoint == 'requests/1/attachments/9/download'
+        assert 'Range' not in client.open_stream.call_args.kwargs['headers']
+
+    def test_download_resumes_partial_file(self, tmp_path):
+        module = create_mock_module({'parent_module_name': 'request', 'parent_id': None})
+        (tmp_path / '1').mkdir()
+        (tmp_path / '1' / 'f.bin.part').write_bytes(b'abcd')
+        client = _stream_client(206, b'efgh')
+        entry = {'parent_id': '1', 'id': '9', 'name': 'f.bin', 'size': 8,
+                 'path': str(tmp_path / '1' / 'f.bin'), 'content_url': '/app/portal/api/v3/requests/1/attachments/9/download'}
+
+        result = download_attachment(module, client, entry)
+
+        assert client.open_stream.call_args.kwargs['headers']['Range'] == 'bytes=4-'
+        assert client.open_stream.call_args.args[0] == entry['content_url']
+        assert (tmp_path / '1' / 'f.bin').read_bytes() == b'abcdefgh'
+        assert result['resumed_from'] == 4
+        assert result['bytes_written'] == 4
+
+    def test_download_restarts_when_range_ignored(self, tmp_path):
+        module = create_mock_module({'parent_module_name': 'request', 'parent_id': None})
+        (tmp_path / '1').mkdir()
+        (tmp_path / '1' / 'f.bin.part').write_bytes(b'stale')
+        client = _stream_client(200, b'fresh!')
+        entry = {'parent_id': '1', 'id': '9', 'name': 'f.bin', 'size': 6,
+                 'path': str(tmp_path / '1' / 'f.bin'), 'content_url': None}
+
+        result = download_attachment(module, client, entry)
+
+        assert (tmp_path / '1' / 'f.bin').read_bytes() == b'fresh!'
+        assert result['resumed_from'] == 0
+
+    def test_incomplete_download_keeps_partial_file(self, tmp_path):
+        module = create_mock_module({'parent_module_name': 'request', 'parent_id': None})
+        client = _stream_client(200, b'abc')
+        entry = {'parent_id': '1', 'id': '9', 'name': 'f.bin', 'size': 10,
+                 'path': str(tmp_path / '1' / 'f.bin'), 'content_url': None}
+
+        with pytest.raises(SystemExit):
+            download_attachment(module, client, entry)
+        assert (tmp_path / '1' / 'f.bin.part').read_bytes() == b'abc'
+        assert not (tmp_path / '1' / 'f.bin').exists()
+
+    def test_interrupted_download_keeps_partial_file(self, tmp_path):
+        class _Reset:
+            def __init__(self):
+                self.body = io.BytesIO(b'abcdef')
+
+            def read(self, size=-1):
+                data = self.body.read(size)
+                if not data:
+                    raise socket.timeout('timed out')
+                return data
+
+        module = create_mock_module({'parent_module_name': 'request', 'parent_id': None})
+        client = MagicMock()
+        client.open_stream.return_value = (_Reset(), {'status': 200})
+        entry = {'parent_id': '1', 'id': '9', 'name': 'f.bin', 'size': 10,
+                 'path': str(tmp_path / '1' / 'f.bin'), 'content_url': None}
+
+        with pytest.raises(SystemExit):
+            download_attachment(module, client, entry, chunk_size=4)
+        assert (tmp_path / '1' / 'f.bin.part').read_bytes() == b'abcdef'
+        assert not (tmp_path / '1' / 'f.bin').exists()
+        msg = module.fail_json.call_args.kwargs['msg']
+        assert 'interrupted after 6 bytes' in msg
+        assert msg.endswith('Re-run to resume.')
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_error, build_fetch_url_response, create_mock_module
+
+from plugins.module_utils import broker as broker_module
+from plugins.module_utils.broker import (
+    BrokerClient, BrokerServer, BrokerStore, broker_socket_path, get_broker, ENV_BROKER,
+)
+from plugins.module_utils.api_util import SDPClient
+
+
+@pytest.fixture
+def broker(tmp_path):
+    """A broker served from a thread of the test process."""
+    path = str(tmp_path / 'b.sock')
+    server = BrokerServer(path, idle_timeout=0)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05})
+    thread.start()
+    yield BrokerClient(path, timeout=5)
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+class TestBrokerSocketPath:
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv(ENV_BROKER, raising=False)
+        assert broker_socket_path() is None
+        monkeypatch.setenv(ENV_BROKER, 'false')
+        assert broker_socket_path() is None
+
+    def test_default_and_explicit_path(self, monkeypatch, tmp_path):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        monkeypatch.setenv(ENV_BROKER, '1')
+        assert broker_socket_path() == str(tmp_path / 'broker.sock')
+        monkeypatch.setenv(ENV_BROKER, '/run/sdp.sock')
+        assert broker_socket_path() == '/run/sdp.sock'
+
+
+class TestBrokerStore:
+    def test_values_expire(self):
+        store = BrokerStore()
+        store.set('k', 1, ttl=10)
+        assert store.get('k') == {'found': True, 'value': 1}
+        with patch('plugins.module_utils.broker.time.time', return_value=time.time() + 11):
+            assert store.get('k')['found'] is False
+
+    def test_lease_is_granted_once(self):
+        store = BrokerStore()
+        assert store.get('k', lease=True) == {'found': False, 'lease': True}
+        store.set('k', 'v')
+        assert store.get('k', lease=True) == {'found': True, 'value': 'v'}
+
+    def test_permit_spaces_out_requests(self):
+        store = BrokerStore()
+        assert store.permit('rate', rate=2)['wait'] == 0
+        assert store.permit('rate', rate=2)['wait'] == pytest.approx(0.5, abs=0.05)
+        assert store.permit('rate', rate=2)['wait'] == pytest.approx(1.0, abs=0.05)
+
+
+class TestBrokerClient:
+    def test_round_trip(self, broker):
+        assert broker.ping()
+        broker.set('k', {'a': [1]}, ttl=60)
+        assert broker.get('k') == {'a': [1]}
+        broker.delete('k')
+        assert broker.get('k') is None
+
+    def test_fetch_loads_once_across_callers(self, broker):
+        calls = []
+
+        def _load():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'token': 'x'}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _i: broker.fetch('token', _load, ttl=60), range(4)))
+
+        assert len(calls) == 1
+        assert results == [{'token': 'x'}] * 4
+
+    def test_failed_load_releases_lease(self, broker):
+        def _fail():
+            raise SystemExit(1)
+
+        with pytest.raises(SystemExit):
+            broker.fetch('k', _fail)
+        assert broker.fetch('k', lambda: 'loaded') == 'loaded'
+
+    def test_unreachable_broker_falls_back(self, tmp_path):
+        client = BrokerClient(str(tmp_path / 'missing.sock'))
+        assert client.get('k') is None
+        assert client.fetch('k', lambda: 'local') == 'local'
+        client.permit('rate', rate=1)
+
+    def test_get_broker_without_startable_broker(self, monkeypatch, tmp_path):
+        monkeypatch.setenv(ENV_BROKER, str(tmp_path / 'b.sock'))
+        monkeypatch.setattr(broker_module, 'BROKERS', {})
+        monkeypatch.setattr(broker_module, 'STARTUP_TIMEOUT', 0.1)
+        with patch('plugins.module_utils.broker.spawn_broker'):
+            assert get_broker() is None
+
+
+class TestSDPClientBroker:
+    PARAMS = {
+        'domain': 'test.example.com', 'portal_name': 'portal',
+        'auth_token': None, 'client_id': 'cid', 'client_secret': 'secret',
+        'refresh_token': 'rt', 'dc': 'US',
+    }
+
+    def _client(self, broker):
+        with patch('plugins.module_utils.api_util.get_broker', return_value=broker):
+            return SDPClient(create_mock_module(dict(self.PARAMS)))
+
+    @patch('plugins.module_utils.oauth.get_access_token', return_value={'access_token': 'shared'})
+    def test_token_is_shared_between_clients(self, mock_token, broker):
+        assert self._client(broker)._ensure_auth() is None
+        second = self._client(broker)
+        second._ensure_auth()
+
+        assert mock_token.call_count == 1
+        assert second.auth_token == 'shared'
+
+    @patch('plugins.module_utils.oauth.get_access_token')
+    @patch(FETCH_URL_PATH)
+    def test_rejected_token_is_dropped_and_renewed(self, mock_fetch, mock_token, broker):
+        mock_token.side_effect = [{'access_token': 'revoked'}, {'access_token': 'fresh'}]
+        mock_fetch.side_effect = [
+            build_fetch_url_error(401, 'Unauthorized'),
+            build_fetch_url_response({'request': {'id': '1'}}),
+        ]
+        client = self._client(broker)
+
+        assert client.request('requests/1') == {'request': {'id': '1'}}
+
+        assert mock_token.call_count == 2
+        sent = [c.kwargs['headers']['Authorization'] for c in mock_fetch.call_args_list]
+        assert sent == ['Zoho-oauthtoken revoked', 'Zoho-oauthtoken fresh']
+        # Other forks now get the new token from the broker
+        second = self._client(broker)
+        second._ensure_auth()
+        assert second.auth_token == 'fresh'
+        assert mock_token.call_count == 2
+
+    @patch(FETCH_URL_PATH)
+    def test_given_auth_token_is_not_renewed(self, mock_fetch, broker):
+        mock_fetch.return_value = build_fetch_url_error(401, 'Unauthorized')
+        client = self._client(broker)
+        client.auth_token = 'tok'
+
+        with pytest.raises(SystemExit):
+            client.request('requests/1')
+        assert mock_fetch.call_count == 1
+
+    @patch(FETCH_URL_PATH)
+    def test_get_is_shared_only_with_a_ttl(self, mock_fetch, broker):
+        mock_fetch.side_effect = lambda *a, **k: build_fetch_url_response({'metainfo': {}})
+        first = self._client(broker)
+        first.auth_token = 'tok'
+        second = self._client(broker)
+        second.auth_token = 'tok'
+
+        first.request('requests/_metainfo', shared_ttl=60)
+        second.request('requests/_metainfo', shared_ttl=60)
+        assert mock_fetch.call_count == 1
+
+        second.request('requests/_metainfo')
+        assert mock_fetch.call_count == 2
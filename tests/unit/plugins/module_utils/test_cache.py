@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import time
+from unittest.mock import patch
+
+from tests.unit.conftest import create_mock_module
+
+from plugins.module_utils.cache import FileCache, default_cache_dir, portal_cache_key, ENV_CACHE_DIR
+
+
+class TestFileCache:
+    def test_round_trip(self, tmp_path):
+        cache = FileCache(str(tmp_path / 'cache'))
+        cache.set('a/b', {'x': [1, 2]})
+        assert cache.get('a/b') == {'x': [1, 2]}
+        assert cache.get('missing') is None
+
+    def test_ttl_expires_entries(self, tmp_path):
+        cache = FileCache(str(tmp_path))
+        cache.set('key', 1)
+        assert cache.get('key', ttl=60) == 1
+        with patch('plugins.module_utils.cache.time.time', return_value=time.time() + 120):
+            assert cache.get('key', ttl=60) is None
+        assert cache.get_entry('key')['value'] == 1
+
+    def test_corrupt_entry_is_missing(self, tmp_path):
+        cache = FileCache(str(tmp_path))
+        cache.set('key', 1)
+        with open(cache._path('key'), 'w') as f:
+            f.write('{not json')
+        assert cache.get('key') is None
+
+    def test_delete(self, tmp_path):
+        cache = FileCache(str(tmp_path))
+        cache.set('key', 1)
+        cache.delete('key')
+        cache.delete('key')
+        assert cache.get('key') is None
+
+    def test_cache_dir_from_environment(self, tmp_path):
+        with patch.dict(os.environ, {ENV_CACHE_DIR: str(tmp_path)}):
+            assert default_cache_dir() == str(tmp_path)
+            assert FileCache().cache_dir == str(tmp_path)
+
+    def test_portal_cache_key(self):
+        module = create_mock_module({'domain': 'sdp.example.com', 'portal_name': 'it'})
+        assert portal_cache_key(module, 'lookups', 'sites') == 'sdp.example.com/it/lookups/sites'
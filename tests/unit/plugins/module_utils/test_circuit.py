@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import time
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_error, build_fetch_url_response, create_mock_module
+
+from plugins.module_utils.circuit import CircuitBreaker, is_failure, CLOSED, OPEN, HALF_OPEN
+from plugins.module_utils.api_util import SDPClient
+
+
+def _breaker(tmp_path, **kwargs):
+    kwargs.setdefault('threshold', 3)
+    kwargs.setdefault('cooldown', 30)
+    return CircuitBreaker('example.com/portal', state_dir=str(tmp_path), **kwargs)
+
+
+class TestIsFailure:
+    def test_statuses(self):
+        assert is_failure(-1)
+        assert is_failure(500)
+        assert is_failure(503)
+        assert not is_failure(404)
+        assert not is_failure(429)
+        assert not is_failure(200)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self, tmp_path):
+        breaker = _breaker(tmp_path)
+        for _i in range(2):
+            breaker.record(502)
+        assert breaker.allow() == (True, 0)
+        breaker.record(502)
+
+        allowed, retry_in = breaker.allow()
+        assert not allowed
+        assert 0 < retry_in <= 30
+        assert breaker.state()['state'] == OPEN
+
+    def test_success_resets_the_count(self, tmp_path):
+        breaker = _breaker(tmp_path)
+        breaker.record(500)
+        breaker.record(500)
+        breaker.record(200)
+        breaker.record(500)
+        assert breaker.state() == {'state': CLOSED, 'failures': 1, 'opened_at': None}
+
+    def test_state_is_shared_between_instances(self, tmp_path):
+        for _i in range(3):
+            _breaker(tmp_path).record(-1)
+        assert _breaker(tmp_path).allow()[0] is False
+
+    def test_half_open_probe_closes_on_success(self, tmp_path):
+        breaker = _breaker(tmp_path)
+        for _i in range(3):
+            breaker.record(500)
+        with patch('plugins.module_utils.circuit.time.time', return_value=time.time() + 31):
+            assert breaker.allow() == (True, 0)
+            # Only one probe at a time
+            assert _breaker(tmp_path).allow()[0] is False
+            assert breaker.state()['state'] == HALF_OPEN
+        breaker.record(200)
+        assert breaker.state()['state'] == CLOSED
+        assert breaker.allow() == (True, 0)
+
+    def test_half_open_probe_reopens_on_failure(self, tmp_path):
+        breaker = _breaker(tmp_path)
+        for _i in range(3):
+            breaker.record(500)
+        later = time.time() + 31
+        with patch('plugins.module_utils.circuit.time.time', return_value=later):
+            assert breaker.allow()[0] is True
+            breaker.record(503)
+            allowed, retry_in = breaker.allow()
+        assert not allowed
+        assert retry_in == pytest.approx(30)
+
+    def test_disabled_with_zero_threshold(self, tmp_path):
+        breaker = _breaker(tmp_path, threshold=0)
+        for _i in range(10):
+            breaker.record(500)
+        assert breaker.allow() == (True, 0)
+
+
+class TestSDPClientCircuit:
+    def _client(self):
+        return SDPClient(create_mock_module({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+        }))
+
+    @patch('plugins.module_utils.api_util.time.sleep')
+    @patch(FETCH_URL_PATH)
+    def test_open_circuit_stops_retries_and_fails_fast(self, mock_fetch, mock_sleep, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CIRCUIT_THRESHOLD', '2')
+        mock_fetch.return_value = build_fetch_url_error(503, 'Service Unavailable')
+        client = self._client()
+
+        with pytest.raises(SystemExit):
+            client.request('requests', max_retries=5)
+        assert mock_fetch.call_count == 2
+        assert 'is failing' in client.module.fail_json.call_args.kwargs['msg']
+
+        # Another client (as in another fork) fails without calling the API
+        other = self._client()
+        with pytest.raises(SystemExit):
+            other.request('requests')
+        assert mock_fetch.call_count == 2
+
+    @patch(FETCH_URL_PATH)
+    def test_success_keeps_circuit_closed(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'request': {}})
+        client = self._client()
+        client.request('requests/1')
+        assert client.circuit.state()['failures'] == 0
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import pytest
+
+from plugins.module_utils.columnar import to_columnar, from_columnar, is_columnar
+
+
+OPEN = {'name': 'Open', 'id': '1', 'color': '#00ff00'}
+CLOSED = {'name': 'Closed', 'id': '2', 'color': '#ff0000'}
+
+ROWS = [
+    {'id': '10', 'subject': 'a', 'status': OPEN, 'technician': None},
+    {'id': '11', 'subject': 'b', 'status': OPEN, 'technician': {'email_id': 't@example.com'}},
+    {'id': '12', 'subject': 'c', 'status': CLOSED, 'technician': {'email_id': 't@example.com'}},
+]
+
+
+class TestToColumnar:
+    def test_columns_hold_values_per_field(self):
+        result = to_columnar(ROWS)
+        assert is_columnar(result)
+        assert result['count'] == 3
+        assert result['columns']['id'] == ['10', '11', '12']
+        assert result['columns']['subject'] == ['a', 'b', 'c']
+
+    def test_lookup_objects_interned_once(self):
+        result = to_columnar(ROWS)
+        assert sorted(result['interned']) == ['status', 'technician']
+        assert result['columns']['status'] == [0, 0, 1]
+        assert result['lookups'][0] == OPEN
+        assert result['columns']['technician'] == [None, 2, 2]
+        assert len(result['lookups']) == 3
+
+    def test_mixed_column_not_interned(self):
+        result = to_columnar([{'value': {'a': 1}}, {'value': 'plain'}])
+        assert result['interned'] == []
+        assert result['columns']['value'] == [{'a': 1}, 'plain']
+
+    def test_smaller_than_rows(self):
+        rows = [dict(ROWS[i % 3], id=str(i)) for i in range(100)]
+        assert len(json.dumps(to_columnar(rows))) < len(json.dumps(rows)) / 2
+
+    def test_empty(self):
+        assert from_columnar(to_columnar([])) == []
+
+
+class TestFromColumnar:
+    def test_round_trip(self):
+        assert from_columnar(to_columnar(ROWS)) == ROWS
+
+    def test_round_trip_preserves_absent_keys(self):
+        rows = [{'id': '1', 'site': None}, {'id': '2'}]
+        result = to_columnar(rows)
+        assert result['absent'] == {'site': [1]}
+        assert from_columnar(result) == rows
+
+    def test_rows_do_not_share_lookup_objects(self):
+        rows = from_columnar(to_columnar(ROWS))
+        rows[0]['status']['name'] = 'Changed'
+        assert rows[1]['status']['name'] == 'Open'
+
+    def test_rejects_other_input(self):
+        with pytest.raises(ValueError):
+            from_columnar({'columns': {}})
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import gzip
+import io
+import json
+import zlib
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import FETCH_URL_PATH, create_mock_module
+
+from plugins.module_utils.compression import (
+    DecodingReader, TransferStats, content_encoding, decode_body, ACCEPT_ENCODING,
+)
+from plugins.module_utils.api_util import SDPClient
+
+BODY = json.dumps({'requests': [{'id': str(i), 'subject': 'Printer offline'} for i in range(500)]}).encode('utf-8')
+
+
+def _raw_deflate(data):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class TestContentEncoding:
+    def test_supported_encodings(self):
+        assert content_encoding({'content-encoding': 'GZIP'}) == 'gzip'
+        assert content_encoding({'content-encoding': 'deflate'}) == 'deflate'
+        assert content_encoding({'content-encoding': 'br'}) is None
+        assert content_encoding({}) is None
+
+
+class TestDecodingReader:
+    @pytest.mark.parametrize('encoding,encoded', [
+        ('gzip', gzip.compress(BODY)),
+        ('deflate', zlib.compress(BODY)),
+        ('deflate', _raw_deflate(BODY)),
+        (None, BODY),
+    ])
+    def test_decodes_whole_body(self, encoding, encoded):
+        stats = TransferStats()
+        reader = DecodingReader(io.BytesIO(encoded), encoding, stats)
+        assert reader.read() == BODY
+        assert stats.as_dict() == {'wire_bytes': len(encoded), 'body_bytes': len(BODY), 'responses': 1}
+
+    def test_decodes_incrementally(self):
+        encoded = gzip.compress(BODY)
+        with patch('plugins.module_utils.compression.CHUNK_SIZE', 64):
+            reader = DecodingReader(io.BytesIO(encoded), 'gzip')
+            parts = []
+            while True:
+                part = reader.read(100)
+                if not part:
+                    break
+                assert len(part) <= 100
+                parts.append(part)
+        assert b''.join(parts) == BODY
+        assert reader.wire_bytes == len(encoded)
+
+    def test_multi_member_gzip(self):
+        encoded = gzip.compress(b'{"a": ') + gzip.compress(b'1}')
+        assert DecodingReader(io.BytesIO(encoded), 'gzip').read() == b'{"a": 1}'
+
+    def test_decode_body(self):
+        assert decode_body(gzip.compress(b'error'), 'gzip') == b'error'
+        assert decode_body(b'not gzip', 'gzip') == b'not gzip'
+        assert decode_body(b'plain', None) == b'plain'
+
+
+class TestSDPClientCompression:
+    def _client(self):
+        return SDPClient(create_mock_module({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+        }))
+
+    @patch(FETCH_URL_PATH)
+    def test_requests_and_decodes_gzip(self, mock_fetch):
+        encoded = gzip.compress(BODY)
+        mock_fetch.return_value = (io.BytesIO(encoded), {'status': 200, 'content-encoding': 'gzip'})
+        client = self._client()
+
+        assert client.request('requests') == json.loads(BODY)
+        kwargs = mock_fetch.call_args.kwargs
+        assert kwargs['headers']['Accept-Encoding'] == ACCEPT_ENCODING
+        assert kwargs['decompress'] is False
+        assert client.transfer.as_dict() == {'wire_bytes': len(encoded), 'body_bytes': len(BODY), 'responses': 1}
+
+    @patch(FETCH_URL_PATH)
+    def test_get_record_decodes_deflate(self, mock_fetch):
+        mock_fetch.return_value = (io.BytesIO(zlib.compress(b'{"request": {"id": "1"}}')), {'status': 200, 'content-encoding': 'deflate'})
+        assert self._client().get_record('requests/1') == {'request': {'id': '1'}}
+
+    @patch(FETCH_URL_PATH)
+    def test_compressed_error_body_is_decoded(self, mock_fetch):
+        error = {'response_status': {'status_code': 4000, 'messages': [{'message': 'Invalid field'}]}}
+        mock_fetch.return_value = (None, {
+            'status': 400, 'msg': 'Bad Request', 'content-encoding': 'gzip',
+            'body': gzip.compress(json.dumps(error).encode('utf-8')),
+        })
+        client = self._client()
+        with pytest.raises(SystemExit):
+            client.request('requests', method='POST', data={})
+        assert 'Invalid field' in str(client.module.fail_json.call_args)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_error, build_fetch_url_response, create_mock_module
+
+from plugins.module_utils.deadline import Deadline
+from plugins.module_utils.api_util import SDPClient
+
+MONOTONIC_PATH = 'plugins.module_utils.deadline.time.monotonic'
+
+
+class TestDeadline:
+    def test_no_deadline(self):
+        deadline = Deadline()
+        assert deadline.remaining() is None
+        assert not deadline.expired()
+        assert deadline.timeout(10) == 10
+        assert deadline.allows(10 ** 6)
+
+    def test_timeouts_shrink_to_remaining_time(self):
+        with patch(MONOTONIC_PATH, return_value=100):
+            deadline = Deadline(30)
+        with patch(MONOTONIC_PATH, return_value=125):
+            assert deadline.timeout(10) == 5
+            assert deadline.allows(4)
+            assert not deadline.allows(5)
+        with patch(MONOTONIC_PATH, return_value=131):
+            assert deadline.expired()
+            assert deadline.timeout(10) == 0
+
+
+class TestSDPClientDeadline:
+    def _client(self, **params):
+        base = {
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+        }
+        base.update(params)
+        return SDPClient(create_mock_module(base))
+
+    @patch(FETCH_URL_PATH)
+    def test_request_timeout_is_passed_to_fetch_url(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'ok': 1})
+        self._client(request_timeout=25).request('requests', method='POST', data={})
+        assert mock_fetch.call_args.kwargs['timeout'] == 25
+
+    @patch(FETCH_URL_PATH)
+    def test_timeout_is_capped_by_the_deadline(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'ok': 1})
+        client = self._client(request_timeout=25, deadline=60)
+        with patch(MONOTONIC_PATH, return_value=client.deadline.expires_at - 7):
+            client.request('requests', method='POST', data={})
+        assert mock_fetch.call_args.kwargs['timeout'] == 7
+
+    @patch(FETCH_URL_PATH)
+    def test_expired_deadline_fails_without_calling_the_api(self, mock_fetch):
+        client = self._client(deadline=60)
+        with patch(MONOTONIC_PATH, return_value=client.deadline.expires_at + 1):
+            with pytest.raises(SystemExit):
+                client.get_record('requests/1')
+        mock_fetch.assert_not_called()
+        assert 'deadline of 60s exceeded' in client.module.fail_json.call_args.kwargs['msg']
+
+    @patch('plugins.module_utils.api_util.time.sleep')
+    @patch(FETCH_URL_PATH)
+    def test_retries_that_cannot_finish_are_skipped(self, mock_fetch, mock_sleep):
+        mock_fetch.return_value = build_fetch_url_error(502, 'Bad Gateway')
+        client = self._client(deadline=60)
+        with patch(MONOTONIC_PATH, return_value=client.deadline.expires_at - 2.5):
+            with pytest.raises(SystemExit):
+                client.request('requests', method='POST', data={}, retry_delay=2)
+        assert mock_fetch.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch('plugins.module_utils.oauth.get_access_token', return_value={'access_token': 'new'})
+    def test_token_request_gets_the_timeout(self, mock_token):
+        client = self._client(auth_token=None, client_id='id', client_secret='secret', refresh_token='rt', request_timeout=5)
+        client._ensure_auth()
+        assert mock_token.call_args.kwargs['timeout'] == 5
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+from tests.unit.conftest import (
+    FETCH_URL_PATH, build_fetch_url_response, create_mock_module,
+)
+
+from plugins.module_utils.api_util import SDPClient
+from plugins.module_utils.export_util import (
+    time_value, time_range_criteria, split_range, time_sliced_export,
+    encode_cursor, decode_cursor, new_cursor_state, budgeted_read,
+)
+import pytest
+
+
+def _client():
+    module = create_mock_module({
+        'domain': 'test.example.com',
+        'portal_name': 'portal',
+        'auth_token': 'tok',
+        'client_id': None, 'client_secret': None,
+        'refresh_token': None, 'dc': 'US',
+    })
+    return SDPClient(module)
+
+
+def _list_info(call):
+    return json.loads(parse_qs(call.kwargs['data'])['input_data'][0])['list_info']
+
+
+# ---------------------------------------------------------------------------
+# helpers
+# ---------------------------------------------------------------------------
+class TestHelpers:
+    def test_time_value(self):
+        assert time_value({'created_time': {'value': '1700', 'display_value': 'x'}}, 'created_time') == 1700
+        assert time_value({'created_time': 5}, 'created_time') == 5
+        assert time_value({}, 'created_time') is None
+
+    def test_time_range_criteria(self):
+        criteria = time_range_criteria('created_time', 10, 20)
+        assert criteria[0] == {'field': 'created_time', 'condition': 'greater or equal', 'value': '10'}
+        assert criteria[1]['condition'] == 'lesser than'
+        assert criteria[1]['value'] == '20'
+        assert criteria[1]['logical_operator'] == 'AND'
+
+    def test_split_range_is_contiguous(self):
+        ranges = split_range(0, 100, 3)
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == 100
+        for first, second in zip(ranges, ranges[1:]):
+            assert first[1] == second[0]
+
+    def test_split_range_never_exceeds_width(self):
+        assert split_range(0, 2, 8) == [(0, 1), (1, 2)]
+
+
+# ---------------------------------------------------------------------------
+# time_sliced_export
+# ---------------------------------------------------------------------------
+class TestTimeSlicedExport:
+    @patch(FETCH_URL_PATH)
+    def test_fetches_each_slice_and_dedupes(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'changes': [{'id': '1'}, {'id': '2'}], 'list_info': {'has_more_rows': False}}),
+            build_fetch_url_response({'changes': [{'id': '2'}, {'id': '3'}], 'list_info': {'has_more_rows': False}}),
+        ]
+
+        rows, info = time_sliced_export(_client(), 'changes', 'changes', start=0, end=100, slices=2, concurrency=1)
+
+        assert [row['id'] for row in rows] == ['1', '2', '3']
+        assert info == {'field': 'created_time', 'start_time': 0, 'end_time': 100, 'slices': 2}
+        bounds = [[c['value'] for c in _list_info(call)['search_criteria']] for call in mock_fetch.call_args_list]
+        assert bounds == [['0', '50'], ['50', '100']]
+
+    @patch(FETCH_URL_PATH)
+    def test_start_defaults_to_earliest_record(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'changes': [{'id': '9', 'created_time': {'value': '40'}}]}),
+            build_fetch_url_response({'changes': [{'id': '9'}], 'list_info': {'has_more_rows': False}}),
+        ]
+
+        rows, info = time_sliced_export(_client(), 'changes', 'changes', end=100, slices=1, concurrency=1)
+
+        assert info['start_time'] == 40
+        assert rows == [{'id': '9'}]
+        first = _list_info(mock_fetch.call_args_list[0])
+        assert first['sort_order'] == 'asc'
+        assert first['row_count'] == 1
+
+    @patch(FETCH_URL_PATH)
+    def test_empty_portal(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'changes': []})
+
+        rows, info = time_sliced_export(_client(), 'changes', 'changes', end=100)
+
+        assert rows == []
+        assert info['slices'] == 0
+        assert mock_fetch.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# cursors / budgeted_read
+# ---------------------------------------------------------------------------
+def _row(row_id, created):
+    return {'id': row_id, 'created_time': {'value': str(created)}}
+
+
+class TestCursor:
+    def test_round_trip(self):
+        state = new_cursor_state('request', row_count=2)
+        state.update(last_value=10, last_ids=['1'])
+        assert decode_cursor(encode_cursor(state)) == state
+
+    @pytest.mark.parametrize('cursor', ['not base64!', encode_cursor({'version': 99})])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestBudgetedRead:
+    @patch(FETCH_URL_PATH)
+    def test_reads_to_end_with_keyset_criteria(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'requests': [_row('1', 10), _row('2', 20)], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'requests': [_row('2', 20), _row('3', 30)], 'list_info': {'has_more_rows': False}}),
+        ]
+        state = new_cursor_state('request', row_count=2)
+
+        rows, state = budgeted_read(_client(), 'requests', 'requests', state)
+
+        assert [row['id'] for row in rows] == ['1', '2', '3']
+        assert state is None
+        assert 'search_criteria' not in _list_info(mock_fetch.call_args_list[0])
+        second = _list_info(mock_fetch.call_args_list[1])
+        assert second['start_index'] == 1
+        assert second['search_criteria'] == [{'field': 'created_time', 'condition': 'greater or equal', 'value': '20'}]
+
+    @patch(FETCH_URL_PATH)
+    def test_stops_when_budget_runs_out_and_resumes(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'requests': [_row('1', 10), _row('2', 20)], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'requests': [_row('2', 20), _row('3', 30)], 'list_info': {'has_more_rows': False}}),
+        ]
+        state = new_cursor_state('request', row_count=2)
+
+        first, state = budgeted_read(_client(), 'requests', 'requests', state, time_budget=0)
+        assert [row['id'] for row in first] == ['1', '2']
+        assert mock_fetch.call_count == 1
+
+        rest, state = budgeted_read(_client(), 'requests', 'requests', decode_cursor(encode_cursor(state)), time_budget=0)
+        assert [row['id'] for row in rest] == ['3']
+        assert state is None
+
+    @patch(FETCH_URL_PATH)
+    def test_pages_past_a_full_page_of_ties(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'requests': [_row('1', 10), _row('2', 10)], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'requests': [_row('1', 10), _row('2', 10)], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'requests': [_row('3', 10)], 'list_info': {'has_more_rows': False}}),
+        ]
+        state = new_cursor_state('request', row_count=2)
+
+        rows, state = budgeted_read(_client(), 'requests', 'requests', state)
+
+        assert [row['id'] for row in rows] == ['1', '2', '3']
+        assert _list_info(mock_fetch.call_args_list[2])['start_index'] == 3
+
+    @patch(FETCH_URL_PATH)
+    def test_resumed_reads_page_past_ties(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'requests': [_row('1', 10), _row('2', 10)], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'requests': [_row('1', 10), _row('2', 10)], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'requests': [_row('3', 10), _row('4', 10)], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'requests': [_row('5', 10)], 'list_info': {'has_more_rows': False}}),
+        ]
+        state = new_cursor_state('request', row_count=2)
+        rows = []
+
+        while state is not None:
+            page, state = budgeted_read(
+                _client(), 'requests', 'requests', decode_cursor(encode_cursor(state)), time_budget=0)
+            rows.extend(page)
+
+        assert [row['id'] for row in rows] == ['1', '2', '3', '4', '5']
+        assert [_list_info(call)['start_index'] for call in mock_fetch.call_args_list] == [1, 1, 3, 5]
+
+    @patch(FETCH_URL_PATH)
+    def test_id_sort_uses_strict_bound(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'requests': [{'id': '8'}], 'list_info': {'has_more_rows': False}})
+        state = new_cursor_state('request', sort_field='id', sort_order='desc')
+        state.update(last_value=9, last_ids=['9'])
+
+        budgeted_read(_client(), 'requests', 'requests', state)
+
+        criteria = _list_info(mock_fetch.call_args)['search_criteria']
+        assert criteria == [{'field': 'id', 'condition': 'lesser than', 'value': '9'}]
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_response, create_mock_module
+
+from plugins.module_utils.cache import FileCache
+from plugins.module_utils.hedge import (
+    HedgePolicy, hedged_call, percentile, ENV_HEDGE_PERCENTILE, HEDGE_DEFAULT_DELAY, HEDGE_FLUSH_SAMPLES,
+)
+from plugins.module_utils.api_util import SDPClient
+
+
+def _policy(tmp_path, samples=None, requests=0, hedges=0, budget=5):
+    cache = FileCache(str(tmp_path))
+    if samples is not None:
+        cache.set('latency', {'samples': samples, 'requests': requests, 'hedges': hedges})
+    return HedgePolicy('latency', 95, budget=budget, cache=cache)
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 95) == 95
+        assert percentile(values, 50) == 50
+        assert percentile([3.0], 99) == 3.0
+
+
+class TestHedgePolicy:
+    def test_from_env(self, monkeypatch):
+        monkeypatch.delenv(ENV_HEDGE_PERCENTILE, raising=False)
+        assert HedgePolicy.from_env('k') is None
+        monkeypatch.setenv(ENV_HEDGE_PERCENTILE, '95')
+        assert HedgePolicy.from_env('k').pct == 95
+        monkeypatch.setenv(ENV_HEDGE_PERCENTILE, 'fast')
+        assert HedgePolicy.from_env('k') is None
+
+    def test_delay_needs_enough_samples(self, tmp_path):
+        assert _policy(tmp_path, [0.1] * 5).delay() == HEDGE_DEFAULT_DELAY
+        assert _policy(tmp_path, [0.1] * 19 + [2.0] * 1).delay() == 0.1
+        assert _policy(tmp_path, [0.1] * 18 + [2.0] * 2).delay() == 2.0
+
+    def test_budget_limits_hedges(self, tmp_path):
+        policy = _policy(tmp_path, [], requests=39, hedges=1)
+        policy.begin()
+        assert policy.try_hedge()
+        assert not policy.try_hedge()
+
+    def test_observations_are_shared(self, tmp_path):
+        policy = _policy(tmp_path, [])
+        policy.observe(0.25)
+        assert FileCache(str(tmp_path)).get('latency')['samples'] == []
+        policy.flush()
+        assert _policy(tmp_path).delay() == HEDGE_DEFAULT_DELAY
+        assert FileCache(str(tmp_path)).get('latency')['samples'] == [0.25]
+
+    def test_flushes_every_batch_of_samples(self, tmp_path):
+        policy = _policy(tmp_path, [])
+        for _i in range(HEDGE_FLUSH_SAMPLES):
+            policy.observe(0.1)
+        assert len(FileCache(str(tmp_path)).get('latency')['samples']) == HEDGE_FLUSH_SAMPLES
+
+    def test_concurrent_processes_merge_their_samples(self, tmp_path):
+        first = _policy(tmp_path, [0.5], requests=10, hedges=1)
+        second = _policy(tmp_path)
+        for policy, latency in ((first, 0.1), (second, 0.2)):
+            policy.begin()
+            policy.observe(latency)
+        first.flush()
+        second.flush()
+
+        stored = FileCache(str(tmp_path)).get('latency')
+        assert stored == {'samples': [0.5, 0.1, 0.2], 'requests': 12, 'hedges': 1}
+        # The second process now also sees the first one's samples
+        assert len(second._load()['samples']) == 3
+
+
+class TestHedgedCall:
+    def test_fast_call_is_not_hedged(self, tmp_path):
+        calls = []
+        policy = _policy(tmp_path, [], requests=1000)
+        assert hedged_call(lambda: calls.append(1) or (True, 'ok'), policy) == 'ok'
+        assert len(calls) == 1
+
+    def test_slow_call_is_hedged_and_first_answer_wins(self, tmp_path):
+        policy = _policy(tmp_path, [0.01] * 50, requests=1000)
+        release = threading.Event()
+        calls = []
+
+        def _func():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(5)
+                return True, 'slow'
+            return True, 'hedge'
+
+        assert hedged_call(_func, policy) == 'hedge'
+        release.set()
+        assert len(calls) == 2
+
+    def test_losing_result_is_discarded(self, tmp_path):
+        policy = _policy(tmp_path, [0.01] * 50, requests=1000)
+        release = threading.Event()
+        discarded = threading.Event()
+        closed = []
+        calls = []
+
+        def _func():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(5)
+                return True, 'slow'
+            return True, 'hedge'
+
+        def _discard(result):
+            closed.append(result)
+            discarded.set()
+
+        assert hedged_call(_func, policy, discard=_discard) == 'hedge'
+        release.set()
+        assert discarded.wait(5)
+        assert closed == ['slow']
+
+    def test_no_hedge_without_budget(self, tmp_path):
+        policy = _policy(tmp_path, [0.01] * 50, requests=0)
+        calls = []
+
+        def _func():
+            calls.append(1)
+            threading.Event().wait(0.1)
+            return True, 'only'
+
+        assert hedged_call(_func, policy) == 'only'
+        assert len(calls) == 1
+
+    def test_failed_primary_falls_back_to_hedge(self, tmp_path):
+        policy = _policy(tmp_path, [0.01] * 50, requests=1000)
+        calls = []
+
+        def _func():
+            calls.append(1)
+            if len(calls) == 1:
+                threading.Event().wait(0.1)
+                return False, 'error'
+            threading.Event().wait(0.2)
+            return True, 'hedge'
+
+        assert hedged_call(_func, policy) == 'hedge'
+
+    def test_exception_is_raised_when_all_calls_fail(self, tmp_path):
+        def _func():
+            raise ValueError('boom')
+
+        with pytest.raises(ValueError):
+            hedged_call(_func, _policy(tmp_path, [], requests=1000))
+
+    def test_system_exit_in_hedged_call_reaches_caller(self, tmp_path):
+        policy = _policy(tmp_path, [0.01] * 50, requests=1000)
+        release = threading.Event()
+        calls = []
+
+        def _func():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(5)
+                return True, 'slow'
+            raise SystemExit(1)
+
+        try:
+            with pytest.raises(SystemExit):
+                hedged_call(_func, policy)
+        finally:
+            release.set()
+        assert len(calls) == 2
+
+    def test_system_exit_in_primary_is_not_masked_by_hedge(self, tmp_path):
+        policy = _policy(tmp_path, [0.01] * 50, requests=1000)
+        calls = []
+
+        def _func():
+            calls.append(1)
+            if len(calls) == 1:
+                threading.Event().wait(0.1)
+                raise SystemExit(1)
+            threading.Event().wait(0.2)
+            return True, 'hedge'
+
+        with pytest.raises(SystemExit):
+            hedged_call(_func, policy)
+
+
+class TestSDPClientHedging:
+    @patch(FETCH_URL_PATH)
+    def test_get_record_is_hedged(self, mock_fetch, monkeypatch):
+        monkeypatch.setenv(ENV_HEDGE_PERCENTILE, '90')
+        release = threading.Event()
+        responses = iter([
+            lambda: release.wait(5) and build_fetch_url_response({'request': {'id': 'slow'}}),
+            lambda: build_fetch_url_response({'request': {'id': '1'}}),
+        ])
+        mock_fetch.side_effect = lambda *a, **k: next(responses)()
+
+        client = SDPClient(create_mock_module({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+        }))
+        client.hedge.cache.set(client.hedge.key, {'samples': [0.01] * 50, 'requests': 1000, 'hedges': 0})
+
+        assert client.get_record('requests/1') == {'request': {'id': '1'}}
+        release.set()
+        assert mock_fetch.call_count == 2
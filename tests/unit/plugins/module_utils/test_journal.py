@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+
+from plugins.module_utils.journal import CheckpointJournal
+
+
+class TestCheckpointJournal:
+    def test_missing_file_loads_empty(self, tmp_path):
+        assert CheckpointJournal(str(tmp_path / 'none.journal'), 'requests').load() == {}
+
+    def test_records_survive_reopen(self, tmp_path):
+        path = str(tmp_path / 'sub' / 'bulk.journal')
+        with CheckpointJournal(path, 'requests') as journal:
+            journal.record('a', '1')
+            journal.record('b', '2')
+
+        assert CheckpointJournal(path, 'requests').load() == {'a': '1', 'b': '2'}
+
+    def test_load_is_scoped(self, tmp_path):
+        path = str(tmp_path / 'bulk.journal')
+        with CheckpointJournal(path, 'requests') as journal:
+            journal.record('a', '1')
+        with CheckpointJournal(path, 'changes/5/worklogs') as journal:
+            journal.record('a', '9')
+
+        assert CheckpointJournal(path, 'requests').load() == {'a': '1'}
+        assert CheckpointJournal(path, 'changes/5/worklogs').load() == {'a': '9'}
+
+    def test_truncated_line_is_ignored_and_terminated(self, tmp_path):
+        path = tmp_path / 'bulk.journal'
+        path.write_text(json.dumps({'scope': 'requests', 'key': 'a', 'id': '1'}) + '\n{"scope": "requ')
+
+        journal = CheckpointJournal(str(path), 'requests')
+        assert journal.load() == {'a': '1'}
+        with journal:
+            journal.record('b', '2')
+
+        assert journal.load() == {'a': '1', 'b': '2'}
+        assert path.read_text().splitlines()[-1].startswith('{')
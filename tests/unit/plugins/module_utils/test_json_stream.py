@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import json
+import socket
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_response, create_mock_module
+
+from plugins.module_utils import json_stream
+from plugins.module_utils.json_stream import iter_json_array
+from plugins.module_utils.api_util import SDPClient, iter_all_records
+
+ROWS = [
+    {'id': '1', 'subject': 'Café ☕ printer', 'count': 12345},
+    {'id': '2', 'subject': 'Line\nbreak "quoted"', 'nested': {'a': [1, 2.5, None, True]}},
+    {'id': '3', 'subject': '', 'count': -0.5},
+]
+
+
+def _parse(document, chunk_size=json_stream.CHUNK_SIZE, key='requests'):
+    meta = {}
+    body = io.BytesIO(json.dumps(document, ensure_ascii=False).encode('utf-8'))
+    with patch.object(json_stream, 'HAS_IJSON', False):
+        rows = list(iter_json_array(body, key, meta, chunk_size=chunk_size))
+    return rows, meta
+
+
+class TestIterJsonArray:
+    @pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 65536])
+    def test_rows_and_meta_at_any_chunk_size(self, chunk_size):
+        document = {
+            'response_status': [{'status_code': 2000, 'status': 'success'}],
+            'requests': ROWS,
+            'list_info': {'has_more_rows': True, 'row_count': 3},
+        }
+        rows, meta = _parse(document, chunk_size)
+        assert rows == ROWS
+        assert meta == {'response_status': document['response_status'], 'list_info': document['list_info']}
+
+    def test_scalar_elements_split_across_chunks(self):
+        rows, _meta = _parse({'requests': [123456789, 1.5e10, 'x']}, chunk_size=3)
+        assert rows == [123456789, 1.5e10, 'x']
+
+    def test_empty_and_missing_array(self):
+        assert _parse({'requests': [], 'list_info': {}}) == ([], {'list_info': {}})
+        assert _parse({'response_status': {'status_code': 4000}}) == ([], {'response_status': {'status_code': 4000}})
+        assert _parse({}) == ([], {})
+
+    def test_rows_are_yielded_before_the_body_is_read(self):
+        body = io.BytesIO(json.dumps({'requests': ROWS * 100}).encode('utf-8'))
+        with patch.object(json_stream, 'HAS_IJSON', False):
+            rows = iter_json_array(body, 'requests', chunk_size=256)
+            assert next(rows) == ROWS[0]
+        assert body.tell() < len(body.getvalue())
+
+    @pytest.mark.parametrize('text', [b'[1, 2]', b'{"requests": [{"id": 1} {"id": 2}]}', b'{"requests": [{"id": 1'])
+    def test_invalid_json_raises(self, text):
+        with patch.object(json_stream, 'HAS_IJSON', False):
+            with pytest.raises(ValueError):
+                list(iter_json_array(io.BytesIO(text), 'requests', chunk_size=4))
+
+    def test_ijson_backend(self):
+        pytest.importorskip('ijson')
+        meta = {}
+        body = io.BytesIO(json.dumps({'requests': ROWS, 'list_info': {'has_more_rows': False}}).encode('utf-8'))
+        assert list(iter_json_array(body, 'requests', meta)) == ROWS
+        assert meta == {'list_info': {'has_more_rows': False}}
+
+
+class TestIterAllRecords:
+    def _client(self):
+        return SDPClient(create_mock_module({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+        }))
+
+    @patch(FETCH_URL_PATH)
+    def test_streams_every_page(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'notes': [{'id': '1'}, {'id': '2'}], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'list_info': {'has_more_rows': False}, 'notes': [{'id': '3'}]}),
+        ]
+        rows = iter_all_records(self._client(), 'requests/1/notes', 'notes', row_count=2)
+        assert [row['id'] for row in rows] == ['1', '2', '3']
+        assert mock_fetch.call_count == 2
+
+    @patch(FETCH_URL_PATH)
+    def test_api_error_fails_after_the_stream(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({
+            'response_status': {'status_code': 4001, 'messages': [{'message': 'Invalid list_info'}]},
+        })
+        client = self._client()
+        with pytest.raises(SystemExit):
+            list(iter_all_records(client, 'requests', 'requests'))
+        assert client.module.fail_json.call_args.kwargs['msg'] == 'Invalid list_info'
+
+    @patch(FETCH_URL_PATH)
+    def test_connection_error_while_streaming_fails_the_module(self, mock_fetch):
+        class _Reset:
+            def __init__(self):
+                self.body = io.BytesIO(b'{"notes": [{"id": "1"}, {"id": ')
+
+            def read(self, size=-1):
+                data = self.body.read(size)
+                if not data:
+                    raise socket.timeout('timed out')
+                return data
+
+        mock_fetch.return_value = (_Reset(), {'status': 200, 'msg': 'OK'})
+        client = self._client()
+        rows = iter_all_records(client, 'requests/1/notes', 'notes')
+
+        with pytest.raises(SystemExit):
+            list(rows)
+        msg = client.module.fail_json.call_args.kwargs['msg']
+        assert msg.startswith('Failed to read the response from https://test.example.com/app/portal/api/v3/requests/1/notes')
+        assert 'timed out' in msg
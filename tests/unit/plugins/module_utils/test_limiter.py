@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+from unittest.mock import patch
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_response, build_fetch_url_error, create_mock_module
+
+from plugins.module_utils.limiter import AIMDLimiter, is_overloaded
+from plugins.module_utils.api_util import SDPClient
+
+
+class TestIsOverloaded:
+    def test_status_codes(self):
+        assert is_overloaded(429)
+        assert is_overloaded(503)
+        assert not is_overloaded(500)
+        assert not is_overloaded(200)
+
+    def test_rate_limit_headers(self):
+        assert is_overloaded(200, {'retry-after': '5'})
+        assert is_overloaded(200, {'x-ratelimit-remaining': '0'})
+        assert not is_overloaded(200, {'x-ratelimit-remaining': '12'})
+        assert not is_overloaded(200, {'x-ratelimit-remaining': 'n/a'})
+
+
+class TestAIMDLimiter:
+    def test_healthy_responses_increase_additively(self):
+        limiter = AIMDLimiter(2, maximum=4)
+        for _i in range(2):
+            limiter.release(limiter.acquire(), 200)
+        assert limiter.limit == 2 + 1 / 2.0 + 1 / 2.5
+        for _i in range(30):
+            limiter.release(limiter.acquire(), 200)
+        assert limiter.limit == 4
+
+    def test_overload_cuts_multiplicatively_once_per_burst(self):
+        limiter = AIMDLimiter(8)
+        started = [limiter.acquire() for _i in range(4)]
+        for start in started:
+            limiter.release(start, 429)
+        assert limiter.limit == 4
+        assert limiter.decreases == 1
+
+        limiter.release(limiter.acquire(), 503)
+        assert limiter.limit == 2
+
+    def test_never_below_minimum(self):
+        limiter = AIMDLimiter(1)
+        limiter.release(limiter.acquire(), 429)
+        assert limiter.limit == 1
+
+    def test_slow_responses_do_not_increase(self):
+        limiter = AIMDLimiter(2, maximum=4)
+        with patch('plugins.module_utils.limiter.time.monotonic', side_effect=[0, 0.1, 10, 11]):
+            limiter.release(limiter.acquire(), 200)
+            limiter.release(limiter.acquire(), 200)
+        assert limiter.limit == 2.5
+
+    def test_acquire_waits_for_a_free_slot(self):
+        limiter = AIMDLimiter(1)
+        started = limiter.acquire()
+        acquired = threading.Event()
+
+        def _second():
+            limiter.release(limiter.acquire(), 200)
+            acquired.set()
+
+        thread = threading.Thread(target=_second)
+        thread.start()
+        assert not acquired.wait(0.1)
+        limiter.release(started, 200)
+        assert acquired.wait(5)
+        thread.join()
+
+
+class TestSDPClientLimiter:
+    def _client(self, max_concurrency=None):
+        return SDPClient(create_mock_module({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+            'max_concurrency': max_concurrency,
+        }))
+
+    @patch('plugins.module_utils.api_util.time.sleep')
+    @patch(FETCH_URL_PATH)
+    def test_rate_limited_responses_cut_the_limit(self, mock_fetch, _mock_sleep):
+        responses = [build_fetch_url_error(429, 'Too Many Requests')] + [build_fetch_url_response({'ok': 1})] * 3
+        mock_fetch.side_effect = responses
+        client = self._client()
+        limiters = []
+
+        def _call(item):
+            client.request('requests', method='POST', data={'i': item})
+            limiters.append(client.limiter)
+
+        client.map_concurrent(_call, [1, 2], concurrency=2)
+        assert limiters[0].decreases == 1
+        assert client.limiter is None
+
+    @patch(FETCH_URL_PATH)
+    def test_serial_calls_have_no_limiter(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'ok': 1})
+        client = self._client()
+        limiters = client.map_concurrent(lambda _i: client.limiter, [1, 2], concurrency=1)
+        assert limiters == [None, None]
+
+    @patch(FETCH_URL_PATH)
+    def test_max_concurrency_allows_growth(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'ok': 1})
+        client = self._client(max_concurrency=6)
+        limits = []
+
+        def _call(item):
+            client.request('requests', method='POST', data={'i': item})
+            limits.append(client.limiter.limit)
+
+        client.map_concurrent(_call, list(range(20)), concurrency=2)
+        assert max(limits) > 2
+        assert max(limits) <= 6
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import (
+    FETCH_URL_PATH, build_fetch_url_response, create_mock_module,
+)
+
+from plugins.module_utils.api_util import SDPClient
+from plugins.module_utils.cache import FileCache, ENV_CACHE_DIR
+from plugins.module_utils.lookup_util import resolve_lookup, LOOKUP_CATALOGUES
+from plugins.module_utils.sdp_config import MODULE_CONFIG
+
+PRIORITIES = {'priorities': [{'id': '1', 'name': 'High'}, {'id': '2', 'name': 'Low'}], 'list_info': {'has_more_rows': False}}
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path):
+    LOOKUP_CATALOGUES.clear()
+    with patch.dict(os.environ, {ENV_CACHE_DIR: str(tmp_path)}):
+        yield tmp_path
+    LOOKUP_CATALOGUES.clear()
+
+
+def _module():
+    return create_mock_module({
+        'domain': 'test.example.com',
+        'portal_name': 'portal',
+        'auth_token': 'tok',
+        'client_id': None, 'client_secret': None,
+        'refresh_token': None, 'dc': 'US',
+        'parent_module_name': 'request',
+    })
+
+
+def _resolve(module, value, mode='validate', field='priority'):
+    return resolve_lookup(module, SDPClient(module), MODULE_CONFIG['request'], field, value, mode)
+
+
+class TestResolveLookup:
+    @patch(FETCH_URL_PATH)
+    def test_server_mode_makes_no_calls(self, mock_fetch):
+        assert _resolve(_module(), 'High', mode='server') == {'name': 'High'}
+        mock_fetch.assert_not_called()
+
+    @patch(FETCH_URL_PATH)
+    def test_field_without_catalogue_is_left_to_server(self, mock_fetch):
+        assert _resolve(_module(), 'Hardware', field='subcategory') == {'name': 'Hardware'}
+        mock_fetch.assert_not_called()
+
+    @patch(FETCH_URL_PATH)
+    def test_validate_and_id_modes(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response(PRIORITIES)
+        module = _module()
+
+        assert _resolve(module, 'high') == {'name': 'High'}
+        assert _resolve(module, 'Low', mode='id') == {'id': '2'}
+        # Catalogue is fetched once per process
+        assert mock_fetch.call_count == 1
+        assert mock_fetch.call_args.args[1].endswith('/priorities')
+
+    @patch(FETCH_URL_PATH)
+    def test_disk_cache_is_reused_across_processes(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response(PRIORITIES)
+        _resolve(_module(), 'High')
+        LOOKUP_CATALOGUES.clear()
+
+        assert _resolve(_module(), 'Low', mode='id') == {'id': '2'}
+        assert mock_fetch.call_count == 1
+
+    @patch(FETCH_URL_PATH)
+    def test_stale_cache_is_refreshed_once_on_miss(self, mock_fetch):
+        FileCache().set('test.example.com/portal/lookups/priorities', [{'id': '1', 'name': 'High'}])
+        mock_fetch.return_value = build_fetch_url_response(
+            {'priorities': [{'id': '1', 'name': 'High'}, {'id': '3', 'name': 'Urgent'}]})
+
+        assert _resolve(_module(), 'Urgent', mode='id') == {'id': '3'}
+        assert mock_fetch.call_count == 1
+
+    @patch(FETCH_URL_PATH)
+    def test_unknown_value_fails_with_suggestion(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response(PRIORITIES)
+        module = _module()
+
+        with pytest.raises(SystemExit):
+            _resolve(module, 'Hihg')
+
+        kwargs = module.fail_json.call_args[1]
+        assert 'Did you mean: High?' in kwargs['msg']
+        assert kwargs['allowed_values'] == ['High', 'Low']
+        assert mock_fetch.call_count == 1
+
+    @patch(FETCH_URL_PATH)
+    def test_duplicate_name_fails_in_id_mode(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'priorities': [
+            {'id': '1', 'name': 'High'}, {'id': '4', 'name': 'High'}], 'list_info': {'has_more_rows': False}})
+        module = _module()
+
+        assert _resolve(module, 'High') == {'name': 'High'}
+        assert _resolve(module, '4', mode='id') == {'id': '4'}
+        with pytest.raises(SystemExit):
+            _resolve(module, 'High', mode='id')
+
+        kwargs = module.fail_json.call_args[1]
+        assert "2 values named 'High'" in kwargs['msg']
+        assert kwargs['candidate_ids'] == ['1', '4']
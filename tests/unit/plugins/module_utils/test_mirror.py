@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+from tests.unit.conftest import (
+    FETCH_URL_PATH, build_fetch_url_response, create_mock_module,
+)
+
+from plugins.module_utils.api_util import SDPClient
+from plugins.module_utils.mirror import RecordMirror, field_value, updated_time
+
+SCOPE = 'test.example.com/portal/change'
+
+
+def _client():
+    module = create_mock_module({
+        'domain': 'test.example.com',
+        'portal_name': 'portal',
+        'auth_token': 'tok',
+        'client_id': None, 'client_secret': None,
+        'refresh_token': None, 'dc': 'US',
+    })
+    return SDPClient(module)
+
+
+def _change(change_id, status, updated, **fields):
+    record = {'id': change_id, 'status': {'name': status, 'id': '9'}, 'last_updated_time': {'value': str(updated)}}
+    record.update(fields)
+    return record
+
+
+def _list_info(call):
+    return json.loads(parse_qs(call.kwargs['data'])['input_data'][0])['list_info']
+
+
+class TestFieldValue:
+    def test_normalizes_lookups_and_scalars(self):
+        assert field_value({'name': 'Open', 'id': '1'}) == 'Open'
+        assert field_value({'email_id': 'a@example.com'}) == 'a@example.com'
+        assert field_value(5) == '5'
+        assert field_value(True) == 'true'
+        assert field_value(None) is None
+
+    def test_users_match_on_email(self):
+        user = {'id': '9', 'name': 'Jane Doe', 'email_id': 'jane@example.com'}
+        assert field_value(user) == 'jane@example.com'
+
+    def test_updated_time_falls_back_to_created_time(self):
+        assert updated_time({'created_time': {'value': '7'}}) == 7
+        assert updated_time({'created_time': {'value': '7'}, 'last_updated_time': {'value': '9'}}) == 9
+
+
+class TestRecordMirror:
+    @patch(FETCH_URL_PATH)
+    def test_first_sync_is_full_then_incremental(self, mock_fetch, tmp_path):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'changes': [_change('1', 'Open', 100), _change('2', 'Closed', 200)]}),
+            build_fetch_url_response({'changes': [_change('2', 'Open', 300)]}),
+        ]
+        with RecordMirror(str(tmp_path / 'mirror.db')) as mirror:
+            assert mirror.age(SCOPE) is None
+
+            first = mirror.sync(_client(), 'changes', 'changes', SCOPE)
+            assert first['full'] is True
+            assert 'search_criteria' not in _list_info(mock_fetch.call_args_list[0])
+
+            second = mirror.sync(_client(), 'changes', 'changes', SCOPE)
+            assert second == {'fetched': 1, 'full': False, 'synced_at': second['synced_at']}
+            criteria = _list_info(mock_fetch.call_args_list[1])['search_criteria']
+            assert [c['value'] for c in criteria] == ['200', '200']
+
+            assert mirror.count(SCOPE) == 2
+            assert mirror.get(SCOPE, '2')['status']['name'] == 'Open'
+            assert mirror.state(SCOPE)['high_water'] == 300
+
+    @patch(FETCH_URL_PATH)
+    def test_full_sync_drops_deleted_records(self, mock_fetch, tmp_path):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'changes': [_change('1', 'Open', 100), _change('2', 'Open', 200)]}),
+            build_fetch_url_response({'changes': [_change('2', 'Open', 200)]}),
+        ]
+        with RecordMirror(str(tmp_path / 'mirror.db')) as mirror:
+            mirror.sync(_client(), 'changes', 'changes', SCOPE)
+            mirror.sync(_client(), 'changes', 'changes', SCOPE, full=True)
+            assert mirror.count(SCOPE) == 1
+            assert mirror.get(SCOPE, '1') is None
+
+    @patch(FETCH_URL_PATH)
+    def test_query_uses_indexed_and_unindexed_filters(self, mock_fetch, tmp_path):
+        mock_fetch.return_value = build_fetch_url_response({'changes': [
+            _change('10', 'Open', 100, priority={'name': 'High'}, title='a'),
+            _change('2', 'Open', 100, priority={'name': 'Low'}, title='b'),
+            _change('3', 'Closed', 100, priority={'name': 'High'}, title='a'),
+        ]})
+        with RecordMirror(str(tmp_path / 'mirror.db')) as mirror:
+            mirror.sync(_client(), 'changes', 'changes', SCOPE, index_fields=['priority'])
+
+            assert [r['id'] for r in mirror.query(SCOPE)] == ['2', '3', '10']
+            assert [r['id'] for r in mirror.query(SCOPE, {'status': 'Open'})] == ['2', '10']
+            assert [r['id'] for r in mirror.query(SCOPE, {'status': ['Open', 'Closed'], 'priority': 'High'})] == ['3', '10']
+            assert [r['id'] for r in mirror.query(SCOPE, {'title': 'a', 'status': 'Open'})] == ['10']
+            assert mirror.query(SCOPE, {'status': []}) == []
+            assert mirror.query('other/portal/change') == []
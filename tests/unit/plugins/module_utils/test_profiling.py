@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import pstats
+import tracemalloc
+import pytest
+
+from plugins.module_utils import profiling
+from plugins.module_utils.profiling import run_profiled, profile_target
+
+
+class FakeModule:
+    """Stands in for AnsibleModule: exit_json/fail_json record the result and exit."""
+
+    results = []
+
+    def exit_json(self, **kwargs):
+        FakeModule.results.append(kwargs)
+        raise SystemExit(0)
+
+    def fail_json(self, msg, **kwargs):
+        kwargs['msg'] = msg
+        FakeModule.results.append(kwargs)
+        raise SystemExit(1)
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    FakeModule.results = []
+    monkeypatch.delenv(profiling.ENV_PROFILE, raising=False)
+    monkeypatch.delenv(profiling.ENV_PROFILE_TOP, raising=False)
+
+
+def _work():
+    data = [str(i) * 10 for i in range(2000)]
+    return sorted(data)
+
+
+def _run_module(fail=False):
+    module = FakeModule()
+    _work()
+    if fail:
+        module.fail_json("boom")
+    module.exit_json(changed=False)
+
+
+class TestProfileTarget:
+    @pytest.mark.parametrize('value, expected', [
+        ('', None), ('0', None), ('off', None),
+        ('1', 'result'), ('result', 'result'), ('/tmp/profiles', '/tmp/profiles'),
+    ])
+    def test_values(self, monkeypatch, value, expected):
+        monkeypatch.setenv(profiling.ENV_PROFILE, value)
+        assert profile_target() == expected
+
+
+class TestRunProfiled:
+    def test_disabled_is_a_plain_call(self):
+        exit_json = FakeModule.exit_json
+        with pytest.raises(SystemExit):
+            run_profiled(_run_module, 'write_record', module_class=FakeModule)
+        assert FakeModule.results == [{'changed': False}]
+        assert FakeModule.exit_json is exit_json
+        assert not tracemalloc.is_tracing()
+
+    def test_summary_in_result(self, monkeypatch):
+        monkeypatch.setenv(profiling.ENV_PROFILE, 'result')
+        monkeypatch.setenv(profiling.ENV_PROFILE_TOP, '5')
+        exit_json = FakeModule.exit_json
+        with pytest.raises(SystemExit):
+            run_profiled(_run_module, 'write_record', module_class=FakeModule)
+
+        result = FakeModule.results[0]
+        assert result['changed'] is False
+        report = result['profile']
+        assert report['elapsed'] >= 0
+        assert len(report['functions']) == 5
+        assert any('_work' in entry['function'] for entry in report['functions'])
+        assert report['memory']['peak'] > 0
+        assert 0 < len(report['memory']['top']) <= 5
+        assert 'files' not in report
+        # Hooks are removed and tracing stopped once the run is over
+        assert FakeModule.exit_json is exit_json
+        assert not tracemalloc.is_tracing()
+
+    def test_fail_json_keeps_positional_msg(self, monkeypatch):
+        monkeypatch.setenv(profiling.ENV_PROFILE, '1')
+        with pytest.raises(SystemExit):
+            run_profiled(lambda: _run_module(fail=True), 'read_record', module_class=FakeModule)
+        assert FakeModule.results[0]['msg'] == 'boom'
+        assert 'functions' in FakeModule.results[0]['profile']
+
+    def test_writes_profile_and_snapshot(self, monkeypatch, tmp_path):
+        directory = str(tmp_path / 'profiles')
+        monkeypatch.setenv(profiling.ENV_PROFILE, directory)
+        with pytest.raises(SystemExit):
+            run_profiled(_run_module, 'oauth_token', module_class=FakeModule)
+
+        files = FakeModule.results[0]['profile']['files']
+        assert sorted(os.listdir(directory)) == sorted(os.path.basename(f) for f in files)
+        prof = [f for f in files if f.endswith('.prof')][0]
+        assert os.path.basename(prof).startswith('oauth_token-')
+        assert pstats.Stats(prof).total_calls > 0
+        snapshot = tracemalloc.Snapshot.load([f for f in files if f.endswith('.tracemalloc')][0])
+        assert snapshot.statistics('filename')
+
+    def test_writes_profile_when_run_raises(self, monkeypatch, tmp_path):
+        monkeypatch.setenv(profiling.ENV_PROFILE, str(tmp_path))
+
+        def _crash():
+            _work()
+            raise RuntimeError('unexpected')
+
+        with pytest.raises(RuntimeError):
+            run_profiled(_crash, 'write_record', module_class=FakeModule)
+        assert len([f for f in os.listdir(str(tmp_path)) if f.endswith('.prof')]) == 1
+        assert not tracemalloc.is_tracing()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import copy
+import json
+import pytest
+from unittest.mock import patch
+
+from plugins.module_utils import serializer
+from plugins.module_utils.serializer import Serializer, available_backends, select_backend, json_dumps, json_loads
+
+DOCUMENT = {
+    'request': {
+        'subject': 'Café ☕ printer',
+        'description': 'Line\nbreak "quoted" </script>',
+        'id': '123456789012345678',
+        'count': 12345,
+        'ratio': 0.1,
+        'negative': -2.5,
+        'large': 1e16,
+        'small': 1e-7,
+        'missing': float('nan'),
+        'flags': [True, False, None],
+        'empty': {},
+    },
+    'b': 1,
+    'a': 2,
+}
+
+# NaN is not standard JSON: fast backends do not parse it and it never compares equal
+PARSED_DOCUMENT = copy.deepcopy(DOCUMENT)
+del PARSED_DOCUMENT['request']['missing']
+
+
+class TestBackendSelection:
+    def test_stdlib_always_available(self):
+        assert available_backends()[-1] == 'json'
+
+    def test_env_var_forces_backend(self, monkeypatch):
+        monkeypatch.setenv(serializer.ENV_JSON_BACKEND, 'json')
+        assert select_backend() == 'json'
+
+    def test_missing_backend_falls_back_to_fastest_installed(self):
+        with patch.object(serializer, 'HAS_ORJSON', False), patch.object(serializer, 'HAS_UJSON', False):
+            assert select_backend('orjson') == 'json'
+            assert Serializer('ujson').backend == 'json'
+
+    def test_unknown_backend_ignored(self):
+        assert select_backend('simplejson') == available_backends()[0]
+
+
+class TestStdlibBackend:
+    def test_compact_and_keeps_non_ascii(self):
+        out = Serializer('json').dumps({'subject': 'Café', 'n': [1, 2]})
+        assert out == '{"subject":"Café","n":[1,2]}'
+
+    def test_sort_keys(self):
+        assert Serializer('json').dumps({'b': 1, 'a': {'d': 1, 'c': 2}}, sort_keys=True) == '{"a":{"c":2,"d":1},"b":1}'
+
+    def test_loads_str_and_bytes(self):
+        text = json.dumps(PARSED_DOCUMENT)
+        s = Serializer('json')
+        assert s.loads(text) == PARSED_DOCUMENT
+        assert s.loads(text.encode('utf-8')) == PARSED_DOCUMENT
+
+    def test_loads_invalid_raises_value_error(self):
+        with pytest.raises(ValueError):
+            Serializer('json').loads('{not json')
+
+    def test_module_helpers_round_trip(self):
+        assert json_loads(json_dumps(PARSED_DOCUMENT)) == PARSED_DOCUMENT
+
+
+@pytest.mark.parametrize('backend', ['orjson', 'ujson'])
+class TestFastBackends:
+    @pytest.fixture(autouse=True)
+    def _require(self, backend):
+        pytest.importorskip(backend)
+
+    @pytest.mark.parametrize('sort_keys', [False, True])
+    def test_output_identical_to_stdlib(self, backend, sort_keys):
+        assert Serializer(backend).dumps(DOCUMENT, sort_keys) == Serializer('json').dumps(DOCUMENT, sort_keys)
+
+    def test_loads_identical_to_stdlib(self, backend):
+        text = Serializer('json').dumps(PARSED_DOCUMENT)
+        assert Serializer(backend).loads(text) == PARSED_DOCUMENT
+        assert Serializer(backend).loads(text.encode('utf-8')) == PARSED_DOCUMENT
+
+    def test_unsupported_value_falls_back_to_stdlib(self, backend):
+        big = {'id': 2 ** 70}
+        assert Serializer(backend).dumps(big) == '{"id":%d}' % 2 ** 70
+
+    def test_loads_invalid_raises_value_error(self, backend):
+        with pytest.raises(ValueError):
+            Serializer(backend).loads('{not json')
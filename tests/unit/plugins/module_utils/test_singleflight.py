@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from plugins.module_utils.singleflight import SingleFlight
+
+
+def _run_concurrently(flight, key, func, release, workers=5):
+    """Call flight.do from several threads, releasing func once all of them are waiting on it."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(flight.do, key, func) for _i in range(workers)]
+        while flight._calls.get(key) is None or flight._calls[key].waiters < workers - 1:
+            time.sleep(0.001)
+        release.set()
+    return futures
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def _slow():
+            calls.append(1)
+            release.wait(5)
+            return {'rows': [1, 2]}
+
+        futures = _run_concurrently(flight, 'k', _slow, release)
+        results = [future.result() for future in futures]
+
+        assert len(calls) == 1
+        assert all(result == {'rows': [1, 2]} for result in results)
+        # Every caller owns its result
+        assert len(set(id(result) for result in results)) == 5
+        assert flight.in_flight() == 0
+
+    def test_error_is_shared(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def _fail():
+            release.wait(5)
+            raise SystemExit(1)
+
+        futures = _run_concurrently(flight, 'k', _fail, release, workers=3)
+        for future in futures:
+            with pytest.raises(SystemExit):
+                future.result()
+
+    def test_sequential_calls_are_not_cached(self):
+        flight = SingleFlight()
+        counter = []
+        flight.do('k', lambda: counter.append(1))
+        flight.do('k', lambda: counter.append(1))
+        assert len(counter) == 2
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import threading
+import pytest
+from unittest.mock import patch
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_error, build_fetch_url_response, create_mock_module
+
+from plugins.module_utils import tracing
+from plugins.module_utils.tracing import Tracer, parse_traceparent, run_traced, trace_span, NOOP_SPAN
+from plugins.module_utils.api_util import SDPClient
+from plugins.module_utils.oauth import get_access_token
+
+TRACE_ID = '4bf92f3577b34da6a3ce929d0e0e4736'
+PARENT_ID = '00f067aa0ba902b7'
+
+
+class FakeModule:
+    """Stands in for AnsibleModule: exit_json/fail_json record the result and exit."""
+
+    results = []
+    check_mode = False
+
+    def exit_json(self, **kwargs):
+        FakeModule.results.append(kwargs)
+        raise SystemExit(0)
+
+    def fail_json(self, msg, **kwargs):
+        kwargs['msg'] = msg
+        FakeModule.results.append(kwargs)
+        raise SystemExit(1)
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    FakeModule.results = []
+    for name in (tracing.ENV_TRACE, tracing.ENV_TRACEPARENT, tracing.ENV_TRACEPARENT_STANDARD):
+        monkeypatch.delenv(name, raising=False)
+    yield
+    tracing.TRACER = None
+
+
+def _read_spans(path):
+    with open(path) as f:
+        lines = f.read().splitlines()
+    spans = []
+    for line in lines:
+        for resource in json.loads(line)['resourceSpans']:
+            for scope in resource['scopeSpans']:
+                spans.extend(scope['spans'])
+    return lines, spans
+
+
+def _attributes(span):
+    return dict((a['key'], list(a['value'].values())[0]) for a in span['attributes'])
+
+
+class TestParseTraceparent:
+    def test_traceparent(self):
+        assert parse_traceparent('00-{0}-{1}-01'.format(TRACE_ID, PARENT_ID)) == (TRACE_ID, PARENT_ID)
+
+    def test_bare_trace_id(self):
+        assert parse_traceparent(TRACE_ID.upper()) == (TRACE_ID, None)
+
+    @pytest.mark.parametrize('value', [None, '', 'garbage', '00-{0}-{1}-01'.format('0' * 32, PARENT_ID), '00-{0}-{1}-01'.format(TRACE_ID, '0' * 16)])
+    def test_invalid(self, value):
+        assert parse_traceparent(value) is None
+
+
+class TestRunTraced:
+    def test_disabled_is_a_plain_call(self):
+        exit_json = FakeModule.exit_json
+        with pytest.raises(SystemExit):
+            run_traced(lambda: FakeModule().exit_json(changed=True), 'write_record', module_class=FakeModule)
+        assert FakeModule.results == [{'changed': True}]
+        assert FakeModule.exit_json is exit_json
+        with trace_span('noop') as span:
+            assert span is NOOP_SPAN
+
+    def test_exports_module_span_to_file(self, monkeypatch, tmp_path):
+        path = str(tmp_path / 'traces' / 'spans.jsonl')
+        monkeypatch.setenv(tracing.ENV_TRACE, path)
+        monkeypatch.setenv(tracing.ENV_TRACEPARENT, '00-{0}-{1}-01'.format(TRACE_ID, PARENT_ID))
+
+        def _run():
+            with trace_span('step', color='blue'):
+                pass
+            FakeModule().exit_json(changed=True)
+
+        exit_json = FakeModule.exit_json
+        with pytest.raises(SystemExit):
+            run_traced(_run, 'write_record', module_class=FakeModule)
+
+        lines, spans = _read_spans(path)
+        assert len(lines) == 1
+        root = [s for s in spans if s['name'] == 'write_record'][0]
+        step = [s for s in spans if s['name'] == 'step'][0]
+        assert root['traceId'] == step['traceId'] == TRACE_ID
+        assert root['parentSpanId'] == PARENT_ID
+        assert step['parentSpanId'] == root['spanId']
+        assert root['status'] == {'code': tracing.STATUS_OK}
+        assert _attributes(root)['ansible.changed'] is True
+        assert _attributes(step) == {'color': 'blue'}
+        assert int(root['endTimeUnixNano']) >= int(step['endTimeUnixNano']) >= int(step['startTimeUnixNano'])
+
+        trace = FakeModule.results[0]['trace']
+        assert trace == {'trace_id': TRACE_ID, 'span_id': root['spanId'], 'traceparent': '00-{0}-{1}-01'.format(TRACE_ID, root['spanId'])}
+        assert FakeModule.exit_json is exit_json
+        assert tracing.TRACER is None
+
+    def test_fail_json_inside_open_span_exports_it(self, monkeypatch, tmp_path):
+        path = str(tmp_path / 'spans.jsonl')
+        monkeypatch.setenv(tracing.ENV_TRACE, path)
+
+        def _run():
+            with trace_span('HTTP GET'):
+                FakeModule().fail_json("API Request Failed")
+
+        with pytest.raises(SystemExit):
+            run_traced(_run, 'read_record', module_class=FakeModule)
+
+        lines, spans = _read_spans(path)
+        assert len(lines) == 1
+        assert sorted(s['name'] for s in spans) == ['HTTP GET', 'read_record']
+        assert all(s['status'] == {'code': tracing.STATUS_ERROR, 'message': 'API Request Failed'} for s in spans)
+        assert len(set(s['traceId'] for s in spans)) == 1
+
+    def test_exports_when_run_raises(self, monkeypatch, tmp_path):
+        path = str(tmp_path / 'spans.jsonl')
+        monkeypatch.setenv(tracing.ENV_TRACE, path)
+
+        def _crash():
+            raise RuntimeError('unexpected')
+
+        with pytest.raises(RuntimeError):
+            run_traced(_crash, 'attachment', module_class=FakeModule)
+        dummy, spans = _read_spans(path)
+        assert spans[0]['status']['code'] == tracing.STATUS_ERROR
+
+    def test_exports_to_collector_endpoint(self, monkeypatch):
+        received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                received.append((self.path, self.headers.get('Content-Type'), self.rfile.read(int(self.headers['Content-Length']))))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        try:
+            monkeypatch.setenv(tracing.ENV_TRACE, 'http://127.0.0.1:{0}/v1/traces'.format(server.server_port))
+            with pytest.raises(SystemExit):
+                run_traced(lambda: FakeModule().exit_json(changed=False), 'sdp_metadata', module_class=FakeModule)
+            thread.join(5)
+        finally:
+            server.server_close()
+
+        path, content_type, body = received[0]
+        assert path == '/v1/traces'
+        assert content_type == 'application/json'
+        assert json.loads(body)['resourceSpans'][0]['scopeSpans'][0]['spans'][0]['name'] == 'sdp_metadata'
+
+    def test_unreachable_collector_does_not_fail_the_run(self, monkeypatch):
+        monkeypatch.setenv(tracing.ENV_TRACE, 'http://127.0.0.1:9/v1/traces')
+        with pytest.raises(SystemExit):
+            run_traced(lambda: FakeModule().exit_json(changed=False), 'sdp_metadata', module_class=FakeModule)
+        assert FakeModule.results[0]['changed'] is False
+
+
+class TestSDPClientSpans:
+    def _client(self):
+        return SDPClient(create_mock_module({
+            'domain': 'sdp.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+        }))
+
+    @patch('plugins.module_utils.api_util.time.sleep')
+    @patch(FETCH_URL_PATH)
+    def test_request_and_attempt_spans(self, mock_fetch, mock_sleep, tmp_path):
+        mock_fetch.side_effect = [
+            build_fetch_url_error(503, 'Service Unavailable'),
+            build_fetch_url_response({'request': {'id': '1'}}),
+        ]
+        tracer = tracing.TRACER = Tracer(str(tmp_path / 'spans.jsonl'), TRACE_ID)
+        root = tracer.start_root('read_record')
+
+        assert self._client().request('requests/1') == {'request': {'id': '1'}}
+
+        request = [s for s in tracer.spans if s.name == 'GET requests/1'][0]
+        attempts = [s for s in tracer.spans if s.name == 'HTTP GET']
+        assert request.parent_id == root.span_id
+        assert request.attributes['sdp.attempts'] == 2
+        assert [s.parent_id for s in attempts] == [request.span_id] * 2
+        assert [s.attributes['http.response.status_code'] for s in attempts] == [503, 200]
+        assert attempts[0].status['code'] == tracing.STATUS_ERROR
+        assert attempts[1].status is None
+        assert attempts[0].attributes['url.full'] == 'https://sdp.example.com/app/portal/api/v3/requests/1'
+
+        # Each attempt carries its span as W3C traceparent
+        sent = [c.kwargs['headers']['traceparent'] for c in mock_fetch.call_args_list]
+        assert sent == [s.traceparent() for s in attempts]
+
+    @patch(FETCH_URL_PATH)
+    def test_no_traceparent_header_without_tracing(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'request': {'id': '1'}})
+        self._client().request('requests/1')
+        assert 'traceparent' not in mock_fetch.call_args.kwargs['headers']
+
+    @patch('plugins.module_utils.oauth.fetch_url')
+    def test_token_refresh_span(self, mock_fetch, tmp_path):
+        mock_fetch.return_value = build_fetch_url_response({'access_token': 'new', 'expires_in': 3600})
+        tracer = tracing.TRACER = Tracer(str(tmp_path / 'spans.jsonl'))
+        tracer.start_root('oauth_token')
+
+        get_access_token(create_mock_module({}), 'id', 'secret', 'refresh', 'US')
+
+        span = [s for s in tracer.spans if s.name == 'POST oauth/v2/token'][0]
+        assert span.attributes['http.response.status_code'] == 200
+        assert span.attributes['url.full'].endswith('/oauth/v2/token')
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import (
+    FETCH_URL_PATH, build_fetch_url_response, create_mock_module,
+)
+
+from plugins.module_utils.api_util import SDPClient
+from plugins.module_utils.cache import ENV_CACHE_DIR
+from plugins.module_utils.udf_utils import (
+    fetch_metainfo, fetch_udf_metadata, get_udf_field_type, metainfo_endpoint,
+    UDF_METADATA_CACHE, UDF_METADATA_FETCHED,
+)
+
+METAINFO = {'metainfo': {'fields': {'udf_fields': {'fields': {'udf_char1': {'type': 'string'}}}}}}
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path):
+    UDF_METADATA_CACHE.clear()
+    UDF_METADATA_FETCHED.clear()
+    with patch.dict(os.environ, {ENV_CACHE_DIR: str(tmp_path)}):
+        yield tmp_path
+    UDF_METADATA_CACHE.clear()
+    UDF_METADATA_FETCHED.clear()
+
+
+def _module(**overrides):
+    params = {
+        'domain': 'test.example.com',
+        'portal_name': 'portal',
+        'auth_token': 'tok',
+        'client_id': None, 'client_secret': None,
+        'refresh_token': None, 'dc': 'US',
+        'parent_module_name': 'change',
+        'parent_id': '10',
+    }
+    params.update(overrides)
+    return create_mock_module(params)
+
+
+class TestFetchMetainfo:
+    def test_endpoint_ignores_record_id(self):
+        assert metainfo_endpoint('change') == 'changes/_metainfo'
+
+    @patch(FETCH_URL_PATH)
+    def test_cached_on_disk_across_processes(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response(METAINFO)
+        module = _module()
+
+        metainfo, fetched = fetch_metainfo(module, SDPClient(module), 'change')
+        assert fetched is True
+        assert mock_fetch.call_args.args[1].endswith('/changes/_metainfo')
+
+        metainfo_again, fetched = fetch_metainfo(module, SDPClient(module), 'change')
+        assert fetched is False
+        assert metainfo_again == metainfo
+        assert mock_fetch.call_count == 1
+
+    @patch(FETCH_URL_PATH)
+    def test_refresh_bypasses_cache(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response(METAINFO)
+        module = _module()
+
+        fetch_metainfo(module, SDPClient(module), 'change')
+        _metainfo, fetched = fetch_metainfo(module, SDPClient(module), 'change', refresh=True)
+
+        assert fetched is True
+        assert mock_fetch.call_count == 2
+
+    @patch(FETCH_URL_PATH)
+    def test_fetch_udf_metadata_uses_disk_cache(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response(METAINFO)
+        module = _module()
+        fetch_metainfo(module, SDPClient(module), 'change')
+
+        assert fetch_udf_metadata(module, SDPClient(module), 'change') == {'udf_char1': {'type': 'string'}}
+        assert mock_fetch.call_count == 1
+
+    @patch(FETCH_URL_PATH)
+    def test_new_udf_is_accepted_after_refresh(self, mock_fetch):
+        added = {'metainfo': {'fields': {'udf_fields': {'fields': {
+            'udf_char1': {'type': 'string'}, 'udf_long2': {'type': 'integer'},
+        }}}}}
+        mock_fetch.return_value = build_fetch_url_response(METAINFO)
+        module = _module()
+        fetch_metainfo(module, SDPClient(module), 'change')
+
+        mock_fetch.return_value = build_fetch_url_response(added)
+        assert get_udf_field_type(module, SDPClient(module), 'change', 'udf_long2') == 'num'
+        assert mock_fetch.call_count == 2
+
+    @patch(FETCH_URL_PATH)
+    def test_unknown_udf_fails_without_refetching_fresh_metadata(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response(METAINFO)
+        module = _module()
+
+        with pytest.raises(SystemExit):
+            get_udf_field_type(module, SDPClient(module), 'change', 'udf_long2')
+        assert 'udf_long2' in module.fail_json.call_args.kwargs['msg']
+        assert mock_fetch.call_count == 1
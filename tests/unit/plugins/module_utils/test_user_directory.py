@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import time
+import pytest
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+from tests.unit.conftest import (
+    FETCH_URL_PATH, build_fetch_url_response, create_mock_module,
+)
+
+from plugins.module_utils.api_util import SDPClient
+from plugins.module_utils.cache import FileCache, ENV_CACHE_DIR
+from plugins.module_utils.user_directory import (
+    get_user_directory, resolve_user, USER_DIRECTORIES, USER_FULL_REFRESH_INTERVAL,
+)
+
+CACHE_KEY = 'test.example.com/portal/users'
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path):
+    USER_DIRECTORIES.clear()
+    with patch.dict(os.environ, {ENV_CACHE_DIR: str(tmp_path)}):
+        yield tmp_path
+    USER_DIRECTORIES.clear()
+
+
+def _module():
+    return create_mock_module({
+        'domain': 'test.example.com',
+        'portal_name': 'portal',
+        'auth_token': 'tok',
+        'client_id': None, 'client_secret': None,
+        'refresh_token': None, 'dc': 'US',
+    })
+
+
+def _user(user_id, email, technician, updated):
+    return {'id': user_id, 'email_id': email, 'name': email.split('@')[0], 'is_technician': technician,
+            'last_updated_time': {'value': str(updated)}}
+
+
+def _users(*rows):
+    return build_fetch_url_response({'users': list(rows), 'list_info': {'has_more_rows': False}})
+
+
+def _list_info(call):
+    return json.loads(parse_qs(call.kwargs['data'])['input_data'][0])['list_info']
+
+
+class TestResolveUser:
+    @patch(FETCH_URL_PATH)
+    def test_resolves_case_insensitively(self, mock_fetch):
+        mock_fetch.return_value = _users(_user('5', 'Jane.Doe@example.com', True, 100))
+        module = _module()
+        client = SDPClient(module)
+
+        assert resolve_user(module, client, 'technician', 'jane.doe@EXAMPLE.com', 'id', role='technician') == {'id': '5'}
+        assert resolve_user(module, client, 'requester', 'jane.doe@example.com', 'validate') == {'email_id': 'Jane.Doe@example.com'}
+        assert mock_fetch.call_count == 1
+
+    @patch(FETCH_URL_PATH)
+    def test_unknown_user_fails(self, mock_fetch):
+        mock_fetch.return_value = _users(_user('5', 'jane@example.com', True, 100))
+        module = _module()
+
+        with pytest.raises(SystemExit):
+            resolve_user(module, SDPClient(module), 'requester', 'gone@example.com', 'validate')
+        assert 'gone@example.com' in module.fail_json.call_args[1]['msg']
+        # The directory was just downloaded, so the miss does not refresh it again
+        assert mock_fetch.call_count == 1
+
+    @patch(FETCH_URL_PATH)
+    def test_technician_role_is_enforced(self, mock_fetch):
+        mock_fetch.return_value = _users(_user('6', 'req@example.com', False, 100))
+        module = _module()
+
+        with pytest.raises(SystemExit):
+            resolve_user(module, SDPClient(module), 'technician', 'req@example.com', 'validate', role='technician')
+        assert 'requires a technician' in module.fail_json.call_args[1]['msg']
+
+    @patch(FETCH_URL_PATH)
+    def test_inactive_user_fails(self, mock_fetch):
+        inactive = dict(_user('8', 'left@example.com', True, 100), status={'name': 'Inactive'})
+        mock_fetch.return_value = _users(inactive, dict(_user('9', 'here@example.com', True, 100), status='Active'))
+        module = _module()
+        client = SDPClient(module)
+
+        assert resolve_user(module, client, 'technician', 'here@example.com', 'id') == {'id': '9'}
+        with pytest.raises(SystemExit):
+            resolve_user(module, client, 'technician', 'left@example.com', 'id')
+        assert "'left@example.com' is inactive" in module.fail_json.call_args[1]['msg']
+        assert mock_fetch.call_count == 1
+
+    @patch(FETCH_URL_PATH)
+    def test_user_cached_as_inactive_is_refreshed_once(self, mock_fetch):
+        now = time.time()
+        FileCache().set(CACHE_KEY, {
+            'users': {'back@example.com': {'id': '5', 'email_id': 'back@example.com', 'is_active': False}},
+            'high_water': 100, 'refreshed_at': now, 'full_at': now,
+        })
+        mock_fetch.return_value = _users(dict(_user('5', 'back@example.com', True, 200), is_active=True))
+        module = _module()
+
+        assert resolve_user(module, SDPClient(module), 'technician', 'back@example.com', 'id') == {'id': '5'}
+        assert mock_fetch.call_count == 1
+
+
+class TestGetUserDirectory:
+    @patch(FETCH_URL_PATH)
+    def test_miss_in_cached_directory_refreshes_incrementally(self, mock_fetch):
+        now = time.time()
+        FileCache().set(CACHE_KEY, {
+            'users': {'jane@example.com': {'id': '5', 'email_id': 'jane@example.com', 'is_technician': True}},
+            'high_water': 100, 'refreshed_at': now, 'full_at': now,
+        })
+        mock_fetch.return_value = _users(_user('7', 'new@example.com', True, 200))
+        module = _module()
+
+        assert resolve_user(module, SDPClient(module), 'technician', 'new@example.com', 'id') == {'id': '7'}
+
+        criteria = _list_info(mock_fetch.call_args)['search_criteria']
+        assert criteria == [{'field': 'last_updated_time', 'condition': 'greater or equal', 'value': '100'}]
+        directory = FileCache().get(CACHE_KEY)
+        assert sorted(directory['users']) == ['jane@example.com', 'new@example.com']
+        assert directory['high_water'] == 200
+
+    @patch(FETCH_URL_PATH)
+    def test_fresh_cache_makes_no_calls(self, mock_fetch):
+        now = time.time()
+        FileCache().set(CACHE_KEY, {'users': {}, 'high_water': 1, 'refreshed_at': now, 'full_at': now})
+
+        directory, refreshed = get_user_directory(_module(), None)
+
+        assert refreshed is False
+        assert directory['users'] == {}
+        mock_fetch.assert_not_called()
+
+    @patch(FETCH_URL_PATH)
+    def test_old_directory_is_downloaded_in_full(self, mock_fetch):
+        old = time.time() - USER_FULL_REFRESH_INTERVAL - 1
+        FileCache().set(CACHE_KEY, {
+            'users': {'gone@example.com': {'id': '1'}}, 'high_water': 1, 'refreshed_at': old, 'full_at': old,
+        })
+        mock_fetch.return_value = _users(_user('5', 'jane@example.com', True, 100))
+        module = _module()
+
+        directory, refreshed = get_user_directory(module, SDPClient(module))
+
+        assert refreshed is True
+        assert list(directory['users']) == ['jane@example.com']
+        assert 'search_criteria' not in _list_info(mock_fetch.call_args)
@@ -6,9 +6,12 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import pytest
+from unittest.mock import patch
 
-from tests.unit.conftest import create_mock_module
-from plugins.modules.read_record import construct_payload
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_response, create_mock_module
+from plugins.module_utils.api_util import SDPClient
+from plugins.modules.read_record import construct_payload, validate_expand, fetch_expanded, build_result, run_export, run_budgeted_read, run_mirror_read
+from plugins.module_utils.export_util import decode_cursor, encode_cursor, new_cursor_state
 
 
 class TestReadRecordConstructPayload:
@@ -127,3 +130,254 @@ class TestReadRecordConstructPayload:
         })
         with pytest.raises(SystemExit):
             construct_payload(module)
+
+
+class TestReadRecordExpand:
+    def _params(self, **overrides):
+        params = {
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+            'parent_module_name': 'change',
+            'parent_id': '200',
+            'payload': None,
+            'expand': ['notes', 'tasks'],
+            'concurrency': 2,
+        }
+        params.update(overrides)
+        return params
+
+    def test_no_expand_returns_empty(self):
+        module = create_mock_module(self._params(expand=None))
+        assert validate_expand(module) == []
+
+    def test_expand_requires_parent_id(self):
+        module = create_mock_module(self._params(parent_id=None))
+        with pytest.raises(SystemExit):
+            validate_expand(module)
+        assert 'parent_id' in module.fail_json.call_args[1]['msg']
+
+    def test_expand_rejects_unknown_sub_resource(self):
+        module = create_mock_module(self._params(parent_module_name='problem', expand=['approval_levels']))
+        with pytest.raises(SystemExit):
+            validate_expand(module)
+        assert 'approval_levels' in module.fail_json.call_args[1]['msg']
+
+    def test_expand_drops_duplicates(self):
+        module = create_mock_module(self._params(expand=['notes', 'tasks', 'notes']))
+        assert validate_expand(module) == ['notes', 'tasks']
+
+    @patch(FETCH_URL_PATH)
+    def test_fetch_expanded_embeds_sub_records(self, mock_fetch):
+        def _respond(module, url, **kwargs):
+            if url.endswith('/notes'):
+                return build_fetch_url_response({'notes': [{'id': '1'}]})
+            return build_fetch_url_response({'tasks': [{'id': '2'}, {'id': '3'}]})
+        mock_fetch.side_effect = _respond
+
+        module = create_mock_module(self._params())
+        client = SDPClient(module)
+        expanded = fetch_expanded(module, client, ['notes', 'tasks'])
+
+        assert expanded == {'notes': [{'id': '1'}], 'tasks': [{'id': '2'}, {'id': '3'}]}
+        urls = sorted(call.args[1] for call in mock_fetch.call_args_list)
+        assert urls[0].endswith('changes/200/notes')
+        assert urls[1].endswith('changes/200/tasks')
+
+    @patch(FETCH_URL_PATH)
+    def test_fetch_expanded_follows_has_more_rows(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'notes': [{'id': str(i)} for i in range(100)], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'notes': [{'id': '100'}], 'list_info': {'has_more_rows': False}}),
+        ]
+
+        module = create_mock_module(self._params())
+        expanded = fetch_expanded(module, SDPClient(module), ['notes'])
+
+        assert len(expanded['notes']) == 101
+        second_page = mock_fetch.call_args_list[1].kwargs['data']
+        assert 'start_index%22%3A101' in second_page
+
+
+class TestReadRecordBuildResult:
+    LIST_RESPONSE = {
+        'response_status': [{'status_code': 2000}],
+        'list_info': {'has_more_rows': False},
+        'requests': [{'id': '1', 'subject': 'a'}, {'id': '2', 'subject': 'b'}],
+    }
+
+    def test_full(self):
+        module = create_mock_module({'parent_module_name': 'request', 'parent_id': None, 'return_mode': 'full'})
+        result = build_result(module, self.LIST_RESPONSE, {'list_info': {}})
+        assert result == {'changed': False, 'response': self.LIST_RESPONSE, 'payload': {'list_info': {}}}
+
+    def test_minimal_drops_status_and_payload(self):
+        module = create_mock_module({'parent_module_name': 'request', 'parent_id': None, 'return_mode': 'minimal'})
+        result = build_result(module, self.LIST_RESPONSE, {'list_info': {}})
+        assert 'payload' not in result
+        assert 'response_status' not in result['response']
+        assert result['response']['requests'] == self.LIST_RESPONSE['requests']
+
+    def test_id_list(self):
+        module = create_mock_module({'parent_module_name': 'request', 'parent_id': None, 'return_mode': 'id'})
+        assert build_result(module, self.LIST_RESPONSE, None) == {'changed': False, 'ids': ['1', '2']}
+
+    def test_id_single(self):
+        module = create_mock_module({'parent_module_name': 'change', 'parent_id': '7', 'return_mode': 'id'})
+        result = build_result(module, {'change': {'id': '7', 'title': 'x'}}, None, expanded={'notes': []})
+        assert result == {'changed': False, 'id': '7'}
+
+    def test_none(self):
+        module = create_mock_module({'parent_module_name': 'request', 'parent_id': None, 'return_mode': 'none'})
+        assert build_result(module, self.LIST_RESPONSE, None) == {'changed': False}
+
+    def test_columnar_output(self):
+        module = create_mock_module({'parent_module_name': 'request', 'parent_id': None,
+                                     'return_mode': 'minimal', 'output_format': 'columnar'})
+        result = build_result(module, self.LIST_RESPONSE, None)
+        assert result['response']['requests']['columns']['id'] == ['1', '2']
+        assert result['response']['list_info'] == {'has_more_rows': False}
+        # The caller's response dict is not modified
+        assert isinstance(self.LIST_RESPONSE['requests'], list)
+
+
+class TestReadRecordExport:
+    def _params(self, **export):
+        return {
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+            'parent_module_name': 'change',
+            'parent_id': None,
+            'concurrency': 2,
+            'export': dict({'field': 'created_time', 'start_time': 0, 'end_time': 100, 'slices': 2}, **export),
+        }
+
+    def test_rejects_non_time_field(self):
+        module = create_mock_module(self._params(field='title'))
+        with pytest.raises(SystemExit):
+            run_export(module, SDPClient(module), 'changes')
+        assert 'Invalid export field' in module.fail_json.call_args[1]['msg']
+
+    @patch(FETCH_URL_PATH)
+    def test_returns_list_shaped_response(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'changes': [{'id': '1'}], 'list_info': {'has_more_rows': False}}),
+            build_fetch_url_response({'changes': [{'id': '2'}], 'list_info': {'has_more_rows': False}}),
+        ]
+        module = create_mock_module(self._params())
+
+        response = run_export(module, SDPClient(module), 'changes')
+
+        assert sorted(row['id'] for row in response['changes']) == ['1', '2']
+        assert response['list_info']['row_count'] == 2
+        assert response['list_info']['has_more_rows'] is False
+        assert response['list_info']['slices'] == 2
+
+
+class TestReadRecordBudgetedRead:
+    def _params(self, **overrides):
+        params = {
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+            'parent_module_name': 'request',
+            'parent_id': None,
+            'payload': None,
+            'time_budget': 60,
+            'cursor': None,
+        }
+        params.update(overrides)
+        return params
+
+    def test_rejects_non_keyset_sort_field(self):
+        module = create_mock_module(self._params(payload={'sort_field': 'subject'}))
+        with pytest.raises(SystemExit):
+            run_budgeted_read(module, SDPClient(module), 'requests')
+        assert 'sort_field' in module.fail_json.call_args[1]['msg']
+
+    def test_rejects_nullable_time_sort_field(self):
+        module = create_mock_module(self._params(payload={'sort_field': 'due_by_time'}))
+        with pytest.raises(SystemExit):
+            run_budgeted_read(module, SDPClient(module), 'requests')
+        assert "['created_time', 'last_updated_time', 'id']" in module.fail_json.call_args[1]['msg']
+
+    @patch(FETCH_URL_PATH)
+    def test_pages_hold_100_rows_by_default(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'requests': [], 'list_info': {'has_more_rows': False}})
+        module = create_mock_module(self._params(payload={'sort_order': 'desc'}))
+
+        run_budgeted_read(module, SDPClient(module), 'requests')
+
+        assert 'row_count%22%3A100' in mock_fetch.call_args.kwargs['data']
+
+    def test_rejects_cursor_of_other_module(self):
+        module = create_mock_module(self._params(cursor=encode_cursor(new_cursor_state('change'))))
+        with pytest.raises(SystemExit):
+            run_budgeted_read(module, SDPClient(module), 'requests')
+        assert "'change'" in module.fail_json.call_args[1]['msg']
+
+    @patch('plugins.module_utils.export_util.time.monotonic', side_effect=[0, 61])
+    @patch(FETCH_URL_PATH)
+    def test_returns_cursor_when_budget_runs_out(self, mock_fetch, _mock_clock):
+        mock_fetch.return_value = build_fetch_url_response({
+            'requests': [{'id': '1', 'created_time': {'value': '10'}}],
+            'list_info': {'has_more_rows': True},
+        })
+        module = create_mock_module(self._params(payload={'row_count': 1}))
+
+        response, cursor = run_budgeted_read(module, SDPClient(module), 'requests')
+
+        assert response['list_info'] == {'row_count': 1, 'has_more_rows': True}
+        state = decode_cursor(cursor)
+        assert state['last_value'] == 10
+        assert state['row_count'] == 1
+
+
+class TestReadRecordMirror:
+    def _params(self, path, **overrides):
+        params = {
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+            'parent_module_name': 'change',
+            'parent_id': None,
+            'mirror': {'path': path, 'max_age': 300, 'filters': {'status': 'Open'}},
+        }
+        params.update(overrides)
+        return params
+
+    @patch(FETCH_URL_PATH)
+    def test_syncs_once_then_reads_locally(self, mock_fetch, tmp_path):
+        mock_fetch.return_value = build_fetch_url_response({'changes': [
+            {'id': '1', 'status': {'name': 'Open'}, 'created_time': {'value': '5'}},
+            {'id': '2', 'status': {'name': 'Closed'}, 'created_time': {'value': '6'}},
+        ]})
+        module = create_mock_module(self._params(str(tmp_path / 'mirror.db')))
+
+        response, info = run_mirror_read(module, SDPClient(module))
+        assert info['refreshed'] is True
+        assert [row['id'] for row in response['changes']] == ['1']
+
+        response, info = run_mirror_read(module, SDPClient(module))
+        assert info['refreshed'] is False
+        assert response['list_info'] == {'row_count': 1, 'has_more_rows': False}
+        assert mock_fetch.call_count == 1
+
+    @patch(FETCH_URL_PATH)
+    def test_single_record_missing_from_mirror_falls_back(self, mock_fetch, tmp_path):
+        mock_fetch.return_value = build_fetch_url_response({'changes': []})
+        module = create_mock_module(self._params(str(tmp_path / 'mirror.db'), parent_id='7'))
+
+        response, _info = run_mirror_read(module, SDPClient(module))
+
+        assert response is None
+        assert mock_fetch.call_args.args[1].endswith('/changes')
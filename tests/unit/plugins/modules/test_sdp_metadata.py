@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from plugins.modules.sdp_metadata import build_schema
+
+
+class TestBuildSchema:
+    def test_merges_system_and_udf_fields(self):
+        metainfo = {'fields': {'udf_fields': {'fields': {
+            'udf_char1': {'type': 'string', 'display_name': 'Ticket Ref'},
+            'udf_long1': {'type': 'lookup', 'lookup_entity': 'technician'},
+        }}}}
+
+        schema = build_schema('change', metainfo)
+
+        assert schema['endpoint'] == 'changes'
+        assert 'scheduled_start_time' in schema['sortable_fields']
+        fields = schema['fields']
+        assert fields['title'] == {'type': 'string', 'category': 'system'}
+        assert fields['change_manager'] == {'type': 'user', 'category': 'system', 'role': 'technician'}
+        assert fields['back_out_plan_description']['group_name'] == 'back_out_plan'
+        assert fields['udf_char1'] == {'type': 'string', 'category': 'udf', 'display_name': 'Ticket Ref'}
+        assert fields['udf_long1']['type'] == 'user'
+
+    def test_without_udfs(self):
+        schema = build_schema('release', {})
+        assert all(field['category'] == 'system' for field in schema['fields'].values())
@@ -6,13 +6,17 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import pytest
+from unittest.mock import patch
 
 from tests.unit.conftest import (
-    create_mock_module,
+    FETCH_URL_PATH, build_fetch_url_response, create_mock_module,
 )
 
+from plugins.module_utils.api_util import SDPClient
+from plugins.module_utils.journal import CheckpointJournal
 from plugins.modules.write_record import (
-    resolve_field_metadata, transform_field_value, construct_payload,
+    resolve_field_metadata, transform_field_value, construct_payload, dedupe_items,
+    _exit_with_result, _handle_bulk,
 )
 from plugins.module_utils.sdp_config import MODULE_CONFIG
 
@@ -261,3 +265,233 @@ class TestConstructPayload:
         assert result['request']['subject'] == 'Test'
         assert result['request']['priority'] == {'name': 'High'}
         assert result['request']['requester'] == {'email_id': 'admin@example.com'}
+
+    def test_child_payload_uses_child_root_key(self):
+        module = create_mock_module({
+            'payload': {'description': 'Deployed', 'owner': 'ci@example.com', 'start_time': 1717000000000},
+            'parent_module_name': 'change',
+            'child_module': 'worklogs',
+        })
+        result = construct_payload(module)
+        assert result == {
+            'worklog': {
+                'description': 'Deployed',
+                'owner': {'email_id': 'ci@example.com'},
+                'start_time': {'value': 1717000000000},
+            }
+        }
+
+    def test_child_payload_rejects_udf_fields(self):
+        module = create_mock_module({
+            'payload': {'udf_char1': 'value'},
+            'parent_module_name': 'request',
+            'child_module': 'notes',
+        })
+        with pytest.raises(SystemExit):
+            construct_payload(module)
+        module.warn.assert_not_called()
+
+    def test_payload_argument_overrides_params(self):
+        module = create_mock_module({
+            'payload': {'subject': 'From params'},
+            'parent_module_name': 'request',
+        })
+        result = construct_payload(module, payload={'subject': 'From item'})
+        assert result == {'request': {'subject': 'From item'}}
+
+
+# ---------------------------------------------------------------------------
+# dedupe_items
+# ---------------------------------------------------------------------------
+class TestDedupeItems:
+    def test_without_key_all_items_pending(self):
+        module = create_mock_module({})
+        items = [{'description': 'a'}, {'description': 'a'}]
+        pending, skipped = dedupe_items(module, items, None)
+        assert [index for index, _key, _item in pending] == [0, 1]
+        assert skipped == []
+
+    def test_duplicates_within_batch_skipped(self):
+        module = create_mock_module({})
+        items = [{'description': 'a'}, {'description': 'b'}, {'description': 'a'}]
+        pending, skipped = dedupe_items(module, items, 'description')
+        assert [key for _index, key, _item in pending] == ['a', 'b']
+        assert skipped == [{'index': 2, 'key': 'a'}]
+
+    def test_existing_keys_skipped(self):
+        module = create_mock_module({})
+        items = [{'start_time': 1000}, {'start_time': 2000}]
+        pending, skipped = dedupe_items(module, items, 'start_time', existing_keys={'1000'})
+        assert [key for _index, key, _item in pending] == ['2000']
+        assert skipped == [{'index': 0, 'key': '1000'}]
+
+    def test_missing_key_fails(self):
+        module = create_mock_module({})
+        with pytest.raises(SystemExit):
+            dedupe_items(module, [{'description': 'a'}, {}], 'description')
+        assert 'Item 1' in module.fail_json.call_args[1]['msg']
+
+    @patch(FETCH_URL_PATH)
+    def test_user_field_key_matches_existing_by_email(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({
+            'tasks': [{'id': '9', 'owner': {'id': '3', 'name': 'Jane Doe', 'email_id': 'Jane@example.com'}}],
+            'list_info': {'has_more_rows': False},
+        })
+        module = create_mock_module({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+            'parent_module_name': 'request', 'parent_id': '5', 'child_module': 'tasks',
+            'state': 'present', 'items': [{'title': 'Review', 'owner': 'jane@example.com'}],
+            'item_key': 'owner', 'journal': None, 'concurrency': 1, 'return_mode': 'full',
+        })
+
+        with pytest.raises(SystemExit):
+            _handle_bulk(module, SDPClient(module), 'requests/5/tasks', 'task')
+
+        result = module.exit_json.call_args[1]
+        assert result['changed'] is False
+        assert result['skipped'] == [{'index': 0, 'key': 'jane@example.com'}]
+        assert mock_fetch.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# _exit_with_result (return_mode)
+# ---------------------------------------------------------------------------
+class TestExitWithResult:
+    RESPONSE = {
+        'response_status': {'status_code': 2000},
+        'request': {'id': '5', 'subject': 'New', 'description': 'Long text', 'status': {'name': 'Open'}},
+    }
+    PAYLOAD = {'request': {'subject': 'New'}}
+    BEFORE = {'id': '5', 'subject': 'Old', 'description': 'Long text', 'status': {'name': 'Open'}}
+
+    def _exit(self, return_mode, diff=False):
+        module = create_mock_module({'parent_module_name': 'request', 'parent_id': '5', 'return_mode': return_mode}, diff=diff)
+        with pytest.raises(SystemExit):
+            _exit_with_result(module, 'request', True, response=self.RESPONSE, payload=self.PAYLOAD,
+                              diff=(self.BEFORE, self.RESPONSE['request']), endpoint='requests/5', method='PUT')
+        return module.exit_json.call_args[1]
+
+    def test_full_returns_everything(self):
+        result = self._exit('full', diff=True)
+        assert result['response'] == self.RESPONSE
+        assert result['payload'] == self.PAYLOAD
+        assert result['endpoint'] == 'requests/5'
+        assert result['diff'] == {'before': self.BEFORE, 'after': self.RESPONSE['request']}
+
+    def test_minimal_returns_written_fields_and_trimmed_diff(self):
+        result = self._exit('minimal', diff=True)
+        assert result['id'] == '5'
+        assert result['response'] == {'request': {'id': '5', 'subject': 'New'}}
+        assert 'payload' not in result
+        assert result['diff'] == {'before': {'subject': 'Old'}, 'after': {'subject': 'New'}}
+
+    def test_id_returns_only_id(self):
+        result = self._exit('id')
+        assert result == {'changed': True, 'id': '5'}
+
+    def test_none_returns_only_changed(self):
+        result = self._exit('none')
+        assert result == {'changed': True}
+
+
+# ---------------------------------------------------------------------------
+# _handle_bulk with a checkpoint journal
+# ---------------------------------------------------------------------------
+class TestBulkJournal:
+    def _module(self, journal, **overrides):
+        params = {
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+            'parent_module_name': 'request',
+            'parent_id': None,
+            'child_module': None,
+            'state': 'present',
+            'items': [{'subject': 'a'}, {'subject': 'b'}, {'subject': 'c'}],
+            'item_key': 'subject',
+            'journal': journal,
+            'concurrency': 1,
+            'return_mode': 'full',
+        }
+        params.update(overrides)
+        return create_mock_module(params)
+
+    @patch(FETCH_URL_PATH)
+    def test_resumes_after_journaled_items(self, mock_fetch, tmp_path):
+        path = str(tmp_path / 'bulk.journal')
+        with CheckpointJournal(path, 'requests') as journal:
+            journal.record('a', '1')
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'request': {'id': '2'}}),
+            build_fetch_url_response({'request': {'id': '3'}}),
+        ]
+        module = self._module(path)
+
+        with pytest.raises(SystemExit):
+            _handle_bulk(module, SDPClient(module), 'requests', 'request')
+
+        result = module.exit_json.call_args[1]
+        assert result['resumed'] == [{'index': 0, 'key': 'a', 'id': '1'}]
+        assert [entry['id'] for entry in result['created']] == ['2', '3']
+        assert mock_fetch.call_count == 2
+        assert CheckpointJournal(path, 'requests').load() == {'a': '1', 'b': '2', 'c': '3'}
+
+    @patch(FETCH_URL_PATH)
+    def test_fully_journaled_batch_makes_no_calls(self, mock_fetch, tmp_path):
+        path = str(tmp_path / 'bulk.journal')
+        with CheckpointJournal(path, 'requests') as journal:
+            for key, record_id in (('a', '1'), ('b', '2'), ('c', '3')):
+                journal.record(key, record_id)
+        module = self._module(path, return_mode='id')
+
+        with pytest.raises(SystemExit):
+            _handle_bulk(module, SDPClient(module), 'requests', 'request')
+
+        assert module.exit_json.call_args[1] == {'changed': False, 'ids': ['1', '2', '3']}
+        mock_fetch.assert_not_called()
+
+    def test_journal_requires_item_key(self, tmp_path):
+        module = self._module(str(tmp_path / 'bulk.journal'), item_key=None)
+        with pytest.raises(SystemExit):
+            _handle_bulk(module, SDPClient(module), 'requests', 'request')
+        assert 'item_key' in module.fail_json.call_args[1]['msg']
+
+
+# ---------------------------------------------------------------------------
+# lookup_resolution
+# ---------------------------------------------------------------------------
+class TestLookupResolution:
+    @patch(FETCH_URL_PATH)
+    def test_bulk_fails_before_first_write(self, mock_fetch, tmp_path, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        monkeypatch.setattr('plugins.module_utils.lookup_util.LOOKUP_CATALOGUES', {})
+        mock_fetch.return_value = build_fetch_url_response({'priorities': [{'id': '1', 'name': 'High'}]})
+        module = create_mock_module({
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+            'parent_module_name': 'request',
+            'parent_id': None,
+            'child_module': None,
+            'state': 'present',
+            'items': [{'subject': 'a', 'priority': 'High'}, {'subject': 'b', 'priority': 'Hihg'}],
+            'item_key': None,
+            'journal': None,
+            'concurrency': 1,
+            'return_mode': 'full',
+            'lookup_resolution': 'id',
+            'lookup_cache_ttl': 3600,
+        })
+
+        with pytest.raises(SystemExit):
+            _handle_bulk(module, SDPClient(module), 'requests', 'request')
+
+        assert "Invalid value 'Hihg'" in module.fail_json.call_args[1]['msg']
+        # Only the catalogue was listed; no record was posted
+        assert mock_fetch.call_count == 1
+        assert mock_fetch.call_args.kwargs['method'] == 'GET'